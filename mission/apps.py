@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class MissionConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'mission'
+
+    def ready(self):
+        # Connexion des signaux d'invalidation des caches
+        from mission import signals  # noqa: F401
+        # Enregistrement de la vérification des triggers de recherche (search.E001)
+        from my_airtable_api.utils import search  # noqa: F401
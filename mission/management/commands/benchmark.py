@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+
+from mission.script.benchmark import (
+    lancer_benchmark, lancer_suite, comparer_asgi_wsgi, comparer_pool, TAILLES_PAR_DEFAUT, TAILLES_SUITE,
+    TAILLES_ASGI, CONCURRENCE, CONCURRENCE_POOL, REQUETES,
+)
+
+class Command(BaseCommand):
+    help = "Mesure le temps de rendu de la liste des missions sur des bases de test de tailles croissantes."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tailles', nargs='+', type=int,
+                            help="Nombres de lignes MissionIntervention à générer (de missions avec --suite et --asgi)")
+        parser.add_argument('--repetitions', type=int, default=3,
+                            help="Nombre de mesures par taille")
+        parser.add_argument('--recherche', action='store_true',
+                            help="Compare le filtrage icontains et les index de recherche")
+        parser.add_argument('--suite', action='store_true',
+                            help="Mesure les vues principales sur des données générées par seed")
+        parser.add_argument('--asgi', action='store_true',
+                            help="Compare le débit des vues de lecture sous WSGI et sous ASGI")
+        parser.add_argument('--pool', action='store_true',
+                            help="Compare le débit avec et sans pool de connexions (PostgreSQL)")
+        parser.add_argument('--concurrence', type=int,
+                            help=f"Nombre de requêtes simultanées (modes --asgi : {CONCURRENCE}, --pool : {CONCURRENCE_POOL})")
+        parser.add_argument('--requetes', type=int, default=REQUETES,
+                            help="Nombre de requêtes par configuration (modes --asgi et --pool)")
+        parser.add_argument('--json', dest='sortie_json',
+                            help="Fichier JSON où écrire les résultats (modes --suite, --asgi et --pool)")
+        parser.add_argument('--seed', type=int, default=0,
+                            help="Graine du générateur de données de la suite")
+
+    def handle(self, *args, **options):
+        if options['pool']:
+            comparer_pool(options['concurrence'] or CONCURRENCE_POOL, options['requetes'],
+                          stdout=self.stdout.write, sortie_json=options['sortie_json'])
+            return
+        if options['asgi']:
+            comparer_asgi_wsgi(options['tailles'] or TAILLES_ASGI, options['concurrence'] or CONCURRENCE,
+                               options['requetes'], stdout=self.stdout.write, sortie_json=options['sortie_json'], graine=options['seed'])
+            return
+        if options['suite']:
+            lancer_suite(options['tailles'] or TAILLES_SUITE, options['repetitions'], stdout=self.stdout.write,
+                         sortie_json=options['sortie_json'], graine=options['seed'])
+            return
+        lancer_benchmark(options['tailles'] or TAILLES_PAR_DEFAUT, options['repetitions'], stdout=self.stdout.write,
+                         recherche=options['recherche'])
@@ -0,0 +1,49 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from my_airtable_api.utils.export import EXPORT_FORMATS, CHUNK_SIZE, stream_export
+from my_airtable_api.utils.filters import get_filters
+
+class Command(BaseCommand):
+    help = "Exporte en flux les lignes des missions filtrées (mêmes filtres que la liste) en CSV, JSON Lines ou XLSX."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=sorted(EXPORT_FORMATS), default='csv',
+                            help="Format du fichier exporté")
+        parser.add_argument('--output', '-o', default='-',
+                            help="Fichier de sortie ('-' pour la sortie standard)")
+        parser.add_argument('--client', default='', help="Filtre client (nom ou prénom)")
+        parser.add_argument('--vehicule', default='', help="Filtre véhicule (marque, modèle ou immatriculation)")
+        parser.add_argument('--priorite', default='', help="Filtre priorité")
+        parser.add_argument('--date-debut', default='', help="Date de demande minimale (AAAA-MM-JJ)")
+        parser.add_argument('--date-fin', default='', help="Date de demande maximale (AAAA-MM-JJ)")
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE,
+                            help="Nombre de lignes lues par lot")
+
+    def handle(self, *args, **options):
+        export_format = options['format']
+        if export_format == 'xlsx' and options['output'] == '-':
+            raise CommandError("L'export XLSX doit être écrit dans un fichier (--output).")
+
+        filters = get_filters({
+            'client-filtrage': options['client'],
+            'vehicule-filtrage': options['vehicule'],
+            'priorite-filtrage': options['priorite'],
+            'date_debut': options['date_debut'],
+            'date_fin': options['date_fin'],
+        })
+        chunks = stream_export(filters, export_format, options['chunk_size'])
+
+        if options['output'] == '-':
+            for chunk in chunks:
+                sys.stdout.write(chunk)
+            sys.stdout.flush()
+            return
+
+        mode = 'wb' if export_format == 'xlsx' else 'w'
+        encoding = None if export_format == 'xlsx' else 'utf-8'
+        with open(options['output'], mode, encoding=encoding, newline='' if encoding else None) as output:
+            for chunk in chunks:
+                output.write(chunk)
+        self.stdout.write(self.style.SUCCESS(f"Export {export_format} écrit dans {options['output']}."))
@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from my_airtable_api.utils.importer import MissionImporter, read_rows, CHUNK_SIZE
+
+class Command(BaseCommand):
+    help = "Importe en masse des lignes de missions (client, véhicule, mission, intervention) depuis des fichiers CSV ou JSON Lines."
+
+    def add_arguments(self, parser):
+        parser.add_argument('fichiers', nargs='+', help="Fichiers CSV ou JSON Lines à importer")
+        parser.add_argument('--format', choices=['csv', 'jsonl'],
+                            help="Format des fichiers (déduit de l'extension par défaut)")
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE,
+                            help="Nombre de lignes validées par transaction")
+        parser.add_argument('--errors', help="Fichier CSV où écrire le rapport d'erreurs ligne par ligne")
+        parser.add_argument('--database', default='default', help="Alias de la base de données cible")
+
+    def handle(self, *args, **options):
+        importer = MissionImporter(using=options['database'], chunk_size=options['chunk_size'])
+        if not importer.interventions:
+            raise CommandError("Aucune intervention en base : le catalogue doit être créé avant l'import.")
+
+        debut = time.perf_counter()
+        for fichier in options['fichiers']:
+            self.stdout.write(f"Import de {fichier}...")
+            try:
+                rows = read_rows(fichier, options['format'])
+                report = importer.run(rows, stdout=self.stdout.write)
+            except FileNotFoundError:
+                raise CommandError(f"Fichier introuvable : {fichier}")
+        duree = time.perf_counter() - debut
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{report.lignes} ligne(s) importée(s) sur {report.lignes_lues} lue(s) en {duree:.1f} s "
+            f"({report.lignes / duree if duree else 0:.0f} lignes/s) : {report.clients} client(s), "
+            f"{report.vehicules} véhicule(s), {report.missions} mission(s)."
+        ))
+        if report.erreurs:
+            self.stdout.write(self.style.WARNING(f"{len(report.erreurs)} ligne(s) rejetée(s)."))
+            if options['errors']:
+                report.write_errors(options['errors'])
+                self.stdout.write(f"Rapport d'erreurs écrit dans {options['errors']}")
+            else:
+                for erreur in report.erreurs[:20]:
+                    self.stdout.write(f"  ligne {erreur['ligne']} : {erreur['erreur']}")
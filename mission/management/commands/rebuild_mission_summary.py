@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from my_airtable_api.utils.summary import rebuild_mission_summaries, CHUNK_SIZE
+
+class Command(BaseCommand):
+    help = "Reconstruit la table de résumés des missions (MissionSummary)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE,
+                            help="Nombre de missions recalculées par lot")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            total = rebuild_mission_summaries(options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f"{total} résumé(s) de mission reconstruit(s)."))
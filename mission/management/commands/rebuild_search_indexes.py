@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from my_airtable_api.utils.search import rebuild_search_indexes
+
+class Command(BaseCommand):
+    help = "Recrée les triggers de recherche manquants et reconstruit les tables FTS5 (SQLite)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default', help="Alias de la base de données cible")
+
+    def handle(self, *args, **options):
+        recrees = rebuild_search_indexes(options['database'])
+        for name in recrees:
+            self.stdout.write(f"  trigger recréé : {name}")
+        self.stdout.write(self.style.SUCCESS("Index de recherche reconstruits."))
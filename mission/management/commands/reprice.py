@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from mission.models import Intervention
+from my_airtable_api.utils.pricing import CHUNK_SIZE, reprice_interventions
+
+class Command(BaseCommand):
+    help = "Recalcule le coût des lignes de mission à partir du tarif actuel des interventions."
+
+    def add_arguments(self, parser):
+        parser.add_argument('interventions', nargs='*', type=int,
+                            help="Identifiants des interventions (toutes par défaut)")
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE,
+                            help="Nombre de lignes lues et écrites par lot")
+
+    def handle(self, *args, **options):
+        ids = options['interventions'] or Intervention.objects.values_list('id', flat=True)
+        total = reprice_interventions(ids, chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f"{total} ligne(s) de mission recalculée(s)."))
@@ -1,10 +1,30 @@
 from django.core.management.base import BaseCommand
 
 # Importe ta fonction principale
-from mission.script.populate_db import main
+from mission.script.populate_db import main, seed, TAILLE_LOT
 
 class Command(BaseCommand):
     help = "Remplit la base de données avec des données de test."
 
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int,
+                            help="Nombre de clients à générer (mode seed)")
+        parser.add_argument('--missions', type=int,
+                            help="Nombre de missions à générer (mode seed)")
+        parser.add_argument('--seed', type=int, default=0,
+                            help="Graine du générateur aléatoire (mode seed)")
+        parser.add_argument('--batch-size', type=int, default=TAILLE_LOT,
+                            help="Nombre d'objets insérés par lot (mode seed)")
+
     def handle(self, *args, **options):
-        main()
+        if options['clients'] is None and options['missions'] is None:
+            main()
+            return
+
+        nb_missions = options['missions'] or 0
+        nb_clients = options['clients'] or max(1, nb_missions)
+        totaux = seed(nb_clients, nb_missions, graine=options['seed'], taille_lot=options['batch_size'],
+                      stdout=self.stdout.write)
+        self.stdout.write(self.style.SUCCESS(
+            "Base remplie : " + ", ".join(f"{nombre} {nom}" for nom, nombre in totaux.items())
+        ))
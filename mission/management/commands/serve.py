@@ -0,0 +1,57 @@
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from my_airtable_api.server import (
+    PreforkServer, is_process_local_cache, load_application, warm_up,
+    WORKERS, THREADS, BACKLOG, GRACEFUL_TIMEOUT, MAX_REQUESTS,
+)
+
+class Command(BaseCommand):
+    help = "Sert l'application en production : workers pré-forkés, application préchargée et caches chauds."
+
+    def add_arguments(self, parser):
+        parser.add_argument('adresse', nargs='?', default='0.0.0.0:8000',
+                            help="Adresse d'écoute, au format [hôte:]port (0.0.0.0:8000 par défaut)")
+        parser.add_argument('--workers', type=int, default=int(os.environ.get('SERVE_WORKERS', WORKERS)),
+                            help="Nombre de processus workers")
+        parser.add_argument('--threads', type=int, default=int(os.environ.get('SERVE_THREADS', THREADS)),
+                            help="Nombre de threads par worker")
+        parser.add_argument('--backlog', type=int, default=BACKLOG,
+                            help="Taille de la file d'attente des connexions")
+        parser.add_argument('--graceful-timeout', type=int, default=GRACEFUL_TIMEOUT,
+                            help="Délai laissé aux requêtes en cours lors d'un arrêt ou d'un redémarrage (s)")
+        parser.add_argument('--max-requests', type=int, default=MAX_REQUESTS,
+                            help="Nombre de requêtes avant recyclage d'un worker (0 : jamais)")
+
+    def handle(self, *args, **options):
+        if not hasattr(os, 'fork'):
+            raise CommandError("La commande serve nécessite os.fork (Linux, macOS).")
+        if options['workers'] < 1 or options['threads'] < 1:
+            raise CommandError("--workers et --threads doivent être supérieurs à 0.")
+        alias = settings.LIST_VIEW_CACHE['ALIAS']
+        if options['workers'] > 1 and is_process_local_cache(alias):
+            # Les numéros de version du cache des filtres et du catalogue ne seraient incrémentés
+            # que dans le worker qui a écrit : les autres serviraient des données périmées
+            raise CommandError(
+                f"Le cache '{alias}' ({settings.CACHES[alias]['BACKEND']}) est propre à chaque processus : "
+                f"il doit être partagé avec --workers {options['workers']} (LIST_VIEW_CACHE_BACKEND, "
+                "par exemple django.core.cache.backends.filebased.FileBasedCache), ou utiliser --workers 1."
+            )
+        hote, _, port = options['adresse'].rpartition(':')
+        if not port.isdigit():
+            raise CommandError(f"Adresse invalide : {options['adresse']}")
+        hote = hote.strip('[]') or '0.0.0.0'
+
+        application = load_application()
+        prepares = warm_up()
+        self.stdout.write(f"Application préchargée : {prepares['urls']} nom(s) d'URL, "
+                          f"{prepares['templates']} template(s), {prepares['interventions']} intervention(s) en cache")
+
+        PreforkServer(
+            application, hote, int(port),
+            workers=options['workers'], threads=options['threads'], backlog=options['backlog'],
+            graceful_timeout=options['graceful_timeout'], max_requests=options['max_requests'],
+            stdout=self.stdout.write,
+        ).run()
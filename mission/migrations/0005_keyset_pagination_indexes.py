@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mission', '0004_alter_intervention_duree_intervention_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['nom', 'prenom', 'id'], name='client_nom_prenom_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mission',
+            index=models.Index(fields=['date_demande', 'id'], name='mission_date_demande_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehicule',
+            index=models.Index(fields=['marque', 'modele', 'id'], name='vehicule_marque_modele_id_idx'),
+        ),
+    ]
@@ -0,0 +1,90 @@
+import logging
+
+from django.db import OperationalError, migrations
+
+logger = logging.getLogger(__name__)
+
+# Colonnes indexées à la date de la migration (copie figée de search.SEARCH_COLUMNS :
+# la migration ne dépend pas du code applicatif, qui peut évoluer)
+SEARCH_COLUMNS = {
+    'mission_client': ('nom', 'prenom'),
+    'mission_vehicule': ('marque', 'modele', 'immatriculation'),
+}
+
+
+def _install_sqlite_fts(schema_editor, table, columns):
+    """Crée la table FTS5 miroir d'une table et les triggers qui la synchronisent.
+
+    Attention : sur SQLite, toute migration ultérieure qui modifie une colonne de ces tables
+    (AlterField, RemoveField, changement de contrainte...) recrée la table par copie, et les
+    triggers sont supprimés avec l'ancienne table sans que Django les recrée. La table FTS5
+    n'est alors plus tenue à jour : la vérification search.E001 le signale, et la commande
+    `rebuild_search_indexes` recrée les triggers et réindexe les lignes.
+    """
+    fts = f"{table}_fts"
+    cols = ", ".join(columns)
+    new_values = ", ".join(f"new.{column}" for column in columns)
+    old_values = ", ".join(f"old.{column}" for column in columns)
+
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{cols}, content='{table}', content_rowid='id', tokenize='trigram')"
+    )
+    schema_editor.execute(
+        f"CREATE TRIGGER IF NOT EXISTS {table}_fts_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_values}); END"
+    )
+    schema_editor.execute(
+        f"CREATE TRIGGER IF NOT EXISTS {table}_fts_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_values}); END"
+    )
+    schema_editor.execute(
+        f"CREATE TRIGGER IF NOT EXISTS {table}_fts_au AFTER UPDATE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_values}); END"
+    )
+    # Indexation des lignes déjà présentes
+    schema_editor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def forwards(apps, schema_editor):
+    # Index GIN pg_trgm sur PostgreSQL, tables FTS5 (tokenizer trigram) sur SQLite
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for table, columns in SEARCH_COLUMNS.items():
+            for column in columns:
+                schema_editor.execute(
+                    f"CREATE INDEX IF NOT EXISTS {table}_{column}_trgm_idx "
+                    f"ON {table} USING gin ({column} gin_trgm_ops)"
+                )
+    elif vendor == 'sqlite':
+        for table, columns in SEARCH_COLUMNS.items():
+            try:
+                _install_sqlite_fts(schema_editor, table, columns)
+            except OperationalError as e:
+                # SQLite compilé sans FTS5 ou sans tokenizer trigram : repli sur icontains
+                logger.warning("Table FTS5 non créée pour %s: %s", table, e)
+
+
+def backwards(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    for table, columns in SEARCH_COLUMNS.items():
+        if vendor == 'postgresql':
+            for column in columns:
+                schema_editor.execute(f"DROP INDEX IF EXISTS {table}_{column}_trgm_idx")
+        elif vendor == 'sqlite':
+            for suffix in ('ai', 'ad', 'au'):
+                schema_editor.execute(f"DROP TRIGGER IF EXISTS {table}_fts_{suffix}")
+            schema_editor.execute(f"DROP TABLE IF EXISTS {table}_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mission', '0005_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
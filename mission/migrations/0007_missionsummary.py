@@ -0,0 +1,103 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:36
+
+import django.db.models.deletion
+import mission.models
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Sum
+
+
+CHUNK_SIZE = 1000
+
+
+def build_summaries(apps, schema_editor):
+    """Remplissage initial à partir des missions existantes.
+
+    Calcul autonome sur les modèles historiques (apps.get_model) : la migration ne dépend pas de
+    my_airtable_api.utils.summary, qui peut évoluer. La commande rebuild_mission_summary recalcule
+    les résumés avec le code courant.
+    """
+    Mission = apps.get_model('mission', 'Mission')
+    MissionIntervention = apps.get_model('mission', 'MissionIntervention')
+    MissionSummary = apps.get_model('mission', 'MissionSummary')
+    db_alias = schema_editor.connection.alias
+
+    # Le taux et la durée supplémentaire sont saisis pour toute la mission : ceux de la première ligne
+    premiere_ligne = MissionIntervention.objects.using(db_alias).filter(mission_id=OuterRef('pk')).order_by('id')
+    last_id = 0
+    while True:
+        missions = list(
+            Mission.objects.using(db_alias).filter(id__gt=last_id).order_by('id').values(
+                'id', 'date_demande', 'remarque', 'priorite', 'client_id', 'vehicule_id',
+                'client__nom', 'client__prenom', 'vehicule__marque', 'vehicule__modele', 'vehicule__immatriculation',
+            ).annotate(
+                total=Sum('missionintervention__cout_total', default=0),
+                lignes=Count('missionintervention'),
+                premier_taux=Subquery(premiere_ligne.values('taux')[:1]),
+                premiere_duree=Subquery(premiere_ligne.values('duree_supplementaire')[:1]),
+            )[:CHUNK_SIZE]
+        )
+        if not missions:
+            break
+        libelles = {}
+        lignes = (
+            MissionIntervention.objects.using(db_alias)
+            .filter(mission_id__in=[mission['id'] for mission in missions])
+            .order_by('id').values_list('mission_id', 'intervention__libelle')
+        )
+        for mission_id, libelle in lignes:
+            libelles.setdefault(mission_id, []).append(libelle)
+
+        MissionSummary.objects.using(db_alias).bulk_create([
+            MissionSummary(
+                mission_id=mission['id'],
+                date_demande=mission['date_demande'],
+                remarque=mission['remarque'],
+                priorite=mission['priorite'],
+                client_id=mission['client_id'],
+                vehicule_id=mission['vehicule_id'],
+                client_libelle=f"{mission['client__nom']} {mission['client__prenom']}",
+                vehicule_libelle=(
+                    f"{mission['vehicule__marque']} {mission['vehicule__modele']} {mission['vehicule__immatriculation']}"
+                ),
+                taux=mission['premier_taux'] or "",
+                duree_supplementaire=mission['premiere_duree'] if mission['lignes'] else 0,
+                cout_total=mission['total'],
+                interventions_libelles=", ".join(libelles.get(mission['id'], [])),
+                nb_lignes=mission['lignes'],
+            ) for mission in missions
+        ])
+        last_id = missions[-1]['id']
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mission', '0006_search_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MissionSummary',
+            fields=[
+                ('mission', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='summary', serialize=False, to='mission.mission', verbose_name='mission')),
+                ('date_demande', models.DateTimeField(verbose_name='date de demande')),
+                ('remarque', models.TextField(null=True, verbose_name='remarque')),
+                ('priorite', models.CharField(choices=[('NON_PRIORITAIRE', 'Non prioritaire'), ('BASSE', 'Basse'), ('MOYENNE', 'Moyenne'), ('HAUTE', 'Haute'), ('URGENTE', 'Urgente')], verbose_name='priorité')),
+                ('client_libelle', models.CharField(max_length=101, verbose_name='client')),
+                ('vehicule_libelle', models.CharField(max_length=111, verbose_name='véhicule')),
+                ('taux', models.CharField(blank=True, default='', verbose_name='taux horaire')),
+                ('duree_supplementaire', mission.models.PositiveDecimalField(decimal_places=2, default=0.0, max_digits=6, null=True, verbose_name='durée supplémentaire')),
+                ('cout_total', mission.models.PositiveDecimalField(decimal_places=2, default=0.0, max_digits=12, verbose_name='coût total')),
+                ('interventions_libelles', models.TextField(blank=True, default='', verbose_name='interventions')),
+                ('nb_lignes', models.PositiveIntegerField(default=0, verbose_name='nombre de lignes')),
+                ('client', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='mission.client', verbose_name='client')),
+                ('vehicule', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='mission.vehicule', verbose_name='véhicule')),
+            ],
+            options={
+                'verbose_name': 'résumé de mission',
+                'verbose_name_plural': 'résumés de missions',
+                'indexes': [models.Index(fields=['date_demande', 'mission'], name='summary_date_mission_idx'), models.Index(fields=['priorite', 'date_demande', 'mission'], name='summary_priorite_date_idx')],
+            },
+        ),
+        migrations.RunPython(build_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,45 @@
+from django.db import migrations
+
+# Colonnes indexées à la date de la migration (copie figée de autocomplete.PREFIX_COLUMNS :
+# la migration ne dépend pas du code applicatif, qui peut évoluer)
+PREFIX_COLUMNS = {
+    'mission_client': ('nom', 'prenom', 'email', 'telephone'),
+    'mission_vehicule': ('immatriculation', 'numero_serie'),
+    'mission_intervention': ('libelle',),
+}
+
+
+def forwards(apps, schema_editor):
+    # Index de la forme exacte du SQL de `istartswith` : expression text_pattern_ops sur
+    # PostgreSQL, COLLATE NOCASE sur SQLite
+    vendor = schema_editor.connection.vendor
+    for table, columns in PREFIX_COLUMNS.items():
+        for column in columns:
+            if vendor == 'postgresql':
+                schema_editor.execute(
+                    f"CREATE INDEX IF NOT EXISTS {table}_{column}_prefix_idx "
+                    f"ON {table} (UPPER({column}::text) text_pattern_ops)"
+                )
+            elif vendor == 'sqlite':
+                schema_editor.execute(
+                    f"CREATE INDEX IF NOT EXISTS {table}_{column}_prefix_idx ON {table} ({column} COLLATE NOCASE)"
+                )
+
+
+def backwards(apps, schema_editor):
+    if schema_editor.connection.vendor not in ('postgresql', 'sqlite'):
+        return
+    for table, columns in PREFIX_COLUMNS.items():
+        for column in columns:
+            schema_editor.execute(f"DROP INDEX IF EXISTS {table}_{column}_prefix_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mission', '0007_missionsummary'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
@@ -47,6 +47,10 @@ class Client(models.Model):
         constraints = [
             models.UniqueConstraint(fields=['email'], name='unique_email')
             ]
+        indexes = [
+            # Pagination par curseur de la liste des clients
+            models.Index(fields=['nom', 'prenom', 'id'], name='client_nom_prenom_id_idx'),
+            ]
         
     nom = models.CharField(verbose_name="nom", null=False, blank=False, max_length=50)
     prenom = models.CharField(verbose_name="prénom", null=False, blank=False, max_length=50)
@@ -66,6 +70,10 @@ class Vehicule(models.Model):
         ordering = ["id"]
         verbose_name = "véhicule"
         verbose_name_plural = "véhicules"
+        indexes = [
+            # Pagination par curseur de la liste des véhicules
+            models.Index(fields=['marque', 'modele', 'id'], name='vehicule_marque_modele_id_idx'),
+            ]
         
     marque = models.CharField(verbose_name="marque", null=False, max_length=50)
     modele = models.CharField(verbose_name="modèle", null=False, max_length=50)
@@ -105,6 +113,10 @@ class Mission(models.Model):
     class Meta:
         ordering = ["-date_demande"]
         unique_together = ["vehicule", "client"]
+        indexes = [
+            # Pagination par curseur de la liste des missions
+            models.Index(fields=['date_demande', 'id'], name='mission_date_demande_id_idx'),
+            ]
         
     date_demande = models.DateTimeField(verbose_name="date de demande ", default=timezone.now, null=False) 
     remarque = models.TextField(verbose_name="remarque", null=True)
@@ -126,3 +138,32 @@ class MissionIntervention(models.Model):
     taux = models.CharField(verbose_name="taux horaire", null=False, choices=[(choix.name, choix.value) for choix in Taux])
     cout_total = PositiveDecimalField(verbose_name="total", null=False, default=0.00, max_digits=6, decimal_places=2)
 
+
+class MissionSummary(models.Model):
+    """Modèle de lecture dénormalisé : une ligne par mission, maintenue à chaque écriture.
+
+    La liste des missions se lit dans cette seule table au lieu de joindre
+    MissionIntervention, Mission, Vehicule, Client et Intervention.
+    """
+    class Meta:
+        verbose_name = "résumé de mission"
+        verbose_name_plural = "résumés de missions"
+        indexes = [
+            # Pagination par curseur de la liste des missions
+            models.Index(fields=['date_demande', 'mission'], name='summary_date_mission_idx'),
+            models.Index(fields=['priorite', 'date_demande', 'mission'], name='summary_priorite_date_idx'),
+            ]
+
+    mission = models.OneToOneField(verbose_name="mission", to=Mission, on_delete=models.CASCADE, primary_key=True, related_name="summary")
+    date_demande = models.DateTimeField(verbose_name="date de demande", null=False)
+    remarque = models.TextField(verbose_name="remarque", null=True)
+    priorite = models.CharField(verbose_name="priorité", choices = [(choix.name, choix.value) for choix in Priorite])
+    client = models.ForeignKey(verbose_name="client", to=Client, on_delete=models.CASCADE, null=False, related_name="+")
+    vehicule = models.ForeignKey(verbose_name="véhicule", to=Vehicule, on_delete=models.CASCADE, null=False, related_name="+")
+    client_libelle = models.CharField(verbose_name="client", null=False, max_length=101)
+    vehicule_libelle = models.CharField(verbose_name="véhicule", null=False, max_length=111)
+    taux = models.CharField(verbose_name="taux horaire", null=False, blank=True, default="")
+    duree_supplementaire = PositiveDecimalField(verbose_name="durée supplémentaire", null=True, default=0.00, max_digits=6, decimal_places=2)
+    cout_total = PositiveDecimalField(verbose_name="coût total", null=False, default=0.00, max_digits=12, decimal_places=2)
+    interventions_libelles = models.TextField(verbose_name="interventions", null=False, blank=True, default="")
+    nb_lignes = models.PositiveIntegerField(verbose_name="nombre de lignes", null=False, default=0)
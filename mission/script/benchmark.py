@@ -0,0 +1,638 @@
+"""
+Script de mesure des performances de la page de liste des missions.
+
+Ce script crée une base de données de test jetable, la remplit avec un nombre
+croissant de lignes MissionIntervention puis mesure le temps de rendu de `list_view`
+pour chaque taille. Le temps par millier de lignes doit rester à peu près constant
+si la construction des onglets est bien linéaire.
+
+Le mode `--recherche` compare, sur les mêmes données, le filtrage client/véhicule par
+`icontains` (ancien chemin) et par les index de recherche (trigrammes / FTS5).
+
+Le mode `--suite` remplit la base avec le générateur `seed` (tailles exprimées en missions)
+et mesure `list_view`, `show_mission_view`, `post_mission_form_view` et
+`list_interventions_view`. Les résultats peuvent être écrits en JSON (`--json`) pour
+comparer deux commits.
+
+Le mode `--asgi` compare le débit (requêtes par seconde) et les latences des vues de lecture
+servies par le handler WSGI (vues synchrones, un thread par requête concurrente) et par le
+handler ASGI (vues asynchrones, une tâche par requête concurrente), à forte concurrence. Les
+handlers sont appelés en mémoire, sans serveur ni réseau : l'écart mesuré est celui de
+l'application. Les chiffres n'ont de sens que sur PostgreSQL, où l'attente de la base domine.
+
+Le mode `--pool` mesure, sur la base PostgreSQL configurée (sans base de test), le débit de
+requêtes courtes qui ouvrent et ferment leur connexion comme une requête HTTP, avec le backend
+PostgreSQL de Django puis avec le backend à pool de connexions.
+
+Usage:
+    python manage.py benchmark
+    python manage.py benchmark --tailles 1000 10000 100000 --repetitions 3
+    python manage.py benchmark --recherche --tailles 100000 1000000
+    python manage.py benchmark --suite --tailles 1000 10000 100000 --json resultats.json
+    python manage.py benchmark --asgi --tailles 10000 --concurrence 64 --requetes 2000
+    python manage.py benchmark --pool --concurrence 8 --requetes 2000
+"""
+
+import asyncio
+import io
+import json
+import platform
+import random
+import statistics
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from decimal import Decimal
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.asgi import get_asgi_application
+from django.core.wsgi import get_wsgi_application
+from django.db import connection, connections
+from django.db.models import Q
+from django.test import Client as ClientHttp
+from django.test.utils import CaptureQueriesContext
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.urls import reverse
+from django.utils import timezone
+
+from mission.models import Client, Vehicule, Intervention, Mission, MissionIntervention, Priorite, Categorie, Taux
+from my_airtable_api.utils.filters import get_filters, filter_missions
+from my_airtable_api.utils.summary import rebuild_mission_summaries
+from my_airtable_api.utils.cache import list_view_cache
+from my_airtable_api.utils.catalog import invalidate_catalog
+from my_airtable_api.utils.pricing import price_line
+from my_airtable_api.utils.pool import pool_stats
+from mission.script.populate_db import seed
+
+TAILLES_PAR_DEFAUT = [1000, 10000, 100000]
+LIGNES_PAR_MISSION = 4
+TAILLE_LOT = 5000
+TAILLES_SUITE = [1000, 10000, 100000]
+TAILLES_ASGI = [10000]
+CONCURRENCE = 64
+# Par défaut, autant de requêtes simultanées que de threads par worker de `serve`
+CONCURRENCE_POOL = 8
+REQUETES = 2000
+TERMES_RECHERCHE = [('client-filtrage', 'om12'), ('vehicule-filtrage', 'eugeo'), ('vehicule-filtrage', 'dele4')]
+
+
+def vider_tables():
+    """Vide les tables métier entre deux mesures."""
+    MissionIntervention.objects.all().delete()
+    Mission.objects.all().delete()
+    Intervention.objects.all().delete()
+    Vehicule.objects.all().delete()
+    Client.objects.all().delete()
+
+
+def generer_donnees(nb_lignes, graine=0):
+    """Génère un jeu de données contenant environ `nb_lignes` lignes MissionIntervention.
+
+    Chaque client possède un véhicule et une mission de LIGNES_PAR_MISSION interventions.
+
+    Args:
+        nb_lignes (int): Le nombre de lignes MissionIntervention à créer.
+        graine (int, optional): La graine du générateur aléatoire. Defaults to 0.
+    """
+    rng = random.Random(graine)
+    nb_missions = max(1, nb_lignes // LIGNES_PAR_MISSION)
+
+    interventions = Intervention.objects.bulk_create([
+        Intervention(
+            libelle=f"Intervention {i}",
+            prix_unitaire=Decimal(rng.randint(50, 300)),
+            categorie=rng.choice([c.name for c in Categorie]),
+        ) for i in range(12)
+    ])
+
+    clients = Client.objects.bulk_create([
+        Client(
+            nom=f"Nom{i}", prenom=f"Prenom{i}", telephone="0123456789",
+            email=f"client{i}@example.com", adresse=f"{i} rue du Test",
+            code_postal="75001", ville="Paris",
+        ) for i in range(nb_missions)
+    ], batch_size=TAILLE_LOT)
+
+    vehicules = Vehicule.objects.bulk_create([
+        Vehicule(
+            marque=rng.choice(['Renault', 'Peugeot', 'Citroën', 'BMW']), modele=f"Modele{i % 50}",
+            immatriculation=f"AB{i % 1000:03d}CD", numero_serie=f"VIN{i:014d}",
+            client=client, vo=False, boite_vitesse='Manuelle', carburant='Essence',
+        ) for i, client in enumerate(clients)
+    ], batch_size=TAILLE_LOT)
+
+    maintenant = timezone.now()
+    missions = Mission.objects.bulk_create([
+        Mission(
+            date_demande=maintenant - timedelta(minutes=i),
+            priorite=rng.choice([p.name for p in Priorite]),
+            vehicule=vehicule, client_id=vehicule.client_id,
+        ) for i, vehicule in enumerate(vehicules)
+    ], batch_size=TAILLE_LOT)
+
+    lignes = []
+    for mission in missions:
+        for intervention in rng.sample(interventions, LIGNES_PAR_MISSION):
+            taux = rng.choice([t.name for t in Taux])
+            lignes.append(MissionIntervention(
+                mission=mission, intervention=intervention,
+                taux=taux, cout_total=price_line(intervention, taux),
+            ))
+    MissionIntervention.objects.bulk_create(lignes, batch_size=TAILLE_LOT)
+    rebuild_mission_summaries()
+    invalidate_catalog()
+
+
+def mesurer_vue(client_http, url, repetitions):
+    """Mesure le temps médian de réponse d'une URL, cache de la liste invalidé avant chaque appel.
+
+    Args:
+        client_http (django.test.Client): Le client HTTP de test authentifié.
+        url (str): L'URL à appeler.
+        repetitions (int): Le nombre d'appels à effectuer.
+
+    Returns:
+        float: Le temps médian de réponse en secondes.
+    """
+    durees = []
+    for _ in range(repetitions):
+        list_view_cache.bump_generation()
+        debut = time.perf_counter()
+        response = client_http.get(url)
+        durees.append(time.perf_counter() - debut)
+        assert response.status_code == 200, f"{url} a répondu {response.status_code}"
+    return statistics.median(durees)
+
+
+def filtrer_icontains(filters):
+    """Reproduit l'ancien filtrage par `icontains` sur les jointures client et véhicule."""
+    queryset = Mission.objects.all()
+    if filters['client']:
+        queryset = queryset.filter(Q(client__nom__icontains=filters['client']) | Q(client__prenom__icontains=filters['client']))
+    if filters['vehicule']:
+        queryset = queryset.filter(
+            Q(vehicule__marque__icontains=filters['vehicule']) |
+            Q(vehicule__modele__icontains=filters['vehicule']) |
+            Q(vehicule__immatriculation__icontains=filters['vehicule'])
+        )
+    return queryset
+
+
+def mesurer_requete(fabrique, repetitions):
+    """Mesure le temps médian d'évaluation d'une page de 50 missions filtrées.
+
+    Args:
+        fabrique (callable): Fonction retournant le queryset à évaluer.
+        repetitions (int): Le nombre d'évaluations.
+
+    Returns:
+        float: Le temps médian en secondes.
+    """
+    durees = []
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        list(fabrique().order_by('date_demande', 'id').values_list('id', flat=True)[:50])
+        durees.append(time.perf_counter() - debut)
+    return statistics.median(durees)
+
+
+def comparer_recherche(tailles, repetitions, stdout):
+    """Compare l'ancien filtrage `icontains` et les index de recherche pour chaque taille."""
+    resultats = []
+    for taille in tailles:
+        vider_tables()
+        generer_donnees(taille)
+        for param, terme in TERMES_RECHERCHE:
+            filters = get_filters({param: terme})
+            ancien = mesurer_requete(lambda: filtrer_icontains(filters), repetitions)
+            nouveau = mesurer_requete(lambda: filter_missions(Mission.objects.all(), filters), repetitions)
+            resultats.append({'lignes': taille, 'filtre': param, 'terme': terme,
+                              'icontains_ms': ancien * 1000, 'index_ms': nouveau * 1000})
+            stdout(f"{taille:>10} lignes  {param}={terme!r:8} : icontains {ancien * 1000:8.2f} ms"
+                   f" / index {nouveau * 1000:8.2f} ms")
+    return resultats
+
+
+def formulaire_mission(interventions_ids, numero):
+    """Construit les données POST d'une nouvelle mission (nouveau client et nouveau véhicule)."""
+    return {
+        'nom': f"Bench{numero}", 'prenom': "Suite", 'email': f"bench{numero}@example.com",
+        'telephone': "0123456789", 'adresse': "1 rue du Test", 'code_postal': "75001", 'ville': "Paris",
+        'marque': "Renault", 'modele': "Clio", 'immatriculation': f"BE{numero % 1000:03d}CH",
+        'numero_serie': f"BENCH{numero:012d}", 'boite_vitesse': "Manuelle", 'carburant': "Essence",
+        'interventions': ",".join(str(i) for i in interventions_ids),
+        'priorite': Priorite.MOYENNE.name, 'taux': Taux.T1.name, 'duree_supplementaire': "0.5",
+    }
+
+
+def mesurer_appels(appel, repetitions, statuts=(200,)):
+    """Mesure un appel HTTP répété : temps médian, minimal, maximal et nombre de requêtes SQL.
+
+    Args:
+        appel (callable): Fonction recevant le numéro de l'essai et retournant la réponse.
+        repetitions (int): Le nombre d'appels à effectuer.
+        statuts (tuple, optional): Les codes HTTP attendus. Defaults to (200,).
+
+    Returns:
+        dict: Les mesures en millisecondes et le nombre de requêtes du dernier appel.
+    """
+    durees = []
+    for essai in range(repetitions):
+        list_view_cache.bump_generation()
+        with CaptureQueriesContext(connection) as requetes:
+            debut = time.perf_counter()
+            response = appel(essai)
+            durees.append(time.perf_counter() - debut)
+        assert response.status_code in statuts, f"réponse {response.status_code}"
+    return {
+        'mediane_ms': statistics.median(durees) * 1000,
+        'min_ms': min(durees) * 1000,
+        'max_ms': max(durees) * 1000,
+        'requetes': len(requetes),
+    }
+
+
+def _commit_courant():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def lancer_suite(tailles=None, repetitions=5, stdout=print, sortie_json=None, graine=0):
+    """Mesure les vues principales sur des bases générées par `seed` de tailles croissantes.
+
+    Args:
+        tailles (list, optional): Les nombres de missions à générer. Defaults to TAILLES_SUITE.
+        repetitions (int, optional): Le nombre de mesures par vue. Defaults to 5.
+        stdout (callable, optional): La fonction d'affichage. Defaults to print.
+        sortie_json (str, optional): Le fichier JSON où écrire les résultats. Defaults to None.
+        graine (int, optional): La graine du générateur. Defaults to 0.
+
+    Returns:
+        dict: Les métadonnées de l'exécution et les résultats par taille et par vue.
+    """
+    tailles = tailles or TAILLES_SUITE
+    rapport = {
+        'meta': {
+            'commit': _commit_courant(),
+            'date': timezone.now().isoformat(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'base': connection.vendor,
+            'graine': graine,
+            'repetitions': repetitions,
+        },
+        'resultats': [],
+    }
+
+    setup_test_environment()
+    nom_base = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        utilisateur = User.objects.create_user('benchmark', password='benchmark')
+        client_http = ClientHttp()
+        client_http.force_login(utilisateur)
+
+        for taille in tailles:
+            totaux = seed(max(1, taille // 2), taille, graine=graine, stdout=lambda *args: None)
+            mission_id = Mission.objects.order_by('id').values_list('id', flat=True)[taille // 2]
+            interventions_ids = list(Intervention.objects.order_by('id').values_list('id', flat=True)[:3])
+
+            vues = {
+                'list_view': lambda essai: client_http.get(reverse('list_view')),
+                'show_mission_view': lambda essai: client_http.get(reverse('show_mission', args=[mission_id])),
+                'list_interventions_view': lambda essai: client_http.get(reverse('list_interventions_view')),
+                'post_mission_form_view': lambda essai: client_http.post(
+                    reverse('post_mission_form_view'), formulaire_mission(interventions_ids, taille + essai)
+                ),
+            }
+            for nom_vue, appel in vues.items():
+                statuts = (302,) if nom_vue == 'post_mission_form_view' else (200,)
+                mesures = mesurer_appels(appel, repetitions, statuts)
+                rapport['resultats'].append({'missions': taille, 'lignes': totaux['lignes'], 'vue': nom_vue, **mesures})
+                stdout(f"{taille:>10} missions  {nom_vue:<25} : {mesures['mediane_ms']:9.2f} ms"
+                       f" (min {mesures['min_ms']:.2f}, max {mesures['max_ms']:.2f}, {mesures['requetes']} requêtes)")
+    finally:
+        connection.creation.destroy_test_db(nom_base, verbosity=0)
+        teardown_test_environment()
+
+    if sortie_json:
+        with open(sortie_json, 'w', encoding='utf-8') as fichier:
+            json.dump(rapport, fichier, indent=2, ensure_ascii=False)
+        stdout(f"Résultats écrits dans {sortie_json}")
+    return rapport
+
+
+def _statistiques(durees, erreurs, total):
+    """Résume une série de latences : débit, médiane, 95e centile, maximum."""
+    durees = sorted(durees)
+    return {
+        'requetes': len(durees),
+        'erreurs': erreurs,
+        'rps': len(durees) / total if total else 0.0,
+        'mediane_ms': statistics.median(durees) * 1000,
+        'p95_ms': durees[int(len(durees) * 0.95) - 1] * 1000,
+        'max_ms': durees[-1] * 1000,
+    }
+
+
+def _environ_wsgi(chemin, cookie):
+    """Construit l'environnement WSGI minimal d'une requête GET authentifiée."""
+    path, _, query = chemin.partition('?')
+    return {
+        'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': query, 'SCRIPT_NAME': '',
+        'SERVER_NAME': 'testserver', 'SERVER_PORT': '80', 'SERVER_PROTOCOL': 'HTTP/1.1',
+        'REMOTE_ADDR': '127.0.0.1', 'HTTP_HOST': 'testserver', 'HTTP_COOKIE': cookie,
+        'wsgi.version': (1, 0), 'wsgi.url_scheme': 'http', 'wsgi.input': io.BytesIO(b''),
+        'wsgi.errors': io.StringIO(), 'wsgi.multithread': True, 'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+
+
+def mesurer_wsgi(chemins, cookie, concurrence, nb_requetes):
+    """Envoie `nb_requetes` requêtes au handler WSGI depuis `concurrence` threads.
+
+    Args:
+        chemins (list): Les URLs appelées à tour de rôle.
+        cookie (str): L'en-tête Cookie de la session authentifiée.
+        concurrence (int): Le nombre de requêtes simultanées.
+        nb_requetes (int): Le nombre total de requêtes.
+
+    Returns:
+        dict: Le débit et les latences mesurés.
+    """
+    application = get_wsgi_application()
+
+    def appel(numero):
+        statuts = []
+        debut = time.perf_counter()
+        reponse = application(_environ_wsgi(chemins[numero % len(chemins)], cookie),
+                              lambda statut, entetes, exc_info=None: statuts.append(int(statut[:3])))
+        for _ in reponse:
+            pass
+        reponse.close()
+        return time.perf_counter() - debut, statuts[0] != 200
+
+    debut = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrence) as pool:
+        resultats = list(pool.map(appel, range(nb_requetes)))
+    total = time.perf_counter() - debut
+    return _statistiques([duree for duree, _ in resultats], sum(erreur for _, erreur in resultats), total)
+
+
+async def _mesurer_asgi(chemins, cookie, concurrence, nb_requetes):
+    application = get_asgi_application()
+    semaphore = asyncio.Semaphore(concurrence)
+
+    async def appel(numero):
+        path, _, query = chemins[numero % len(chemins)].partition('?')
+        scope = {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+            'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'query_string': query.encode(),
+            'root_path': '', 'headers': [(b'host', b'testserver'), (b'cookie', cookie.encode())],
+            'client': ('127.0.0.1', 0), 'server': ('testserver', 80),
+        }
+        corps_envoye = False
+        statuts = []
+
+        async def receive():
+            nonlocal corps_envoye
+            if not corps_envoye:
+                corps_envoye = True
+                return {'type': 'http.request', 'body': b'', 'more_body': False}
+            # Le client ne se déconnecte jamais : Django annule cette attente en fin de réponse
+            await asyncio.Future()
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                statuts.append(message['status'])
+
+        async with semaphore:
+            debut = time.perf_counter()
+            await application(scope, receive, send)
+            return time.perf_counter() - debut, statuts[0] != 200
+
+    debut = time.perf_counter()
+    resultats = await asyncio.gather(*(appel(numero) for numero in range(nb_requetes)))
+    total = time.perf_counter() - debut
+    return _statistiques([duree for duree, _ in resultats], sum(erreur for _, erreur in resultats), total)
+
+
+def mesurer_asgi(chemins, cookie, concurrence, nb_requetes):
+    """Envoie `nb_requetes` requêtes au handler ASGI, au plus `concurrence` à la fois.
+
+    Args:
+        chemins (list): Les URLs appelées à tour de rôle.
+        cookie (str): L'en-tête Cookie de la session authentifiée.
+        concurrence (int): Le nombre de requêtes simultanées.
+        nb_requetes (int): Le nombre total de requêtes.
+
+    Returns:
+        dict: Le débit et les latences mesurés.
+    """
+    return asyncio.run(_mesurer_asgi(chemins, cookie, concurrence, nb_requetes))
+
+
+def comparer_asgi_wsgi(tailles=None, concurrence=CONCURRENCE, nb_requetes=REQUETES, stdout=print,
+                       sortie_json=None, graine=0):
+    """Compare le débit des vues de lecture sous WSGI et sous ASGI, à forte concurrence.
+
+    Trois configurations sont mesurées sur les mêmes données : WSGI avec les vues synchrones,
+    ASGI avec les vues synchrones (exécutées dans des threads) et ASGI avec les vues asynchrones.
+    Chaque configuration appelle à tour de rôle la liste, le détail de missions variées et le
+    catalogue des interventions.
+
+    Args:
+        tailles (list, optional): Les nombres de missions à générer. Defaults to TAILLES_ASGI.
+        concurrence (int, optional): Le nombre de requêtes simultanées. Defaults to CONCURRENCE.
+        nb_requetes (int, optional): Le nombre de requêtes par configuration. Defaults to REQUETES.
+        stdout (callable, optional): La fonction d'affichage. Defaults to print.
+        sortie_json (str, optional): Le fichier JSON où écrire les résultats. Defaults to None.
+        graine (int, optional): La graine du générateur. Defaults to 0.
+
+    Returns:
+        dict: Les métadonnées de l'exécution et les résultats par taille et par configuration.
+    """
+    tailles = tailles or TAILLES_ASGI
+    rapport = {
+        'meta': {
+            'commit': _commit_courant(),
+            'date': timezone.now().isoformat(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'base': connection.vendor,
+            'graine': graine,
+            'concurrence': concurrence,
+            'requetes': nb_requetes,
+        },
+        'resultats': [],
+    }
+
+    setup_test_environment()
+    nom_base = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        utilisateur = User.objects.create_user('benchmark', password='benchmark')
+        client_http = ClientHttp()
+        client_http.force_login(utilisateur)
+        cookie = f"{settings.SESSION_COOKIE_NAME}={client_http.cookies[settings.SESSION_COOKIE_NAME].value}"
+
+        for taille in tailles:
+            totaux = seed(max(1, taille // 2), taille, graine=graine, stdout=lambda *args: None)
+            missions_ids = list(Mission.objects.order_by('id').values_list('id', flat=True)[:100])
+
+            configurations = {
+                'wsgi': (mesurer_wsgi, 'list_view', 'show_mission', 'list_interventions_view'),
+                'asgi_vues_sync': (mesurer_asgi, 'list_view', 'show_mission', 'list_interventions_view'),
+                'asgi_vues_async': (mesurer_asgi, 'list_view_async', 'show_mission_async',
+                                    'list_interventions_async'),
+            }
+            for nom, (mesurer, liste, detail, catalogue) in configurations.items():
+                chemins = [reverse(liste), reverse(catalogue)]
+                chemins += [reverse(detail, args=[mission_id]) for mission_id in missions_ids]
+                list_view_cache.bump_generation()
+                mesures = mesurer(chemins, cookie, concurrence, nb_requetes)
+                rapport['resultats'].append({'missions': taille, 'lignes': totaux['lignes'],
+                                             'configuration': nom, **mesures})
+                stdout(f"{taille:>10} missions  {nom:<16} : {mesures['rps']:8.1f} req/s"
+                       f"  (médiane {mesures['mediane_ms']:.1f} ms, p95 {mesures['p95_ms']:.1f} ms,"
+                       f" {mesures['erreurs']} erreurs)")
+    finally:
+        connection.creation.destroy_test_db(nom_base, verbosity=0)
+        teardown_test_environment()
+
+    if sortie_json:
+        with open(sortie_json, 'w', encoding='utf-8') as fichier:
+            json.dump(rapport, fichier, indent=2, ensure_ascii=False)
+        stdout(f"Résultats écrits dans {sortie_json}")
+    return rapport
+
+
+def mesurer_connexions(alias, concurrence, nb_requetes):
+    """Simule `nb_requetes` requêtes HTTP sur une base : connexion, petite requête, fermeture.
+
+    Django ferme la connexion en fin de requête (CONN_MAX_AGE à 0) : sans pool, chaque requête
+    paie l'ouverture d'une connexion ; avec le pool, elle l'emprunte et la rend.
+
+    Args:
+        alias (str): L'alias de la base de données.
+        concurrence (int): Le nombre de requêtes simultanées.
+        nb_requetes (int): Le nombre total de requêtes.
+
+    Returns:
+        dict: Le débit et les latences mesurés.
+    """
+    def appel(numero):
+        debut = time.perf_counter()
+        try:
+            list(Intervention.objects.using(alias).order_by('id').values_list('id', 'libelle')[:10])
+            erreur = False
+        except Exception:
+            erreur = True
+        finally:
+            connections[alias].close()
+        return time.perf_counter() - debut, erreur
+
+    debut = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrence) as pool:
+        resultats = list(pool.map(appel, range(nb_requetes)))
+    total = time.perf_counter() - debut
+    return _statistiques([duree for duree, _ in resultats], sum(erreur for _, erreur in resultats), total)
+
+
+def comparer_pool(concurrence=CONCURRENCE_POOL, nb_requetes=REQUETES, stdout=print, sortie_json=None):
+    """Compare le débit avec et sans pool de connexions, sur la base PostgreSQL configurée.
+
+    Les deux configurations utilisent les paramètres de la base 'default' sous deux alias
+    temporaires, l'un avec le backend PostgreSQL de Django, l'autre avec le backend à pool.
+
+    Args:
+        concurrence (int, optional): Le nombre de requêtes simultanées. Defaults to CONCURRENCE_POOL.
+        nb_requetes (int, optional): Le nombre de requêtes par configuration. Defaults to REQUETES.
+        stdout (callable, optional): La fonction d'affichage. Defaults to print.
+        sortie_json (str, optional): Le fichier JSON où écrire les résultats. Defaults to None.
+
+    Returns:
+        dict: Les métadonnées de l'exécution, les résultats par configuration et l'état du pool.
+    """
+    if connection.vendor != 'postgresql':
+        stdout(f"Le benchmark du pool nécessite PostgreSQL (base configurée : {connection.vendor}).")
+        return None
+
+    rapport = {
+        'meta': {
+            'commit': _commit_courant(),
+            'date': timezone.now().isoformat(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'concurrence': concurrence,
+            'requetes': nb_requetes,
+        },
+        'resultats': [],
+    }
+    configurations = {
+        'sans_pool': 'django.db.backends.postgresql',
+        'pool': 'my_airtable_api.db.postgresql_pool',
+    }
+    for nom, moteur in configurations.items():
+        alias = f'benchmark_{nom}'
+        connections.settings[alias] = {**connections.settings['default'], 'ENGINE': moteur, 'CONN_MAX_AGE': 0}
+        mesures = mesurer_connexions(alias, concurrence, nb_requetes)
+        rapport['resultats'].append({'configuration': nom, **mesures})
+        stdout(f"{nom:<10} : {mesures['rps']:8.1f} req/s  (médiane {mesures['mediane_ms']:.1f} ms,"
+               f" p95 {mesures['p95_ms']:.1f} ms, {mesures['erreurs']} erreurs)")
+    rapport['pool'] = pool_stats()
+    for cle, stats in rapport['pool'].items():
+        stdout(f"Pool {cle} : {stats['created']} connexion(s) ouverte(s) pour {stats['checkouts']} emprunt(s),"
+               f" {stats['waits']} attente(s), obtention moyenne {stats['checkout_avg_ms']:.2f} ms")
+
+    if sortie_json:
+        with open(sortie_json, 'w', encoding='utf-8') as fichier:
+            json.dump(rapport, fichier, indent=2, ensure_ascii=False)
+        stdout(f"Résultats écrits dans {sortie_json}")
+    return rapport
+
+
+def lancer_benchmark(tailles=None, repetitions=3, stdout=print, recherche=False):
+    """Mesure le temps de rendu de `list_view` pour chaque taille de jeu de données.
+
+    Args:
+        tailles (list, optional): Les nombres de lignes à tester. Defaults to TAILLES_PAR_DEFAUT.
+        repetitions (int, optional): Le nombre de mesures par taille. Defaults to 3.
+        stdout (callable, optional): La fonction d'affichage. Defaults to print.
+        recherche (bool, optional): Compare plutôt les deux chemins de filtrage. Defaults to False.
+
+    Returns:
+        list: Une liste de dictionnaires de résultats.
+    """
+    tailles = tailles or TAILLES_PAR_DEFAUT
+    resultats = []
+
+    setup_test_environment()
+    nom_base = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        if recherche:
+            return comparer_recherche(tailles, repetitions, stdout)
+
+        utilisateur = User.objects.create_user('benchmark', password='benchmark')
+        client_http = ClientHttp()
+        client_http.force_login(utilisateur)
+        url = reverse('list_view')
+
+        for taille in tailles:
+            vider_tables()
+            generer_donnees(taille)
+            secondes = mesurer_vue(client_http, url, repetitions)
+            resultats.append({'lignes': taille, 'secondes': secondes})
+            stdout(f"{taille:>10} lignes : {secondes:8.3f} s ({secondes / taille * 1000:.4f} s / 1k lignes)")
+    finally:
+        connection.creation.destroy_test_db(nom_base, verbosity=0)
+        teardown_test_environment()
+
+    return resultats
@@ -11,12 +11,15 @@ Usage:
 
 Ou depuis le terminal:
     python -c "import os; os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'my_airtable_api.settings'); import django; django.setup(); exec(open('mission/script/populate_db.py').read())"
+
+Mode seed (tests de charge), déterministe pour une graine donnée :
+    python manage.py seed --clients 100000 --missions 1000000 --seed 42
 """
 
 import os
 import sys
 import django
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone as dt_timezone
 from decimal import Decimal
 import random
 
@@ -24,9 +27,186 @@ import random
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'my_airtable_api.settings')
 django.setup()
 
-from mission.models import Client, Vehicule, Intervention, Mission, MissionIntervention, Priorite, Categorie, Taux
-from django.db import transaction
+from mission.models import Client, Vehicule, Intervention, Mission, MissionIntervention, MissionSummary, Priorite, Categorie, Taux
+from django.core.management.color import no_style
+from django.db import connection, transaction
 from django.utils import timezone
+from my_airtable_api.utils.summary import rebuild_mission_summaries
+from my_airtable_api.utils.cache import invalidate_list_cache
+from my_airtable_api.utils.catalog import invalidate_catalog
+from my_airtable_api.utils.pricing import price_line, price_lines
+
+CLIENTS_BASE = [
+    {
+        'nom': 'Dupont', 'prenom': 'Jean', 'societe': 'Dupont SARL',
+        'telephone': '0123456789', 'email': 'jean.dupont@email.com',
+        'adresse': '15 rue de la Paix', 'code_postal': '75001', 'ville': 'Paris'
+    },
+    {
+        'nom': 'Martin', 'prenom': 'Marie', 'societe': None,
+        'telephone': '0234567890', 'email': 'marie.martin@email.com',
+        'adresse': '28 avenue des Champs', 'code_postal': '69001', 'ville': 'Lyon'
+    },
+    {
+        'nom': 'Leroy', 'prenom': 'Pierre', 'societe': 'Garage Leroy',
+        'telephone': '0345678901', 'email': 'pierre.leroy@email.com',
+        'adresse': '42 boulevard du Commerce', 'code_postal': '33000', 'ville': 'Bordeaux'
+    },
+    {
+        'nom': 'Durand', 'prenom': 'Sophie', 'societe': None,
+        'telephone': '0456789012', 'email': 'sophie.durand@email.com',
+        'adresse': '7 place de la République', 'code_postal': '13001', 'ville': 'Marseille'
+    },
+    {
+        'nom': 'Moreau', 'prenom': 'Luc', 'societe': 'Transport Moreau',
+        'telephone': '0567890123', 'email': 'luc.moreau@email.com',
+        'adresse': '33 rue du Port', 'code_postal': '44000', 'ville': 'Nantes'
+    },
+    {
+        'nom': 'Roux', 'prenom': 'Amélie', 'societe': None,
+        'telephone': '0678901234', 'email': 'amelie.roux@email.com',
+        'adresse': '19 avenue de la Liberté', 'code_postal': '31000', 'ville': 'Toulouse'
+    },
+    {
+        'nom': 'Garnier', 'prenom': 'Thomas', 'societe': 'Garnier & Co',
+        'telephone': '0789012345', 'email': 'thomas.garnier@email.com',
+        'adresse': '8 rue de la Gare', 'code_postal': '67000', 'ville': 'Strasbourg'
+    },
+    {
+        'nom': 'Blanc', 'prenom': 'Julie', 'societe': None,
+        'telephone': '0890123456', 'email': 'julie.blanc@email.com',
+        'adresse': '14 place du Marché', 'code_postal': '59000', 'ville': 'Lille'
+    }
+]
+
+MARQUES_MODELES = [
+    ('Renault', 'Clio'), ('Peugeot', '308'), ('Citroën', 'C4'),
+    ('Volkswagen', 'Golf'), ('BMW', 'Série 3'), ('Mercedes', 'Classe A'),
+    ('Audi', 'A4'), ('Ford', 'Focus'), ('Opel', 'Astra'),
+    ('Toyota', 'Yaris'), ('Nissan', 'Micra'), ('Hyundai', 'i20')
+]
+
+CARBURANTS = ['Essence', 'Diesel', 'Hybride', 'Électrique']
+BOITES_VITESSE = ['Manuelle', 'Automatique']
+
+REMARQUES = [
+    "Client très pressé",
+    "Véhicule accidenté",
+    "Intervention sous garantie",
+    "Client fidèle - tarif préférentiel",
+    "Urgent - véhicule de service",
+    "Contrôle avant vente",
+    None,  # Pas de remarque
+    None,
+    None
+]
+
+INTERVENTIONS_DATA = [
+    # Interventions Méca BCR
+    {
+        'libelle': 'Vidange moteur',
+        'duree_intervention': Decimal('1.5'),
+        'prix_unitaire': Decimal('80.00'),
+        'forfait': Decimal('0.00'),
+        'description': 'Vidange complète du moteur avec changement du filtre à huile',
+        'categorie': 'MECA_BCR'
+    },
+    {
+        'libelle': 'Changement plaquettes de frein',
+        'duree_intervention': Decimal('2.0'),
+        'prix_unitaire': Decimal('120.00'),
+        'forfait': Decimal('0.00'),
+        'description': 'Remplacement des plaquettes de frein avant',
+        'categorie': 'MECA_BCR'
+    },
+    {
+        'libelle': 'Contrôle technique',
+        'duree_intervention': Decimal('1.0'),
+        'prix_unitaire': Decimal('0.00'),
+        'forfait': Decimal('75.00'),
+        'description': 'Contrôle technique réglementaire',
+        'categorie': 'MECA_BCR'
+    },
+    {
+        'libelle': 'Changement courroie de distribution',
+        'duree_intervention': Decimal('4.0'),
+        'prix_unitaire': Decimal('250.00'),
+        'forfait': Decimal('0.00'),
+        'description': 'Remplacement de la courroie de distribution et des galets',
+        'categorie': 'MECA_BCR'
+    },
+    
+    # Interventions Méca CBC
+    {
+        'libelle': 'Réparation boîte de vitesses',
+        'duree_intervention': Decimal('6.0'),
+        'prix_unitaire': Decimal('300.00'),
+        'forfait': Decimal('0.00'),
+        'description': 'Démontage et réparation de la boîte de vitesses',
+        'categorie': 'MECA_CBC'
+    },
+    {
+        'libelle': 'Réfection moteur',
+        'duree_intervention': Decimal('12.0'),
+        'prix_unitaire': Decimal('400.00'),
+        'forfait': Decimal('0.00'),
+        'description': 'Réfection complète du moteur',
+        'categorie': 'MECA_CBC'
+    },
+    {
+        'libelle': 'Diagnostic électronique',
+        'duree_intervention': Decimal('1.5'),
+        'prix_unitaire': Decimal('90.00'),
+        'forfait': Decimal('0.00'),
+        'description': 'Diagnostic complet des systèmes électroniques',
+        'categorie': 'MECA_CBC'
+    },
+    
+    # Interventions Carrosserie
+    {
+        'libelle': 'Réparation impact pare-chocs',
+        'duree_intervention': Decimal('3.0'),
+        'prix_unitaire': Decimal('150.00'),
+        'forfait': Decimal('0.00'),
+        'description': 'Réparation et peinture d\'un impact sur pare-chocs',
+        'categorie': 'CARROSSERIE'
+    },
+    {
+        'libelle': 'Remplacement rétroviseur',
+        'duree_intervention': Decimal('0.5'),
+        'prix_unitaire': Decimal('80.00'),
+        'forfait': Decimal('0.00'),
+        'description': 'Remplacement d\'un rétroviseur extérieur',
+        'categorie': 'CARROSSERIE'
+    },
+    {
+        'libelle': 'Débosselage porte',
+        'duree_intervention': Decimal('2.5'),
+        'prix_unitaire': Decimal('120.00'),
+        'forfait': Decimal('0.00'),
+        'description': 'Débosselage et remise en forme d\'une porte',
+        'categorie': 'CARROSSERIE'
+    },
+    
+    # Interventions Personnalisées
+    {
+        'libelle': 'Installation kit main libre',
+        'duree_intervention': Decimal('1.0'),
+        'prix_unitaire': Decimal('0.00'),
+        'forfait': Decimal('120.00'),
+        'description': 'Installation et configuration d\'un kit main libre',
+        'categorie': 'CUSTOM'
+    },
+    {
+        'libelle': 'Pose film de protection',
+        'duree_intervention': Decimal('2.0'),
+        'prix_unitaire': Decimal('0.00'),
+        'forfait': Decimal('200.00'),
+        'description': 'Pose de film de protection sur la carrosserie',
+        'categorie': 'CUSTOM'
+    }
+]
+
 
 def clear_database():
     """Vide toutes les tables pour un nouveau remplissage."""
@@ -43,51 +223,8 @@ def create_clients():
     """Crée des clients de test."""
     print("Création des clients...")
     
-    clients_data = [
-        {
-            'nom': 'Dupont', 'prenom': 'Jean', 'societe': 'Dupont SARL',
-            'telephone': '0123456789', 'email': 'jean.dupont@email.com',
-            'adresse': '15 rue de la Paix', 'code_postal': '75001', 'ville': 'Paris'
-        },
-        {
-            'nom': 'Martin', 'prenom': 'Marie', 'societe': None,
-            'telephone': '0234567890', 'email': 'marie.martin@email.com',
-            'adresse': '28 avenue des Champs', 'code_postal': '69001', 'ville': 'Lyon'
-        },
-        {
-            'nom': 'Leroy', 'prenom': 'Pierre', 'societe': 'Garage Leroy',
-            'telephone': '0345678901', 'email': 'pierre.leroy@email.com',
-            'adresse': '42 boulevard du Commerce', 'code_postal': '33000', 'ville': 'Bordeaux'
-        },
-        {
-            'nom': 'Durand', 'prenom': 'Sophie', 'societe': None,
-            'telephone': '0456789012', 'email': 'sophie.durand@email.com',
-            'adresse': '7 place de la République', 'code_postal': '13001', 'ville': 'Marseille'
-        },
-        {
-            'nom': 'Moreau', 'prenom': 'Luc', 'societe': 'Transport Moreau',
-            'telephone': '0567890123', 'email': 'luc.moreau@email.com',
-            'adresse': '33 rue du Port', 'code_postal': '44000', 'ville': 'Nantes'
-        },
-        {
-            'nom': 'Roux', 'prenom': 'Amélie', 'societe': None,
-            'telephone': '0678901234', 'email': 'amelie.roux@email.com',
-            'adresse': '19 avenue de la Liberté', 'code_postal': '31000', 'ville': 'Toulouse'
-        },
-        {
-            'nom': 'Garnier', 'prenom': 'Thomas', 'societe': 'Garnier & Co',
-            'telephone': '0789012345', 'email': 'thomas.garnier@email.com',
-            'adresse': '8 rue de la Gare', 'code_postal': '67000', 'ville': 'Strasbourg'
-        },
-        {
-            'nom': 'Blanc', 'prenom': 'Julie', 'societe': None,
-            'telephone': '0890123456', 'email': 'julie.blanc@email.com',
-            'adresse': '14 place du Marché', 'code_postal': '59000', 'ville': 'Lille'
-        }
-    ]
-    
     clients = []
-    for data in clients_data:
+    for data in CLIENTS_BASE:
         client = Client.objects.create(**data)
         clients.append(client)
         print(f"  Client créé: {client}")
@@ -99,23 +236,13 @@ def create_vehicules(clients):
     """Crée des véhicules de test associés aux clients."""
     print("Création des véhicules...")
     
-    marques_modeles = [
-        ('Renault', 'Clio'), ('Peugeot', '308'), ('Citroën', 'C4'),
-        ('Volkswagen', 'Golf'), ('BMW', 'Série 3'), ('Mercedes', 'Classe A'),
-        ('Audi', 'A4'), ('Ford', 'Focus'), ('Opel', 'Astra'),
-        ('Toyota', 'Yaris'), ('Nissan', 'Micra'), ('Hyundai', 'i20')
-    ]
-    
-    carburants = ['Essence', 'Diesel', 'Hybride', 'Électrique']
-    boites_vitesse = ['Manuelle', 'Automatique']
-    
     vehicules = []
     for i, client in enumerate(clients):
         # Chaque client a 1 à 3 véhicules
         nb_vehicules = random.randint(1, 3)
         
         for j in range(nb_vehicules):
-            marque, modele = random.choice(marques_modeles)
+            marque, modele = random.choice(MARQUES_MODELES)
             
             # Génération d'une immatriculation française
             lettres = ''.join(random.choices('ABCDEFGHIJKLMNOPQRSTUVWXYZ', k=2))
@@ -143,8 +270,8 @@ def create_vehicules(clients):
                 remarque=f"Véhicule {j+1} de {client.prenom} {client.nom}" if j > 0 else None,
                 client=client,
                 vo=random.choice([True, False]),
-                boite_vitesse=random.choice(boites_vitesse),
-                carburant=random.choice(carburants)
+                boite_vitesse=random.choice(BOITES_VITESSE),
+                carburant=random.choice(CARBURANTS)
             )
             vehicules.append(vehicule)
             print(f"  Véhicule créé: {vehicule} ({vehicule.immatriculation}) - {client}")
@@ -156,114 +283,8 @@ def create_interventions():
     """Crée des interventions de test."""
     print("Création des interventions...")
     
-    interventions_data = [
-        # Interventions Méca BCR
-        {
-            'libelle': 'Vidange moteur',
-            'duree_intervention': Decimal('1.5'),
-            'prix_unitaire': Decimal('80.00'),
-            'forfait': Decimal('0.00'),
-            'description': 'Vidange complète du moteur avec changement du filtre à huile',
-            'categorie': 'MECA_BCR'
-        },
-        {
-            'libelle': 'Changement plaquettes de frein',
-            'duree_intervention': Decimal('2.0'),
-            'prix_unitaire': Decimal('120.00'),
-            'forfait': Decimal('0.00'),
-            'description': 'Remplacement des plaquettes de frein avant',
-            'categorie': 'MECA_BCR'
-        },
-        {
-            'libelle': 'Contrôle technique',
-            'duree_intervention': Decimal('1.0'),
-            'prix_unitaire': Decimal('0.00'),
-            'forfait': Decimal('75.00'),
-            'description': 'Contrôle technique réglementaire',
-            'categorie': 'MECA_BCR'
-        },
-        {
-            'libelle': 'Changement courroie de distribution',
-            'duree_intervention': Decimal('4.0'),
-            'prix_unitaire': Decimal('250.00'),
-            'forfait': Decimal('0.00'),
-            'description': 'Remplacement de la courroie de distribution et des galets',
-            'categorie': 'MECA_BCR'
-        },
-        
-        # Interventions Méca CBC
-        {
-            'libelle': 'Réparation boîte de vitesses',
-            'duree_intervention': Decimal('6.0'),
-            'prix_unitaire': Decimal('300.00'),
-            'forfait': Decimal('0.00'),
-            'description': 'Démontage et réparation de la boîte de vitesses',
-            'categorie': 'MECA_CBC'
-        },
-        {
-            'libelle': 'Réfection moteur',
-            'duree_intervention': Decimal('12.0'),
-            'prix_unitaire': Decimal('400.00'),
-            'forfait': Decimal('0.00'),
-            'description': 'Réfection complète du moteur',
-            'categorie': 'MECA_CBC'
-        },
-        {
-            'libelle': 'Diagnostic électronique',
-            'duree_intervention': Decimal('1.5'),
-            'prix_unitaire': Decimal('90.00'),
-            'forfait': Decimal('0.00'),
-            'description': 'Diagnostic complet des systèmes électroniques',
-            'categorie': 'MECA_CBC'
-        },
-        
-        # Interventions Carrosserie
-        {
-            'libelle': 'Réparation impact pare-chocs',
-            'duree_intervention': Decimal('3.0'),
-            'prix_unitaire': Decimal('150.00'),
-            'forfait': Decimal('0.00'),
-            'description': 'Réparation et peinture d\'un impact sur pare-chocs',
-            'categorie': 'CARROSSERIE'
-        },
-        {
-            'libelle': 'Remplacement rétroviseur',
-            'duree_intervention': Decimal('0.5'),
-            'prix_unitaire': Decimal('80.00'),
-            'forfait': Decimal('0.00'),
-            'description': 'Remplacement d\'un rétroviseur extérieur',
-            'categorie': 'CARROSSERIE'
-        },
-        {
-            'libelle': 'Débosselage porte',
-            'duree_intervention': Decimal('2.5'),
-            'prix_unitaire': Decimal('120.00'),
-            'forfait': Decimal('0.00'),
-            'description': 'Débosselage et remise en forme d\'une porte',
-            'categorie': 'CARROSSERIE'
-        },
-        
-        # Interventions Personnalisées
-        {
-            'libelle': 'Installation kit main libre',
-            'duree_intervention': Decimal('1.0'),
-            'prix_unitaire': Decimal('0.00'),
-            'forfait': Decimal('120.00'),
-            'description': 'Installation et configuration d\'un kit main libre',
-            'categorie': 'CUSTOM'
-        },
-        {
-            'libelle': 'Pose film de protection',
-            'duree_intervention': Decimal('2.0'),
-            'prix_unitaire': Decimal('0.00'),
-            'forfait': Decimal('200.00'),
-            'description': 'Pose de film de protection sur la carrosserie',
-            'categorie': 'CUSTOM'
-        }
-    ]
-    
     interventions = []
-    for data in interventions_data:
+    for data in INTERVENTIONS_DATA:
         intervention = Intervention.objects.create(**data)
         interventions.append(intervention)
         print(f"  Intervention créée: {intervention.libelle} ({intervention.categorie})")
@@ -308,21 +329,9 @@ def create_missions_and_relations(clients, vehicules, interventions):
             seconds=random.randint(0, int((end_date - start_date).total_seconds()))
         )
         
-        remarques = [
-            "Client très pressé",
-            "Véhicule accidenté",
-            "Intervention sous garantie",
-            "Client fidèle - tarif préférentiel",
-            "Urgent - véhicule de service",
-            "Contrôle avant vente",
-            None,  # Pas de remarque
-            None,
-            None
-        ]
-        
         mission = Mission.objects.create(
             date_demande=date_demande,
-            remarque=random.choice(remarques),
+            remarque=random.choice(REMARQUES),
             priorite=random.choice(priorites),
             vehicule=vehicule,
             client=client
@@ -338,21 +347,9 @@ def create_missions_and_relations(clients, vehicules, interventions):
         for intervention in selected_interventions:
             # Calcul du coût total
             taux = random.choice(taux_choices)
-            duree_supplementaire = Decimal(str(random.uniform(0, 2)))
+            duree_supplementaire = Decimal(str(random.uniform(0, 2))).quantize(Decimal('0.01'))
             
-            # Calcul selon le type d'intervention
-            if intervention.is_forfait:
-                cout_total = intervention.forfait
-            else:
-                # Simulation d'un calcul basé sur le taux horaire
-                taux_horaire = {
-                    'HORAIRE': Decimal('50.00'),
-                    'T1': Decimal('60.00'),
-                    'T2': Decimal('70.00'),
-                    'T3': Decimal('80.00')
-                }
-                duree_totale = intervention.duree_intervention + duree_supplementaire
-                cout_total = intervention.prix_unitaire + (duree_totale * taux_horaire[taux])
+            cout_total = price_line(intervention, taux, duree_supplementaire)
             
             MissionIntervention.objects.create(
                 mission=mission,
@@ -370,6 +367,138 @@ def create_missions_and_relations(clients, vehicules, interventions):
     return missions
 
 
+# Mode seed : volumes paramétrables, génération déterministe et insertions par lots
+DATE_REFERENCE = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+TAILLE_LOT = 5000
+LETTRES = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+
+def vider_tables_seed():
+    """Vide les tables métier en une seule instruction (TRUNCATE / DELETE), sans charger les objets."""
+    tables = [model._meta.db_table for model in (MissionSummary, MissionIntervention, Mission, Intervention, Vehicule, Client)]
+    connection.ops.execute_sql_flush(connection.ops.sql_flush(no_style(), tables))
+
+
+def seed_interventions():
+    """Crée le catalogue d'interventions en une seule insertion."""
+    return Intervention.objects.bulk_create([
+        Intervention(**data, is_forfait=data['forfait'] > 0) for data in INTERVENTIONS_DATA
+    ])
+
+
+def seed_clients(rng, nb_clients, taille_lot):
+    """Crée `nb_clients` clients par lots et retourne leurs identifiants."""
+    clients_ids = []
+    for debut in range(0, nb_clients, taille_lot):
+        lot = []
+        for i in range(debut, min(debut + taille_lot, nb_clients)):
+            base = CLIENTS_BASE[i % len(CLIENTS_BASE)]
+            lot.append(Client(
+                nom=f"{base['nom']}{i}", prenom=base['prenom'], societe=base['societe'],
+                telephone=f"0{rng.randint(100000000, 999999999)}", email=f"client{i}@seed.example.com",
+                adresse=f"{rng.randint(1, 200)} {base['adresse'].split(' ', 1)[1]}",
+                code_postal=base['code_postal'], ville=base['ville'],
+            ))
+        clients_ids.extend(client.id for client in Client.objects.bulk_create(lot))
+    return clients_ids
+
+
+def seed_lot_missions(rng, debut, fin, clients_ids, interventions):
+    """Crée les véhicules, missions et lignes des missions d'indices [debut, fin).
+
+    Chaque mission porte sur un véhicule distinct (contrainte unique véhicule/client).
+    """
+    vehicules = []
+    for i in range(debut, fin):
+        marque, modele = rng.choice(MARQUES_MODELES)
+        vehicules.append(Vehicule(
+            marque=marque, modele=modele,
+            immatriculation=f"{''.join(rng.choices(LETTRES, k=2))}-{rng.randint(100, 999)}-{''.join(rng.choices(LETTRES, k=2))}",
+            numero_serie=f"VF{i:015d}",
+            mise_circulation=(DATE_REFERENCE - timedelta(days=rng.randint(0, 5000))).date(),
+            kilometrage=rng.randint(5000, 200000),
+            client_id=clients_ids[i % len(clients_ids)],
+            vo=rng.random() < 0.5,
+            boite_vitesse=rng.choice(BOITES_VITESSE),
+            carburant=rng.choice(CARBURANTS),
+        ))
+    vehicules = Vehicule.objects.bulk_create(vehicules)
+
+    priorites = [p.name for p in Priorite]
+    missions = Mission.objects.bulk_create([
+        Mission(
+            date_demande=DATE_REFERENCE - timedelta(seconds=rng.randint(0, 365 * 24 * 3600)),
+            remarque=rng.choice(REMARQUES),
+            priorite=rng.choice(priorites),
+            vehicule_id=vehicule.id,
+            client_id=vehicule.client_id,
+        ) for vehicule in vehicules
+    ])
+
+    taux_choices = [t.name for t in Taux]
+    lignes = []
+    for mission in missions:
+        # Le taux et la durée supplémentaire sont communs à toute la mission, comme dans le formulaire
+        taux = rng.choice(taux_choices)
+        duree_supplementaire = Decimal(rng.randint(0, 200)) / 100
+        selection = rng.sample(interventions, rng.randint(1, 4))
+        couts, _ = price_lines((intervention, taux, duree_supplementaire) for intervention in selection)
+        for intervention, cout in zip(selection, couts):
+            lignes.append(MissionIntervention(
+                mission_id=mission.id, intervention_id=intervention.id, taux=taux,
+                duree_supplementaire=duree_supplementaire, cout_total=cout,
+            ))
+    MissionIntervention.objects.bulk_create(lignes)
+    return len(lignes)
+
+
+def seed(nb_clients, nb_missions, graine=0, taille_lot=TAILLE_LOT, stdout=print):
+    """Remplit la base avec un volume paramétrable de données, identique pour une même graine.
+
+    Les tables sont vidées puis remplies par lots de `taille_lot` objets ; chaque lot est
+    validé dans sa propre transaction pour borner la mémoire et la taille des transactions.
+
+    Args:
+        nb_clients (int): Le nombre de clients à créer.
+        nb_missions (int): Le nombre de missions (et de véhicules) à créer.
+        graine (int, optional): La graine du générateur aléatoire. Defaults to 0.
+        taille_lot (int, optional): Le nombre d'objets insérés par lot. Defaults to TAILLE_LOT.
+        stdout (callable, optional): La fonction d'affichage. Defaults to print.
+
+    Returns:
+        dict: Le nombre d'objets créés par modèle.
+    """
+    rng = random.Random(graine)
+    nb_clients = max(1, nb_clients)
+
+    with transaction.atomic():
+        vider_tables_seed()
+        interventions = seed_interventions()
+        clients_ids = seed_clients(rng, nb_clients, taille_lot)
+    stdout(f"  {len(clients_ids)} clients créés")
+
+    nb_lignes = 0
+    for debut in range(0, nb_missions, taille_lot):
+        fin = min(debut + taille_lot, nb_missions)
+        with transaction.atomic():
+            nb_lignes += seed_lot_missions(rng, debut, fin, clients_ids, interventions)
+        stdout(f"  {fin}/{nb_missions} missions créées ({nb_lignes} lignes)")
+
+    # Les insertions par lots ne déclenchent pas les signaux : résumés et caches sont mis à jour ici
+    with transaction.atomic():
+        rebuild_mission_summaries()
+    invalidate_list_cache()
+    invalidate_catalog()
+
+    return {
+        'clients': len(clients_ids),
+        'vehicules': nb_missions,
+        'interventions': len(interventions),
+        'missions': nb_missions,
+        'lignes': nb_lignes,
+    }
+
+
 def display_statistics():
     """Affiche les statistiques des données créées."""
     print("Statistiques des données créées:")
@@ -0,0 +1,28 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from mission.models import Client, Vehicule, Intervention, Mission, MissionIntervention
+from my_airtable_api.utils.cache import invalidate_list_cache
+from my_airtable_api.utils.catalog import invalidate_catalog
+
+
+@receiver(post_save, sender=Client)
+@receiver(post_save, sender=Vehicule)
+@receiver(post_save, sender=Intervention)
+@receiver(post_save, sender=Mission)
+@receiver(post_save, sender=MissionIntervention)
+@receiver(post_delete, sender=Client)
+@receiver(post_delete, sender=Vehicule)
+@receiver(post_delete, sender=Intervention)
+@receiver(post_delete, sender=Mission)
+@receiver(post_delete, sender=MissionIntervention)
+def invalidate_list_on_write(sender, using, **kwargs):
+    """Invalide le cache de la liste des missions à chaque écriture sur un modèle affiché."""
+    invalidate_list_cache(using)
+
+
+@receiver(post_save, sender=Intervention)
+@receiver(post_delete, sender=Intervention)
+def invalidate_catalog_on_write(sender, using, **kwargs):
+    """Invalide le catalogue des interventions gardé en mémoire par chaque processus."""
+    invalidate_catalog(using)
@@ -10,8 +10,10 @@ document.addEventListener('DOMContentLoaded', () => {
     }
 
     const hiddenInput = document.getElementById('interventions-hidden');
-    const select = document.getElementById('intervention-select');
+    const rechercheIntervention = document.getElementById('intervention-recherche');
     const list = document.getElementById('interventions-list');
+    // Libellés des interventions choisies, conservés pour les réafficher après un échec
+    const labels = JSON.parse(sessionStorage.getItem('interventions_labels') || '{}');
 
     const hiddenInputActuelles = document.getElementById('interventions-actuelles-hidden');
     const interventionsActuellesList = document.getElementById('interventions-actuelles-list');
@@ -38,26 +40,36 @@ document.addEventListener('DOMContentLoaded', () => {
         const saved = sessionStorage.getItem('interventions');
         if (saved) {
             saved.split(',').forEach(id => {
-                if (!selectedIds.includes(id)) {
+                if (!selectedIds.includes(id) && labels[id]) {
                     selectedIds.push(id);
-                    const text = select.querySelector(`option[value="${id}"]`)?.textContent;
-                    if (text) addInterventionToList(id, text);
+                    addInterventionToList(id, labels[id]);
                 }
             });
             hiddenInput.value = selectedIds.join(',');
         }
         sessionStorage.removeItem('form_submitted');
-    }    // Sélection d'une intervention
-    select.addEventListener('change', () => {
-        const val = select.value;
-        const text = select.options[select.selectedIndex]?.text;
-        if (val && !selectedIds.includes(val)) {
+    }    // Sélection d'une intervention dans les résultats de la recherche
+    initAutocomplete(rechercheIntervention, 0, (item) => {
+        const val = String(item.id);
+        if (!selectedIds.includes(val)) {
             selectedIds.push(val);
-            addInterventionToList(val, text);
+            labels[val] = item.label;
+            addInterventionToList(val, item.label);
             hiddenInput.value = selectedIds.join(',');
             sessionStorage.setItem('interventions', hiddenInput.value);
+            sessionStorage.setItem('interventions_labels', JSON.stringify(labels));
         }
-        select.value = '';
+        rechercheIntervention.value = '';
+    });
+
+    // Client et véhicule existants : l'identifiant choisi est reporté dans le champ caché
+    document.querySelectorAll('input.autocomplete').forEach(input => {
+        const cible = document.getElementById(input.dataset.cible);
+        input.addEventListener('input', () => { cible.value = ''; });
+        initAutocomplete(input, 2, (item) => {
+            cible.value = item.id;
+            input.value = item.label;
+        });
     });
     // Sauvegarde lors de la soumission
     if (isCreatePage || isUpdatePage) {
@@ -98,6 +110,86 @@ document.addEventListener('DOMContentLoaded', () => {
     }
 });
 
+/**
+ * Relie un champ de recherche à un endpoint d'autocomplétion JSON (attribut data-url).
+ * Les requêtes partent après une courte pause de saisie ; une requête dépassée est annulée.
+ * Les résultats sont affichés dans la liste désignée par data-resultats.
+ * Si data-client désigne un champ renseigné, la recherche est limitée à ce client.
+ *  @param {HTMLInputElement} input - Le champ de recherche.
+ *  @param {number} minLength - Le nombre minimal de caractères avant d'interroger le serveur.
+ *  @param {Function} onSelect - Appelée avec le résultat choisi ({id, label, ...}).
+ *  @returns {void}
+ */
+function initAutocomplete(input, minLength, onSelect) {
+    if (!input) {
+        return;
+    }
+    const resultats = document.getElementById(input.dataset.resultats);
+    resultats.style.listStyle = 'none';
+    resultats.style.padding = '0';
+    let timer = null;
+    let controller = null;
+
+    function afficher(items, tronque) {
+        resultats.innerHTML = '';
+        items.forEach(item => {
+            const li = document.createElement('li');
+            li.textContent = item.label;
+            li.style.padding = '4px';
+            li.style.cursor = 'pointer';
+            li.addEventListener('mousedown', (event) => {
+                // mousedown précède le blur du champ, qui vide la liste
+                event.preventDefault();
+                onSelect(item);
+                resultats.innerHTML = '';
+            });
+            resultats.appendChild(li);
+        });
+        if (tronque) {
+            const li = document.createElement('li');
+            li.textContent = '… affinez la recherche';
+            li.style.padding = '4px';
+            li.style.color = '#888';
+            resultats.appendChild(li);
+        }
+    }
+
+    function rechercher() {
+        const params = new URLSearchParams({ q: input.value.trim() });
+        const client = input.dataset.client ? document.getElementById(input.dataset.client).value : '';
+        if (client) {
+            params.set('client', client);
+        } else if (params.get('q').length < minLength) {
+            resultats.innerHTML = '';
+            return;
+        }
+        if (controller) {
+            controller.abort();
+        }
+        controller = new AbortController();
+        fetch(`${input.dataset.url}?${params}`, { credentials: 'same-origin', signal: controller.signal })
+            .then(response => {
+                if (!response.ok) {
+                    throw new Error(`HTTP ${response.status}`);
+                }
+                return response.json();
+            })
+            .then(data => afficher(data.resultats, data.tronque))
+            .catch(error => {
+                if (error.name !== 'AbortError') {
+                    console.error("Erreur lors de l'autocomplétion:", error);
+                }
+            });
+    }
+
+    input.addEventListener('input', () => {
+        clearTimeout(timer);
+        timer = setTimeout(rechercher, 200);
+    });
+    input.addEventListener('focus', rechercher);
+    input.addEventListener('blur', () => { resultats.innerHTML = ''; });
+}
+
 // Fonction de confirmation de suppression de mission
 function confirmDelete(missionId, clientName, vehiculeName, nbInterventions) {
     const confirmationMessage = `CONFIRMATION DE SUPPRESSION
@@ -1,11 +1,39 @@
 /**
  * Fonction permettant de changer la liste affichée
- * en fonction de la sélection de l'utilisateur.    
+ * en fonction de la sélection de l'utilisateur.
+ * Les listes non encore affichées sont chargées à la demande
+ * depuis leur endpoint (attribut data-url), avec les filtres courants.
  *  @param {Event} event - L'événement de changement de sélection.
  *  @returns {void}
  */
 const select  = document.getElementById("choix-list");
 let divList = [document.getElementById("missions-list"), document.getElementById("vehicule-list"), document.getElementById("clients-list")];
+
+function chargerListe(div) {
+    // Liste déjà rendue par le serveur ou déjà chargée
+    if (div.dataset.loaded === "true") {
+        return;
+    }
+    div.dataset.loaded = "true";
+    div.textContent = "Chargement...";
+
+    fetch(div.dataset.url + window.location.search, { credentials: "same-origin" })
+        .then(response => {
+            if (!response.ok) {
+                throw new Error(`HTTP ${response.status}`);
+            }
+            return response.text();
+        })
+        .then(html => {
+            div.innerHTML = html;
+        })
+        .catch(error => {
+            console.error('Erreur lors du chargement de la liste:', error);
+            div.dataset.loaded = "false";
+            div.textContent = "Impossible de charger la liste.";
+        });
+}
+
 select.addEventListener("change", function(event) {
     const selectedValue = event.target.value;
 
@@ -13,17 +41,22 @@ select.addEventListener("change", function(event) {
         div.style.display = "none";
     });
 
+    let div = null;
     switch (selectedValue) {
         case "missions":
-            divList[0].style.display = "block";
+            div = divList[0];
             break;
         case "vehicules":
-            divList[1].style.display = "block";
+            div = divList[1];
             break;
         case "clients":
-            divList[2].style.display = "block";
+            div = divList[2];
             break;
     }
+    if (div) {
+        div.style.display = "block";
+        chargerListe(div);
+    }
 });
 
 
@@ -0,0 +1,66 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.test import TestCase
+from django.urls import reverse
+
+from mission.models import Mission
+from mission.script.benchmark import generer_donnees
+
+
+class AsyncViewsTests(TestCase):
+    """Les vues asynchrones rendent les mêmes pages que les vues synchrones, avec le même cache."""
+
+    @classmethod
+    def setUpTestData(cls):
+        generer_donnees(48)
+        cls.user = User.objects.create_user('async', password='async')
+
+    def setUp(self):
+        caches['list_view'].clear()
+
+    async def test_anonymous_is_redirected(self):
+        for name in ('list_view_async', 'list_missions_async', 'list_interventions_async'):
+            with self.subTest(name=name):
+                response = await self.async_client.get(reverse(name))
+                self.assertEqual(response.status_code, 302)
+                self.assertTrue(response['Location'].startswith(settings.LOGIN_URL))
+
+    async def test_show_mission(self):
+        await self.async_client.aforce_login(self.user)
+        mission = await Mission.objects.select_related('client').order_by('id').afirst()
+        response = await self.async_client.get(reverse('show_mission_async', args=[mission.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'show_mission.html')
+        self.assertEqual(response.context['client']['id'], mission.client.id)
+        self.assertEqual(len(response.context['mission_intervention']), 4)
+
+    async def test_show_missing_mission(self):
+        await self.async_client.aforce_login(self.user)
+        with self.assertLogs('mission.views.async_views', 'ERROR'):
+            response = await self.async_client.get(reverse('show_mission_async', args=[0]))
+        self.assertTemplateUsed(response, 'error.html')
+        self.assertContains(response, "Mission with id 0 does not exist.", status_code=response.status_code)
+
+    async def test_tab_fragments_share_the_sync_cache(self):
+        await self.async_client.aforce_login(self.user)
+        for onglet in ('missions', 'vehicules', 'clients'):
+            with self.subTest(onglet=onglet):
+                params = {'priorite-filtrage': 'URGENTE', 'taille': 5}
+                sync = await self.async_client.get(reverse(f'list_{onglet}'), params)
+                self.assertEqual(sync['X-List-Cache'], 'MISS')
+                # Même clé de cache : l'onglet calculé par la vue synchrone est servi à la vue asynchrone
+                asynchrone = await self.async_client.get(reverse(f'list_{onglet}_async'), params)
+                self.assertEqual(asynchrone['X-List-Cache'], 'HIT')
+                self.assertEqual(asynchrone.content, sync.content)
+
+    async def test_async_tab_matches_sync_tab(self):
+        await self.async_client.aforce_login(self.user)
+        for onglet in ('missions', 'vehicules', 'clients'):
+            with self.subTest(onglet=onglet):
+                asynchrone = await self.async_client.get(reverse(f'list_{onglet}_async'))
+                self.assertEqual(asynchrone['X-List-Cache'], 'MISS')
+                caches['list_view'].clear()
+                sync = await self.async_client.get(reverse(f'list_{onglet}'))
+                self.assertEqual(sync['X-List-Cache'], 'MISS')
+                self.assertEqual(asynchrone.content, sync.content)
@@ -0,0 +1,73 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from mission.models import Client, Vehicule
+from mission.script.benchmark import generer_donnees
+
+
+class AutocompleteViewsTests(TestCase):
+    """Réponses JSON des vues d'autocomplétion du formulaire de mission."""
+
+    @classmethod
+    def setUpTestData(cls):
+        generer_donnees(48)
+        cls.user = User.objects.create_user('saisie', password='saisie')
+        cls.proprietaire = Client.objects.get(nom="Nom0")
+        Vehicule.objects.create(
+            marque="Renault", modele="Clio", immatriculation="AB999ZZ", numero_serie="VINSECOND",
+            client=cls.proprietaire, vo=False, boite_vitesse='Manuelle', carburant='Essence',
+        )
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def get(self, name, **params):
+        response = self.client.get(reverse(name), params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_login_required(self):
+        self.client.logout()
+        for name in ('autocomplete_clients', 'autocomplete_vehicules', 'autocomplete_interventions'):
+            with self.subTest(name=name):
+                response = self.client.get(reverse(name), {'q': 'No'})
+                self.assertEqual(response.status_code, 302)
+                self.assertTrue(response['Location'].startswith(settings.LOGIN_URL))
+
+    def test_limit_plus_one_sets_the_truncation_flag(self):
+        # Nom1, Nom10 et Nom11 commencent par « nom1 »
+        data = self.get('autocomplete_clients', q='nom1', limite=2)
+        self.assertEqual([row['nom'] for row in data['resultats']], ["Nom1", "Nom10"])
+        self.assertTrue(data['tronque'])
+
+        data = self.get('autocomplete_clients', q='nom1', limite=3)
+        self.assertEqual(len(data['resultats']), 3)
+        self.assertFalse(data['tronque'])
+
+    def test_short_prefix_returns_nothing(self):
+        self.assertEqual(self.get('autocomplete_clients', q='n'), {'resultats': [], 'tronque': False})
+
+    def test_vehicules_of_one_client(self):
+        data = self.get('autocomplete_vehicules', client=self.proprietaire.id)
+        self.assertEqual(len(data['resultats']), 2)
+        self.assertEqual({row['client_id'] for row in data['resultats']}, {self.proprietaire.id})
+
+        # Le préfixe AB désigne tous les véhicules : seuls ceux du client sont retournés
+        data = self.get('autocomplete_vehicules', q='ab', client=self.proprietaire.id)
+        self.assertEqual({row['client_id'] for row in data['resultats']}, {self.proprietaire.id})
+        self.assertGreater(len(self.get('autocomplete_vehicules', q='ab', limite=50)['resultats']), 2)
+
+    def test_interventions_are_served_from_the_catalog(self):
+        data = self.get('autocomplete_interventions', q='intervention 1', limite=2)
+        self.assertEqual([row['libelle'] for row in data['resultats']], ["Intervention 1", "Intervention 10"])
+        self.assertTrue(data['tronque'])
+
+        with CaptureQueriesContext(connection) as queries:
+            data = self.get('autocomplete_interventions', q='INTERVENTION 1', limite=3)
+        self.assertEqual(len(data['resultats']), 3)
+        self.assertFalse(data['tronque'])
+        self.assertFalse([query['sql'] for query in queries.captured_queries if 'mission_intervention' in query['sql']])
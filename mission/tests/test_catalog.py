@@ -0,0 +1,36 @@
+from decimal import Decimal
+
+from django.test import TestCase, override_settings
+
+from mission.models import Intervention
+from my_airtable_api.utils.catalog import InterventionCatalog
+
+
+class InterventionCatalogTests(TestCase):
+    """Chaque instance joue le rôle d'un worker : copie locale, numéro de version partagé."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.intervention = Intervention.objects.create(libelle="Vidange", prix_unitaire=Decimal('80'), categorie='MECA_BCR')
+
+    def setUp(self):
+        self.worker_a = InterventionCatalog('list_view')
+        self.worker_b = InterventionCatalog('list_view')
+
+    def test_version_bump_reaches_other_workers(self):
+        self.assertEqual(self.worker_b.get(self.intervention.id).libelle, "Vidange")
+        with self.assertNumQueries(0):
+            self.worker_b.get(self.intervention.id)
+
+        Intervention.objects.filter(id=self.intervention.id).update(libelle="Vidange moteur")
+        self.worker_a.bump_version()
+        with self.assertNumQueries(1):
+            self.assertEqual(self.worker_b.get(self.intervention.id).libelle, "Vidange moteur")
+
+    def test_local_copy_expires_without_bump(self):
+        self.worker_b.all()
+        # Écriture hors de l'ORM : aucune invalidation
+        Intervention.objects.filter(id=self.intervention.id).update(libelle="Vidange moteur")
+        self.assertEqual(self.worker_b.get(self.intervention.id).libelle, "Vidange")
+        with override_settings(INTERVENTION_CATALOG_TTL=0), self.assertNumQueries(1):
+            self.assertEqual(self.worker_b.get(self.intervention.id).libelle, "Vidange moteur")
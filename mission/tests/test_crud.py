@@ -0,0 +1,200 @@
+import re
+from decimal import Decimal
+
+from django.db import IntegrityError, connection, transaction
+from django.http import QueryDict
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from mission.models import Client, Intervention, Mission, MissionIntervention, MissionSummary, Vehicule
+from mission.script.benchmark import generer_donnees
+from my_airtable_api.utils.crud import (
+    create_client, create_mission, create_vehicule, delete_missions, unique_errors, update_mission_interventions,
+)
+from my_airtable_api.utils.filters import get_filters
+from my_airtable_api.utils.extract_data import ValidationError
+
+LOGGER = 'my_airtable_api.utils.crud'
+
+
+def _statements(queries, verb):
+    return [query['sql'] for query in queries.captured_queries if query['sql'].lstrip().upper().startswith(verb)]
+
+
+class UpdateMissionInterventionsTests(TestCase):
+    """Seules les lignes ajoutées, modifiées ou retirées du formulaire sont écrites."""
+
+    @classmethod
+    def setUpTestData(cls):
+        generer_donnees(8)
+
+    def setUp(self):
+        self.mission = Mission.objects.order_by('id').first()
+        self.lignes = list(MissionIntervention.objects.filter(mission=self.mission).select_related('intervention').order_by('id'))
+
+    def formulaire(self, lignes):
+        return [
+            {'intervention': ligne.intervention, 'taux': ligne.taux, 'cout_total': ligne.cout_total,
+             'duree_supplementaire': ligne.duree_supplementaire}
+            for ligne in lignes
+        ]
+
+    def test_unchanged_lines_are_not_written(self):
+        with CaptureQueriesContext(connection) as queries:
+            update_mission_interventions(self.formulaire(self.lignes), self.mission)
+        self.assertEqual(len(queries), 1, [query['sql'] for query in queries.captured_queries])
+
+    def test_only_changed_lines_are_written(self):
+        inchangee, modifiee, retiree = self.lignes[0], self.lignes[1], self.lignes[2]
+        nouvelle = Intervention.objects.exclude(missionintervention__mission=self.mission).first()
+
+        donnees = self.formulaire([inchangee, modifiee, *self.lignes[3:]])
+        donnees[1]['cout_total'] = modifiee.cout_total + Decimal('10.00')
+        donnees.append({'intervention': nouvelle, 'taux': 'T1', 'cout_total': Decimal('42.50'), 'duree_supplementaire': 0})
+
+        with CaptureQueriesContext(connection) as queries:
+            lignes = update_mission_interventions(donnees, self.mission)
+
+        self.assertEqual(len(_statements(queries, 'INSERT')), 1)
+        [update] = _statements(queries, 'UPDATE')
+        self.assertEqual(re.search(r'"id" IN \(([^)]*)\)', update).group(1), str(modifiee.id))
+        self.assertEqual(len(lignes), len(donnees))
+
+        apres = {mi.intervention_id: mi for mi in MissionIntervention.objects.filter(mission=self.mission)}
+        self.assertEqual(set(apres), {mi['intervention'].id for mi in donnees})
+        self.assertNotIn(retiree.intervention_id, apres)
+        # Les lignes conservées gardent leur identifiant
+        self.assertEqual(apres[inchangee.intervention_id].id, inchangee.id)
+        self.assertEqual(apres[inchangee.intervention_id].cout_total, inchangee.cout_total)
+        self.assertEqual(apres[modifiee.intervention_id].id, modifiee.id)
+        self.assertEqual(apres[modifiee.intervention_id].cout_total, modifiee.cout_total + Decimal('10.00'))
+        self.assertEqual(apres[nouvelle.id].cout_total, Decimal('42.50'))
+        # Les autres missions ne sont pas touchées
+        self.assertEqual(MissionIntervention.objects.exclude(mission=self.mission).count(), 4)
+
+    def test_amounts_are_compared_at_two_decimals(self):
+        donnees = self.formulaire(self.lignes)
+        for ligne in donnees:
+            # Saisie du formulaire : texte, sans les centimes
+            ligne['cout_total'] = str(ligne['cout_total'].normalize())
+            ligne['duree_supplementaire'] = str(ligne['duree_supplementaire'])
+        with CaptureQueriesContext(connection) as queries:
+            update_mission_interventions(donnees, self.mission)
+        self.assertEqual(len(queries), 1, [query['sql'] for query in queries.captured_queries])
+
+    def test_duplicate_lines_are_not_merged(self):
+        # Une intervention saisie deux fois : la seconde ligne ne réécrit pas la première
+        donnees = self.formulaire(self.lignes)
+        doublon = dict(donnees[0], cout_total=donnees[0]['cout_total'] + Decimal('5.00'))
+        donnees.insert(1, doublon)
+
+        with CaptureQueriesContext(connection) as queries, self.assertRaises(ValidationError):
+            with transaction.atomic():
+                update_mission_interventions(donnees, self.mission)
+        # Le doublon est une nouvelle ligne, refusée par la contrainte d'unicité
+        self.assertEqual(len(_statements(queries, 'INSERT')), 1)
+        self.assertEqual(_statements(queries, 'UPDATE'), [])
+        self.assertEqual(MissionIntervention.objects.get(id=self.lignes[0].id).cout_total, self.lignes[0].cout_total)
+
+
+class UniqueErrorsTests(TestCase):
+    """Les doublons refusés par les contraintes de la base deviennent des erreurs de formulaire."""
+
+    @classmethod
+    def setUpTestData(cls):
+        generer_donnees(8)
+        cls.client_existant = Client.objects.order_by('id').first()
+        cls.vehicule_existant = Vehicule.objects.get(client=cls.client_existant)
+
+    def donnees_client(self, email):
+        return {'nom': "Martin", 'prenom': "Paul", 'telephone': "0600000000", 'email': email,
+                'adresse': "2 rue du Port", 'code_postal': "13000", 'ville': "Marseille"}
+
+    def donnees_vehicule(self, numero_serie):
+        return {'marque': "Renault", 'modele': "Clio", 'immatriculation': "ZZ999ZZ", 'numero_serie': numero_serie,
+                'vo': False, 'boite_vitesse': "Manuelle", 'carburant': "Essence"}
+
+    def test_duplicate_email(self):
+        erreurs = {}
+        with self.assertLogs(LOGGER, 'WARNING'), self.assertRaises(ValidationError) as cm:
+            create_client(self.donnees_client(self.client_existant.email), erreurs)
+        self.assertEqual(erreurs, {'client': {'email': "Un client avec cet email existe déjà"}})
+        self.assertEqual(cm.exception.details, erreurs)
+
+    def test_duplicate_numero_serie(self):
+        erreurs = {}
+        with self.assertLogs(LOGGER, 'WARNING'), self.assertRaises(ValidationError):
+            create_vehicule(self.donnees_vehicule(self.vehicule_existant.numero_serie), self.client_existant, erreurs)
+        self.assertIn('numero_serie', erreurs['vehicule'])
+
+    def test_duplicate_mission(self):
+        erreurs = {}
+        with self.assertLogs(LOGGER, 'WARNING'), self.assertRaises(ValidationError):
+            create_mission({'remarque': None, 'priorite': 'BASSE', 'client': self.client_existant,
+                            'vehicule': self.vehicule_existant}, erreurs)
+        self.assertIn('vehicule_client', erreurs['mission'])
+
+    def test_outer_transaction_survives(self):
+        with transaction.atomic():
+            with self.assertLogs(LOGGER, 'WARNING'), self.assertRaises(ValidationError):
+                create_client(self.donnees_client(self.client_existant.email), {})
+            # La transaction englobante reste utilisable : seul le savepoint a été annulé
+            client = create_client(self.donnees_client("nouveau@example.com"), {})
+            create_vehicule(self.donnees_vehicule("VINNOUVEAU0000001"), client, {})
+        self.assertTrue(Vehicule.objects.filter(client__email="nouveau@example.com").exists())
+
+    def test_other_integrity_errors_propagate(self):
+        # Un doublon sur une contrainte non associée au modèle n'est pas traduit
+        with self.assertRaises(IntegrityError), unique_errors(Client, {}):
+            Vehicule.objects.create(**self.donnees_vehicule(self.vehicule_existant.numero_serie), client=self.client_existant)
+
+
+class DeleteMissionsTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        generer_donnees(200)
+
+    def test_empty_filters_are_refused(self):
+        for params in ('', 'client-filtrage=&priorite-filtrage=', 'date_debut=pas-une-date'):
+            with self.subTest(params=params), self.assertRaises(ValidationError):
+                delete_missions(filters=get_filters(QueryDict(params)))
+        self.assertEqual(Mission.objects.count(), 50)
+
+    def test_no_designation_is_refused(self):
+        with self.assertRaises(ValidationError):
+            delete_missions()
+
+    def test_filtered_delete_is_set_based(self):
+        filters = get_filters(QueryDict('priorite-filtrage=URGENTE'))
+        visees = set(Mission.objects.filter(priorite='URGENTE').values_list('id', flat=True))
+        lignes = MissionIntervention.objects.filter(mission_id__in=visees).count()
+        self.assertGreater(len(visees), 2)
+
+        with CaptureQueriesContext(connection) as queries:
+            result = delete_missions(filters=filters, chunk_size=len(visees) // 2 + 1)
+        # Lecture des missions, comptage des lignes, puis un nombre de requêtes par lot (collecteur
+        # et DELETE en cascade), quel que soit le nombre de missions du lot
+        self.assertEqual(len(_statements(queries, 'SELECT')), 2 + 2 * 2)
+        self.assertEqual(len(_statements(queries, 'DELETE')), 3 * 2)
+
+        self.assertEqual({mission['id'] for mission in result['missions']}, visees)
+        self.assertEqual(result['nb_interventions_supprimees'], lignes)
+        self.assertFalse(Mission.objects.filter(id__in=visees).exists())
+        self.assertFalse(MissionIntervention.objects.filter(mission_id__in=visees).exists())
+        self.assertFalse(MissionSummary.objects.filter(mission_id__in=visees).exists())
+        self.assertEqual(Mission.objects.count(), 50 - len(visees))
+        self.assertEqual(MissionSummary.objects.count(), 50 - len(visees))
+
+    def test_non_numeric_ids_are_refused(self):
+        with self.assertRaises(ValidationError):
+            delete_missions(['1', 'abc'])
+        self.assertEqual(Mission.objects.count(), 50)
+
+    def test_delete_by_ids_reports_missing(self):
+        mission = Mission.objects.order_by('id').first()
+        with self.assertLogs(LOGGER, 'WARNING'):
+            result = delete_missions([mission.id, 0])
+        self.assertEqual(result['nb_missions_supprimees'], 1)
+        self.assertEqual(result['introuvables'], [0])
+        self.assertFalse(Mission.objects.filter(id=mission.id).exists())
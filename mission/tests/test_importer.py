@@ -0,0 +1,91 @@
+import json
+import tempfile
+from decimal import Decimal
+from pathlib import Path
+
+from django.test import TestCase
+
+from mission.models import Intervention, Mission, MissionSummary
+from my_airtable_api.utils.importer import MissionImporter, read_rows
+
+
+def _ligne(email, numero_serie, intervention, cout_total):
+    return {
+        'client_email': email, 'client_nom': "Durand", 'client_prenom': "Anne",
+        'vehicule_numero_serie': numero_serie, 'vehicule_marque': "Peugeot", 'vehicule_modele': "208",
+        'vehicule_immatriculation': "AA123BB", 'intervention': intervention, 'taux': "horaire",
+        'cout_total': cout_total, 'priorite': "haute",
+    }
+
+
+class MissionImporterTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        Intervention.objects.create(libelle="Vidange", prix_unitaire=Decimal('80'), categorie='MECA_BCR')
+        Intervention.objects.create(libelle="Freins", prix_unitaire=Decimal('120'), categorie='MECA_BCR')
+
+    def write_jsonl(self, lines):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = Path(directory.name) / 'missions.jsonl'
+        path.write_text("\n".join(lines) + "\n", encoding='utf-8')
+        return str(path)
+
+    def test_malformed_lines_are_reported(self):
+        path = self.write_jsonl([
+            json.dumps(_ligne("a@example.com", "VINA", "Vidange", "80")),
+            '{"client_email": "b@example.com",',
+            json.dumps(["pas", "un", "objet"]),
+            json.dumps(_ligne("c@example.com", "VINC", "Freins", "120")),
+        ])
+        report = MissionImporter(chunk_size=2).run(read_rows(path))
+
+        self.assertEqual(report.lignes_lues, 4)
+        self.assertEqual(report.lignes, 2)
+        self.assertEqual([erreur['ligne'] for erreur in report.erreurs], [2, 3])
+        self.assertIn("JSON invalide", report.erreurs[0]['erreur'])
+        self.assertIn("objet JSON", report.erreurs[1]['erreur'])
+
+    def test_summaries_are_written_with_each_chunk(self):
+        # La même mission s'étend sur deux lots
+        path = self.write_jsonl([
+            json.dumps(_ligne("a@example.com", "VINA", "Vidange", "80")),
+            json.dumps(_ligne("b@example.com", "VINB", "Vidange", "80")),
+            json.dumps(_ligne("a@example.com", "VINA", "Freins", "120")),
+        ])
+        importer = MissionImporter(chunk_size=2)
+        rows = read_rows(path)
+        importer._import_chunk([next(rows), next(rows)])
+        # Le premier lot est validé avec ses résumés, avant la lecture du second
+        self.assertEqual(MissionSummary.objects.count(), 2)
+        self.assertEqual(MissionSummary.objects.get(vehicule__numero_serie="VINA").nb_lignes, 1)
+
+        importer._import_chunk(list(rows))
+        mission = Mission.objects.get(vehicule__numero_serie="VINA")
+        self.assertEqual(mission.summary.nb_lignes, 2)
+        self.assertEqual(mission.summary.cout_total, Decimal('200.00'))
+        self.assertEqual(mission.summary.interventions_libelles, "Vidange, Freins")
+
+
+class MissionImporterOtherDatabaseTests(TestCase):
+    databases = {'default', 'autre'}
+
+    @classmethod
+    def setUpTestData(cls):
+        Intervention.objects.using('autre').create(libelle="Vidange", prix_unitaire=Decimal('80'), categorie='MECA_BCR')
+        Intervention.objects.using('autre').create(libelle="Freins", prix_unitaire=Decimal('120'), categorie='MECA_BCR')
+
+    def test_summaries_are_written_on_the_target_database(self):
+        importer = MissionImporter(using='autre', chunk_size=1)
+        importer._import_chunk([(1, _ligne("a@example.com", "VINA", "Vidange", "80"))])
+        # Second lot : le résumé existant est recalculé sur la même base
+        importer._import_chunk([(2, _ligne("a@example.com", "VINA", "Freins", "120"))])
+
+        self.assertFalse(Mission.objects.using('default').exists())
+        self.assertFalse(MissionSummary.objects.using('default').exists())
+        summary = MissionSummary.objects.using('autre').get()
+        self.assertEqual(summary.mission_id, Mission.objects.using('autre').get().id)
+        self.assertEqual(summary.nb_lignes, 2)
+        self.assertEqual(summary.cout_total, Decimal('200.00'))
+        self.assertEqual(summary.interventions_libelles, "Vidange, Freins")
@@ -0,0 +1,129 @@
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db import transaction
+from django.test import TransactionTestCase
+from django.urls import reverse
+
+from mission.models import Client, Intervention, Mission, MissionSummary
+from mission.script.benchmark import generer_donnees
+from my_airtable_api.utils.cache import list_view_cache
+from my_airtable_api.utils.crud import create_mission_interventions
+from my_airtable_api.utils.pricing import reprice_interventions
+from my_airtable_api.utils.summary import refresh_mission_summaries
+
+
+class ListCacheInvalidationTests(TransactionTestCase):
+    """Une écriture validée incrémente la génération : l'onglet en cache est recalculé.
+
+    TransactionTestCase : les transactions sont réellement validées ou annulées, et les
+    callbacks on_commit exécutés comme en production.
+    """
+
+    def setUp(self):
+        generer_donnees(48)
+        user = User.objects.create_user('cache', password='cache')
+        self.client.force_login(user)
+        caches['list_view'].clear()
+        self.mission = Mission.objects.select_related('client', 'vehicule').order_by('id').first()
+
+    def tab(self, onglet):
+        return self.client.get(reverse(f'list_{onglet}'))
+
+    def cached(self, onglet):
+        """Met l'onglet en cache et retourne la réponse servie depuis le cache."""
+        self.tab(onglet)
+        response = self.tab(onglet)
+        self.assertEqual(response['X-List-Cache'], 'HIT')
+        return response
+
+    def assertRecomputed(self, onglet, generation):
+        """L'écriture a incrémenté la génération et l'onglet est recalculé avec les données à jour."""
+        self.assertGreater(list_view_cache.generation(), generation)
+        response = self.tab(onglet)
+        self.assertEqual(response['X-List-Cache'], 'MISS')
+        caches['list_view'].clear()
+        self.assertEqual(response.content, self.tab(onglet).content)
+        return response
+
+    def test_client_save_and_delete(self):
+        self.cached('clients')
+        generation = list_view_cache.generation()
+        client = Client.objects.create(
+            nom="Aaron", prenom="Paul", telephone="0123456789", email="aaron@example.com",
+            adresse="1 rue du Test", code_postal="75001", ville="Paris",
+        )
+        self.assertContains(self.assertRecomputed('clients', generation), "Aaron")
+
+        self.cached('clients')
+        generation = list_view_cache.generation()
+        client.delete()
+        self.assertNotContains(self.assertRecomputed('clients', generation), "Aaron")
+
+    def test_vehicule_save_and_delete(self):
+        self.cached('vehicules')
+        generation = list_view_cache.generation()
+        vehicule = self.mission.vehicule
+        vehicule.marque = "Alpine"
+        vehicule.save()
+        self.assertContains(self.assertRecomputed('vehicules', generation), "Alpine")
+
+        self.cached('vehicules')
+        generation = list_view_cache.generation()
+        # La suppression du véhicule supprime aussi sa mission (CASCADE)
+        vehicule.delete()
+        self.assertNotContains(self.assertRecomputed('vehicules', generation), "Alpine")
+
+    def test_mission_save_and_delete(self):
+        self.cached('missions')
+        generation = list_view_cache.generation()
+        with transaction.atomic():
+            self.mission.remarque = "Remarque à jour"
+            self.mission.save()
+            refresh_mission_summaries([self.mission.id])
+        self.assertContains(self.assertRecomputed('missions', generation), "Remarque à jour")
+
+        self.cached('missions')
+        generation = list_view_cache.generation()
+        lien = reverse('show_mission', args=[self.mission.id])
+        self.mission.delete()
+        self.assertNotContains(self.assertRecomputed('missions', generation), lien)
+
+    def test_bulk_create_of_mission_lines(self):
+        intervention = Intervention.objects.create(libelle="Géométrie", prix_unitaire=Decimal('60'), categorie='MECA_BCR')
+        self.cached('missions')
+        generation = list_view_cache.generation()
+        with transaction.atomic():
+            create_mission_interventions([{
+                'mission': self.mission, 'intervention': intervention, 'taux': 'T1',
+                'cout_total': Decimal('60.00'), 'duree_supplementaire': Decimal('0.00'),
+            }], {})
+            refresh_mission_summaries([self.mission.id])
+        self.assertContains(self.assertRecomputed('missions', generation), "Géométrie")
+
+    def test_reprice(self):
+        intervention = self.mission.interventions.first()
+        Intervention.objects.filter(id=intervention.id).update(prix_unitaire=intervention.prix_unitaire + 100)
+        self.cached('missions')
+        generation = list_view_cache.generation()
+        avant = MissionSummary.objects.get(mission=self.mission).cout_total
+
+        self.assertGreater(reprice_interventions([intervention.id]), 0)
+        self.assertRecomputed('missions', generation)
+        self.assertNotEqual(MissionSummary.objects.get(mission=self.mission).cout_total, avant)
+
+    def test_rollback_does_not_invalidate(self):
+        cached = self.cached('clients')
+        generation = list_view_cache.generation()
+        client = self.mission.client
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            client.nom = "Annulé"
+            client.save()
+            raise RuntimeError("annulation")
+
+        self.assertEqual(list_view_cache.generation(), generation)
+        response = self.tab('clients')
+        self.assertEqual(response['X-List-Cache'], 'HIT')
+        self.assertEqual(response.content, cached.content)
+        self.assertNotContains(response, "Annulé")
@@ -0,0 +1,76 @@
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.http import Http404, QueryDict
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+
+from mission.models import MissionSummary
+from mission.script.benchmark import generer_donnees
+from mission.views.list_views import list_tab_view
+
+
+class ListTabViewTests(TestCase):
+    """Fragments des onglets de la liste (`liste/<onglet>/`), chargés à la demande."""
+
+    @classmethod
+    def setUpTestData(cls):
+        generer_donnees(200)
+        cls.user = User.objects.create_user('liste', password='liste')
+
+    def setUp(self):
+        self.client.force_login(self.user)
+        caches['list_view'].clear()
+
+    def test_each_tab_renders_its_fragment(self):
+        for onglet in ('missions', 'vehicules', 'clients'):
+            with self.subTest(onglet=onglet):
+                response = self.client.get(reverse(f'list_{onglet}'), {'taille': 5})
+                self.assertEqual(response.status_code, 200)
+                self.assertTemplateUsed(response, f'partials/{onglet}_list.html')
+                self.assertTemplateNotUsed(response, 'list-view.html')
+                self.assertEqual(response.context['onglet'], onglet)
+                self.assertEqual(len(response.context[onglet]), 5)
+                self.assertEqual(response['X-List-Cache'], 'MISS')
+
+    def test_login_required(self):
+        self.client.logout()
+        response = self.client.get(reverse('list_missions'))
+        self.assertEqual(response.status_code, 302)
+
+    def test_unknown_tab(self):
+        url = reverse('list_view') + 'liste/inconnu/'
+        # Pas de route : 404
+        with self.assertLogs('django.request', 'WARNING'):
+            self.assertEqual(self.client.get(url).status_code, 404)
+        # Appel direct de la vue
+        request = RequestFactory().get(url)
+        request.user = self.user
+        with self.assertRaises(Http404):
+            list_tab_view(request, 'inconnu')
+        # La page complète retombe sur l'onglet missions
+        response = self.client.get(reverse('list_view'), {'onglet': 'inconnu'})
+        self.assertEqual(response.context['onglet'], 'missions')
+
+    def test_cursor_links_keep_the_filters(self):
+        urgentes = set(MissionSummary.objects.filter(priorite='URGENTE').values_list('mission_id', flat=True))
+        self.assertGreater(len(urgentes), 3)
+        params = {'priorite-filtrage': 'URGENTE', 'taille': 2}
+
+        response = self.client.get(reverse('list_missions'), params)
+        suivant = QueryDict(response.context['missions_suivant'])
+        self.assertEqual(suivant['priorite-filtrage'], 'URGENTE')
+        self.assertEqual(suivant['taille'], '2')
+        self.assertEqual(suivant['onglet'], 'missions')
+        self.assertContains(response, response.context['missions_suivant'].replace('&', '&amp;'))
+        self.assertIsNone(response.context['missions_precedent'])
+
+        vues = []
+        while True:
+            vues += [mission['id'] for mission in response.context['missions']]
+            if not response.context['missions_suivant']:
+                break
+            response = self.client.get(reverse('list_missions') + '?' + response.context['missions_suivant'])
+            self.assertEqual(QueryDict(response.context['missions_precedent'])['priorite-filtrage'], 'URGENTE')
+        # Toutes les missions filtrées, chacune une seule fois
+        self.assertEqual(len(vues), len(urgentes))
+        self.assertEqual(set(vues), urgentes)
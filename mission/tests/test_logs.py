@@ -0,0 +1,89 @@
+import io
+import json
+import logging
+import sys
+import tempfile
+from pathlib import Path
+
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from mission.models import Mission
+from my_airtable_api.utils.logs import (
+    JsonFormatter, QuerySetLogFilter, QueueHandler, check_lazy_logging, find_eager_log_calls,
+)
+
+
+def _record(msg, args=(), exc_info=None):
+    return logging.LogRecord('test', logging.INFO, __file__, 1, msg, args, exc_info)
+
+
+class FindEagerLogCallsTests(SimpleTestCase):
+
+    def test_detects_preformatted_messages(self):
+        source = (
+            "import logging\n"
+            "logger = logging.getLogger(__name__)\n"
+            "logger.info(f'Mission {mission_id}')\n"
+            "logger.warning('Mission %s' % mission_id)\n"
+            "logging.error('Mission {}'.format(mission_id))\n"
+            "logger.log(logging.INFO, 'Mission ' + str(mission_id))\n"
+            "logger.info('Mission %s', mission_id)\n"
+            "print(f'Mission {mission_id}')\n"
+        )
+        with tempfile.TemporaryDirectory() as dossier:
+            path = Path(dossier) / 'module.py'
+            path.write_text(source, encoding='utf-8')
+            self.assertEqual(find_eager_log_calls(path), [
+                (3, 'f-string'), (4, "opérateur % ou +"), (5, '.format()'), (6, "opérateur % ou +"),
+            ])
+
+    def test_project_logs_lazily(self):
+        self.assertEqual(check_lazy_logging(None), [])
+
+
+class QuerySetLogFilterTests(TestCase):
+
+    def test_strict_mode_raises(self):
+        with override_settings(LOG_STRICT=True), self.assertRaises(TypeError):
+            QuerySetLogFilter().filter(_record("Missions %s", (Mission.objects.all(),)))
+
+    def test_queryset_is_replaced_without_query(self):
+        record = _record("Missions %s (%d)", (Mission.objects.all(), 3))
+        with override_settings(LOG_STRICT=False), self.assertNumQueries(0):
+            self.assertTrue(QuerySetLogFilter().filter(record))
+            self.assertEqual(record.getMessage(), "Missions <QuerySet non journalisé> (3)")
+
+
+class QueueHandlerTests(SimpleTestCase):
+
+    def setUp(self):
+        self.stream = io.StringIO()
+        self.handler = QueueHandler(self.stream)
+        self.handler.setFormatter(JsonFormatter())
+        self.addCleanup(self.handler.close)
+
+    def test_simple_args_are_formatted_by_the_writer_thread(self):
+        record = self.handler.prepare(_record("Mission %s : %d ligne(s)", ('abc', 3)))
+        self.assertEqual(record.msg, "Mission %s : %d ligne(s)")
+        self.assertEqual(record.args, ('abc', 3))
+
+    def test_other_args_are_formatted_now(self):
+        valeur = {'etat': 'avant'}
+        record = self.handler.prepare(_record("Mission %s", (valeur,)))
+        valeur['etat'] = 'après'
+        self.assertIsNone(record.args)
+        self.assertEqual(record.getMessage(), "Mission {'etat': 'avant'}")
+
+    def test_exception_is_formatted_now(self):
+        try:
+            raise ValueError("boum")
+        except ValueError:
+            record = self.handler.prepare(_record("Erreur", exc_info=sys.exc_info()))
+        self.assertIsNone(record.exc_info)
+        self.assertIn("ValueError: boum", record.exc_text)
+
+    def test_records_are_written_as_json(self):
+        self.handler.handle(_record("Mission %s", (42,)))
+        self.handler.close()
+        entry = json.loads(self.stream.getvalue())
+        self.assertEqual((entry['message'], entry['level'], entry['logger']), ("Mission 42", 'INFO', 'test'))
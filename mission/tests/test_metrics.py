@@ -0,0 +1,74 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from django.test import SimpleTestCase
+from django.urls import reverse
+
+from my_airtable_api.utils.metrics import MetricsRegistry, collect, render_prometheus
+
+
+def _dead_pid():
+    # Le pid d'un processus terminé : ses jauges ne doivent plus être exposées
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    return process.pid
+
+
+class CollectTests(SimpleTestCase):
+    """Les fichiers de deux processus sont additionnés puis exposés au format de Prometheus."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+
+    def write_process(self, pid, requests, durations):
+        registry = MetricsRegistry()
+        counter = registry.counter('http_requests_total', "Requêtes HTTP traitées", ('view', 'method', 'status'))
+        histogram = registry.histogram('http_request_duration_seconds', "Durée", ('view',), buckets=(0.1, 1.0))
+        registry.register_collector(lambda: {
+            'db_pool_connections': {'help': "Connexions", 'labels': ['pool'], 'samples': [[[str(pid)], 1]]},
+        })
+        counter.inc('list_view', 'GET', 200, amount=requests)
+        for duration in durations:
+            histogram.observe(duration, 'list_view')
+        snapshot = {**registry.snapshot(), 'pid': pid}
+        (self.directory / f'metrics-{pid}.json').write_text(json.dumps(snapshot), encoding='utf-8')
+
+    def test_two_processes_are_summed(self):
+        vivant, mort = os.getpid(), _dead_pid()
+        self.write_process(vivant, 3, (0.05, 0.5))
+        self.write_process(mort, 2, (0.05, 5.0))
+
+        text = render_prometheus(collect(self.directory))
+
+        lignes = text.splitlines()
+        self.assertIn('# TYPE http_requests_total counter', lignes)
+        self.assertIn('http_requests_total{view="list_view",method="GET",status="200"} 5', lignes)
+        self.assertIn('# TYPE http_request_duration_seconds histogram', lignes)
+        self.assertIn('http_request_duration_seconds_bucket{view="list_view",le="0.1"} 2', lignes)
+        self.assertIn('http_request_duration_seconds_bucket{view="list_view",le="1.0"} 3', lignes)
+        self.assertIn('http_request_duration_seconds_bucket{view="list_view",le="+Inf"} 4', lignes)
+        self.assertIn('http_request_duration_seconds_sum{view="list_view"} 5.6', lignes)
+        self.assertIn('http_request_duration_seconds_count{view="list_view"} 4', lignes)
+        # Jauges : seul le processus vivant est exposé
+        self.assertIn('# TYPE db_pool_connections gauge', lignes)
+        self.assertIn(f'db_pool_connections{{pool="{vivant}"}} 1', lignes)
+        self.assertNotIn(f'pool="{mort}"', text)
+
+
+class MetricsViewTests(SimpleTestCase):
+
+    def test_allowed_address(self):
+        response = self.client.get(reverse('metrics'), REMOTE_ADDR='127.0.0.1')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('# TYPE http_requests_total counter', response.content.decode())
+
+    def test_other_address_is_refused(self):
+        with self.assertLogs('django.request', 'WARNING'):
+            response = self.client.get(reverse('metrics'), REMOTE_ADDR='10.0.0.8')
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,54 @@
+from django.test import TestCase
+
+from mission.models import Client
+from my_airtable_api.utils.pagination import NEXT, KeysetPaginator
+
+
+class KeysetPaginatorTests(TestCase):
+    """Parcours des pages dans les deux sens, y compris quand plusieurs lignes ont la même clé de tri."""
+
+    @classmethod
+    def setUpTestData(cls):
+        # Trois groupes de clients homonymes : seule la dernière colonne de tri (id) les départage
+        for i in range(11):
+            Client.objects.create(
+                nom=f"Nom{i % 3}", prenom="Jean", telephone="0600000000", email=f"client{i}@example.com",
+                adresse="1 rue de la Paix", code_postal="75000", ville="Paris",
+            )
+        cls.attendus = list(Client.objects.order_by('nom', 'prenom', 'id').values_list('id', flat=True))
+
+    def paginator(self, page_size=4):
+        return KeysetPaginator(Client.objects.all(), ('nom', 'prenom', 'id'), page_size)
+
+    def test_forward_then_back(self):
+        paginator = self.paginator()
+        pages = [paginator.page()]
+        while pages[-1].next_cursor:
+            pages.append(paginator.page(pages[-1].next_cursor))
+
+        self.assertEqual([client.id for page in pages for client in page], self.attendus)
+        self.assertEqual([len(page) for page in pages], [4, 4, 3])
+        self.assertIsNone(pages[0].previous_cursor)
+        self.assertIsNone(pages[-1].next_cursor)
+
+        # Retour en arrière depuis la dernière page
+        for precedente, page in zip(reversed(pages[:-1]), reversed(pages[1:])):
+            retour = paginator.page(page.previous_cursor)
+            self.assertEqual([c.id for c in retour], [c.id for c in precedente])
+        self.assertIsNone(paginator.page(pages[1].previous_cursor).previous_cursor)
+
+    def test_cursor_on_equal_sort_keys(self):
+        paginator = self.paginator(page_size=1)
+        premier = Client.objects.get(id=self.attendus[0])
+        page = paginator.page(paginator.encode_cursor(premier, NEXT))
+        # Le client suivant a le même nom et le même prénom : il n'est ni sauté ni répété
+        self.assertEqual([c.id for c in page], [self.attendus[1]])
+        self.assertEqual((page.items[0].nom, page.items[0].prenom), (premier.nom, premier.prenom))
+
+    def test_invalid_cursor_falls_back_to_first_page(self):
+        paginator = self.paginator()
+        premiere = [c.id for c in paginator.page()]
+        for curseur in ('pas-un-curseur', 'e30=', 'eyJkIjoieCIsInYiOlsiYSIsImIiLCIxIl19'):
+            with self.subTest(curseur=curseur), self.assertLogs('my_airtable_api.utils.pagination', 'WARNING'):
+                self.assertEqual(paginator.decode_cursor(curseur), (None, None))
+                self.assertEqual([c.id for c in paginator.page(curseur)], premiere)
@@ -0,0 +1,123 @@
+import json
+import os
+import threading
+import time
+import unittest
+
+from django.test import SimpleTestCase
+
+from my_airtable_api.utils import pool
+from my_airtable_api.utils.pool import ConnectionPool, PoolTimeout
+
+
+class FakeConnection:
+    """Connexion DB-API minimale : seul l'état ouvert/fermé est simulé."""
+
+    def __init__(self, numero):
+        self.numero = numero
+        self.closed = False
+        self.broken = False
+
+    def close(self):
+        self.closed = True
+
+
+class ConnectionPoolTests(SimpleTestCase):
+
+    def setUp(self):
+        self.opened = []
+
+    def connect(self):
+        connection = FakeConnection(len(self.opened) + 1)
+        self.opened.append(connection)
+        return connection
+
+    def make_pool(self, reset=None, **options):
+        return ConnectionPool(
+            'test', check=lambda connection, requete: not connection.closed and not connection.broken,
+            reset=reset or (lambda connection: None), **options,
+        )
+
+    def test_checkin_then_checkout_reuses_the_connection(self):
+        pool = self.make_pool()
+        premiere = pool.checkout(self.connect)
+        pool.checkin(premiere)
+        self.assertIs(pool.checkout(self.connect), premiere)
+        self.assertEqual(len(self.opened), 1)
+        stats = pool.stats()
+        self.assertEqual((stats['checkouts'], stats['created'], stats['in_use'], stats['idle']), (2, 1, 1, 0))
+
+    def test_broken_connection_is_discarded_on_checkout(self):
+        pool = self.make_pool()
+        connection = pool.checkout(self.connect)
+        pool.checkin(connection)
+        connection.broken = True
+
+        remplacante = pool.checkout(self.connect)
+        self.assertIsNot(remplacante, connection)
+        self.assertTrue(connection.closed)
+        self.assertEqual(pool.stats()['failed_checks'], 1)
+        self.assertEqual(pool.size, 1)
+
+    def test_failed_reset_closes_instead_of_returning(self):
+        def reset(connection):
+            raise RuntimeError("transaction interrompue")
+
+        pool = self.make_pool(reset=reset)
+        connection = pool.checkout(self.connect)
+        with self.assertLogs('my_airtable_api.utils.pool', 'WARNING'):
+            pool.checkin(connection)
+        self.assertTrue(connection.closed)
+        self.assertEqual(pool.size, 0)
+
+    def test_discard_frees_the_slot(self):
+        pool = self.make_pool(max_size=1, timeout=0.05)
+        connection = pool.checkout(self.connect)
+        pool.discard(connection)
+        self.assertTrue(connection.closed)
+        self.assertIsNot(pool.checkout(self.connect), connection)
+
+    def test_full_pool_waits_then_times_out(self):
+        pool = self.make_pool(max_size=1, timeout=0.05)
+        connection = pool.checkout(self.connect)
+        with self.assertRaises(PoolTimeout):
+            pool.checkout(self.connect)
+
+        # Une connexion rendue est donnée directement au demandeur en attente
+        servie = []
+        attente = threading.Thread(target=lambda: servie.append(pool.checkout(self.connect)))
+        pool.timeout = 5
+        attente.start()
+        while not pool.stats()['waiting']:
+            time.sleep(0.001)
+        pool.checkin(connection)
+        attente.join()
+        self.assertEqual(servie, [connection])
+        self.assertEqual(pool.stats()['timeouts'], 1)
+
+    @unittest.skipUnless(hasattr(os, 'fork') and hasattr(os, 'register_at_fork'), "os.fork requis")
+    def test_fork_resets_the_pool_in_the_child(self):
+        test_pool = pool.get_pool('test-fork', self.make_pool)
+        self.addCleanup(pool._pools.pop, 'test-fork', None)
+        pretee = test_pool.checkout(self.connect)
+        libre = test_pool.checkout(self.connect)
+        test_pool.checkin(libre)
+
+        lecture, ecriture = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            try:
+                stats = test_pool.stats()
+                os.write(ecriture, json.dumps([stats['size'], stats['in_use'], stats['idle']]).encode())
+            finally:
+                os._exit(0)
+        os.close(ecriture)
+        with os.fdopen(lecture) as sortie:
+            enfant = json.loads(sortie.read())
+        os.waitpid(pid, 0)
+
+        # L'enfant repart d'un pool vide ; le parent a fermé ses connexions libres avant le fork
+        self.assertEqual(enfant, [0, 0, 0])
+        self.assertTrue(libre.closed)
+        self.assertFalse(pretee.closed)
+        self.assertEqual(test_pool.stats()['in_use'], 1)
@@ -0,0 +1,72 @@
+from decimal import Decimal
+
+from django.db.models import Sum
+from django.test import SimpleTestCase, TestCase
+
+from mission.models import Intervention, MissionIntervention, MissionSummary
+from mission.script.benchmark import generer_donnees
+from my_airtable_api.utils.pricing import price_line, price_lines, reprice_interventions
+
+
+class PriceLineTests(SimpleTestCase):
+
+    def test_rounds_half_up_in_decimal(self):
+        intervention = Intervention(prix_unitaire=Decimal('10.01'))
+        # 10.01 × 2.5 = 25.025 : l'arrondi commercial donne 25.03 (en flottant, 25.024999… -> 25.02)
+        self.assertEqual(price_line(intervention, 'T3'), Decimal('25.03'))
+        self.assertEqual(price_line(Intervention(prix_unitaire=Decimal('0.05')), 'HORAIRE', '0.5'), Decimal('0.03'))
+
+    def test_float_inputs_are_exact(self):
+        intervention = Intervention(prix_unitaire=0.1)
+        self.assertEqual(price_line(intervention, 'T2', 3), Decimal('0.60'))
+        self.assertEqual(price_line(intervention, 'HORAIRE', 0.1), Decimal('0.01'))
+
+    def test_forfait_ignores_rate(self):
+        intervention = Intervention(forfait=Decimal('120.00'), is_forfait=True, prix_unitaire=Decimal('50'))
+        self.assertEqual(price_line(intervention, 'T3'), Decimal('120.00'))
+        self.assertEqual(price_line(intervention, 'T3', '1.5'), Decimal('180.00'))
+
+    def test_invalid_rate_or_duration(self):
+        intervention = Intervention(prix_unitaire=Decimal('10'))
+        with self.assertRaises(ValueError):
+            price_line(intervention, 'T9')
+        with self.assertRaises(ValueError):
+            price_line(intervention, 'T1', 'deux heures')
+
+    def test_price_lines_total(self):
+        a, b = Intervention(prix_unitaire=Decimal('10.01')), Intervention(prix_unitaire=Decimal('33.33'))
+        couts, total = price_lines([(a, 'T3', 0), (b, 'T1', 0), (b, 'HORAIRE', '2')])
+        self.assertEqual(couts, [Decimal('25.03'), Decimal('50.00'), Decimal('66.66')])
+        self.assertEqual(total, Decimal('141.69'))
+
+
+class RepriceInterventionsTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        generer_donnees(40)
+
+    def test_reprices_lines_and_summaries(self):
+        intervention = Intervention.objects.filter(missionintervention__isnull=False).first()
+        lignes = MissionIntervention.objects.filter(intervention=intervention)
+        nb_lignes = lignes.count()
+        # Changement de tarif sans signal, comme une mise à jour en masse
+        Intervention.objects.filter(id=intervention.id).update(prix_unitaire=Decimal('99.99'))
+        intervention.refresh_from_db()
+
+        self.assertEqual(reprice_interventions([intervention.id]), nb_lignes)
+        for ligne in lignes:
+            self.assertEqual(ligne.cout_total, price_line(intervention, ligne.taux, ligne.duree_supplementaire))
+
+        # Les totaux des résumés suivent les lignes
+        totaux = dict(
+            MissionIntervention.objects.values('mission').annotate(total=Sum('cout_total')).values_list('mission', 'total')
+        )
+        for summary in MissionSummary.objects.all():
+            self.assertEqual(summary.cout_total, totaux[summary.mission_id])
+
+        # Un second passage n'a plus rien à écrire
+        self.assertEqual(reprice_interventions([intervention.id]), 0)
+
+    def test_unknown_interventions(self):
+        self.assertEqual(reprice_interventions([0]), 0)
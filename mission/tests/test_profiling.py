@@ -0,0 +1,124 @@
+import os
+import sys
+import tempfile
+import threading
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from my_airtable_api.utils.profiling import StackSampler, write_collapsed
+
+
+def _attendre(event):
+    event.wait(5)
+
+
+class WriteCollapsedTests(SimpleTestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+
+    def test_format(self):
+        path = write_collapsed(self.directory, 'mission:list/tab', Counter({'a:f;b:g': 2, 'a:f': 5}))
+        # Le nom de la vue est nettoyé pour le nom du fichier et mis en tête de chaque pile
+        self.assertRegex(path.name, r'^\d{8}-\d{6}-mission_list_tab-%d-\d+\.collapsed$' % os.getpid())
+        self.assertEqual(path.read_text(encoding='utf-8'), "mission_list_tab;a:f 5\nmission_list_tab;a:f;b:g 2\n")
+
+    def test_unknown_view(self):
+        path = write_collapsed(self.directory, '', Counter({'a:f': 1}))
+        self.assertIn('-inconnue-', path.name)
+        self.assertEqual(path.read_text(encoding='utf-8'), "inconnue;a:f 1\n")
+
+    def test_oldest_profiles_are_pruned(self):
+        anciens = [write_collapsed(self.directory, 'vue', Counter({'a:f': 1})) for _ in range(2)]
+        for age, path in enumerate(anciens):
+            os.utime(path, (1000 + age, 1000 + age))
+        recent = write_collapsed(self.directory, 'vue', Counter({'a:f': 1}), max_files=2)
+        self.assertEqual(sorted(self.directory.glob('*.collapsed')), sorted([anciens[1], recent]))
+
+
+class StackSamplerTests(SimpleTestCase):
+
+    def test_base_frames_are_excluded(self):
+        sampler = StackSampler(threading.get_ident(), base_frame=sys._getframe(1))
+        sampler._sample()
+        [stack] = sampler.stacks
+        # La pile commence à cette méthode : les frames du lanceur de tests sont retirées
+        self.assertTrue(stack.startswith(f'{__name__}:test_base_frames_are_excluded;'), stack)
+        self.assertEqual(sampler.samples, 1)
+
+    def test_samples_another_thread(self):
+        event = threading.Event()
+        thread = threading.Thread(target=_attendre, args=(event,))
+        thread.start()
+        sampler = StackSampler(thread.ident, interval=0.001)
+        sampler.start()
+        try:
+            while sampler.samples < 3:
+                threading.Event().wait(0.001)
+        finally:
+            duration = sampler.stop()
+            event.set()
+            thread.join()
+        self.assertGreater(duration, 0)
+        self.assertTrue(all(f'{__name__}:_attendre' in stack for stack in sampler.stacks), sampler.stacks)
+
+
+class SamplingProfilerMiddlewareTests(TestCase):
+    """Le middleware est chargé par le client de test, sous les réglages de chaque test."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user('staff', password='staff', is_staff=True)
+        cls.user = User.objects.create_user('user', password='user')
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+
+    def profiling(self, sample_rate):
+        return override_settings(PROFILING={
+            **settings.PROFILING, 'ENABLED': True, 'SAMPLE_RATE': sample_rate, 'DIRECTORY': self.directory,
+        })
+
+    def profiles(self):
+        return list(self.directory.glob('*.collapsed'))
+
+    def test_sampled_request_is_written(self):
+        with self.profiling(1):
+            self.client.force_login(self.user)
+            response = self.client.get(reverse('autocomplete_clients'), HTTP_X_PROFILE='1')
+        self.assertEqual(response.status_code, 200)
+        # Pas un membre du staff : profil écrit (échantillon), mais pas d'en-tête
+        self.assertNotIn('X-Profile', response)
+        [profile] = self.profiles()
+        self.assertIn('-autocomplete_clients-', profile.name)
+        for ligne in profile.read_text(encoding='utf-8').splitlines():
+            self.assertRegex(ligne, r'^autocomplete_clients;\S+ \d+$')
+
+    def test_staff_header_requests_a_profile(self):
+        with self.profiling(0):
+            self.client.force_login(self.staff)
+            response = self.client.get(reverse('autocomplete_clients'), HTTP_X_PROFILE='1')
+        [profile] = self.profiles()
+        self.assertEqual(response['X-Profile'], profile.name)
+
+    def test_header_is_ignored_for_other_users(self):
+        with self.profiling(0):
+            self.client.force_login(self.user)
+            response = self.client.get(reverse('autocomplete_clients'), HTTP_X_PROFILE='1')
+        self.assertNotIn('X-Profile', response)
+        self.assertEqual(self.profiles(), [])
+
+    def test_disabled_by_default(self):
+        self.client.force_login(self.staff)
+        response = self.client.get(reverse('autocomplete_clients'), HTTP_X_PROFILE='1')
+        self.assertNotIn('X-Profile', response)
+        self.assertEqual(self.profiles(), [])
@@ -0,0 +1,92 @@
+from urllib.parse import urlsplit
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+
+from mission.models import Mission
+from mission.script.benchmark import generer_donnees
+from my_airtable_api.utils.query_budget import QueryBudgetExceeded, QueryBudgetMiddleware, query_budget
+
+
+class QueryBudgetViewsTests(TestCase):
+    """Les vues budgétées restent dans leur budget de requêtes SQL, cache de la liste vide ou non."""
+
+    @classmethod
+    def setUpTestData(cls):
+        generer_donnees(120)
+        cls.user = User.objects.create_user('budget', password='budget', is_staff=True)
+
+    def setUp(self):
+        caches['list_view'].clear()
+        self.client.force_login(self.user)
+
+    def assertWithinBudget(self, url, repetitions=2):
+        budget = resolve(urlsplit(url).path).func.query_budget
+        for _ in range(repetitions):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, url)
+            self.assertLessEqual(len(queries), budget, f"{url} : {len(queries)} requêtes pour un budget de {budget}")
+
+    def test_list_view(self):
+        self.assertWithinBudget(reverse('list_view'))
+        self.assertWithinBudget(reverse('list_view') + '?priorite=URGENTE&client=Nom1')
+
+    def test_list_tab_view(self):
+        for name in ('list_missions', 'list_vehicules', 'list_clients'):
+            self.assertWithinBudget(reverse(name))
+
+    def test_show_mission_view(self):
+        mission = Mission.objects.first()
+        self.assertWithinBudget(reverse('show_mission', args=[mission.id]))
+
+    def test_list_interventions_view(self):
+        self.assertWithinBudget(reverse('list_interventions_view'))
+
+    def test_export_counts_streamed_queries(self):
+        url = reverse('export_missions')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+            avant_flux = len(queries)
+            with self.assertLogs('my_airtable_api.utils.query_budget', 'INFO') as logs:
+                contenu = b''.join(response.streaming_content)
+        self.assertLessEqual(avant_flux, resolve(url).func.query_budget)
+        self.assertGreater(len(queries), avant_flux)
+        self.assertIn(b'Nom1', contenu)
+        fin_de_flux = [record for record in logs.records if hasattr(record, 'stream_queries')]
+        self.assertEqual(len(fin_de_flux), 1)
+        self.assertEqual(fin_de_flux[0].stream_queries, len(queries) - avant_flux)
+
+
+class QueryBudgetMiddlewareTests(TestCase):
+
+    def _call(self, view):
+        request = RequestFactory().get('/')
+        middleware = QueryBudgetMiddleware(lambda request: view(request))
+        middleware.process_view(request, view, (), {})
+        return middleware(request)
+
+    def test_overrun_raises_in_strict_mode(self):
+        @query_budget(1)
+        def view(request):
+            list(Mission.objects.all())
+            list(Mission.objects.all())
+            return HttpResponse()
+
+        with self.settings(QUERY_BUDGET_STRICT=True), self.assertRaises(QueryBudgetExceeded):
+            self._call(view)
+
+    def test_overrun_warns_otherwise(self):
+        @query_budget(0)
+        def view(request):
+            list(Mission.objects.all())
+            return HttpResponse()
+
+        with self.settings(QUERY_BUDGET_STRICT=False), self.assertLogs('my_airtable_api.utils.query_budget', 'WARNING'):
+            response = self._call(view)
+        self.assertIn('1 requetes', response['Server-Timing'])
@@ -0,0 +1,109 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db import connections
+from django.test import RequestFactory, SimpleTestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from mission.models import Mission
+from mission.script.benchmark import generer_donnees
+from my_airtable_api.db.router import STICKY_COOKIE, ReplicaRouter, read_only_view, current_read_alias, replica_monitor
+
+REPLICAS = {'ALIASES': ['replica1'], 'MAX_LAG': 5.0, 'STICKY_SECONDS': 5, 'LAG_CHECK_INTERVAL': 0}
+
+
+def _mission_queries(queries):
+    return [query['sql'] for query in queries.captured_queries if 'mission_' in query['sql']]
+
+
+@override_settings(REPLICAS=REPLICAS)
+class ReplicaRoutingTests(TransactionTestCase):
+    """`replica1` est une seconde connexion SQLite sur la base de test : les requêtes sont comptées par connexion."""
+    databases = {'default', 'replica1'}
+
+    def setUp(self):
+        generer_donnees(40)
+        user = User.objects.create_user('routeur', password='routeur', is_staff=True)
+        self.client.force_login(user)
+        caches['list_view'].clear()
+        replica_monitor._lags.clear()
+        replica_monitor._checked_at.clear()
+
+    def get(self, url, **extra):
+        with CaptureQueriesContext(connections['default']) as primaire, \
+                CaptureQueriesContext(connections['replica1']) as replica:
+            response = self.client.get(url, **extra)
+        self.assertEqual(response.status_code, 200)
+        return response, _mission_queries(primaire), _mission_queries(replica)
+
+    def test_read_only_view_reads_on_replica(self):
+        response, primaire, replica = self.get(reverse('list_missions'))
+        self.assertTrue(replica)
+        self.assertEqual(primaire, [])
+        self.assertNotIn(STICKY_COOKIE, response.cookies)
+
+    def test_write_then_sticky_primary(self):
+        mission = Mission.objects.order_by('id').first()
+        with CaptureQueriesContext(connections['replica1']) as replica:
+            response = self.client.post(reverse('delete_missions'), {'missions': str(mission.id)})
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(_mission_queries(replica), [])
+        self.assertFalse(Mission.objects.filter(id=mission.id).exists())
+        self.assertEqual(response.cookies[STICKY_COOKIE]['max-age'], REPLICAS['STICKY_SECONDS'])
+
+        # Le client renvoie le cookie : sa lecture suivante se fait sur la base principale
+        _, primaire, replica = self.get(reverse('list_missions'))
+        self.assertTrue(primaire)
+        self.assertEqual(replica, [])
+
+        # Sans le cookie (expiré), les lectures retournent sur le réplica
+        self.client.cookies.pop(STICKY_COOKIE)
+        caches['list_view'].clear()
+        _, primaire, replica = self.get(reverse('list_missions'))
+        self.assertTrue(replica)
+        self.assertEqual(primaire, [])
+
+    def assertReadsOnPrimary(self, url):
+        caches['list_view'].clear()
+        _, primaire, replica = self.get(url)
+        self.assertTrue(primaire)
+        self.assertEqual(replica, [])
+
+    def test_lagging_replica_falls_back_to_primary(self):
+        with mock.patch.object(replica_monitor, 'measure_lag', return_value=60.0), \
+                self.assertLogs('my_airtable_api.db.router', 'WARNING'):
+            self.assertReadsOnPrimary(reverse('list_missions'))
+
+    def test_unreachable_replica_falls_back_to_primary(self):
+        with mock.patch.object(replica_monitor, 'measure_lag', return_value=None):
+            self.assertReadsOnPrimary(reverse('list_missions'))
+
+    def test_measure_lag_on_sqlite(self):
+        self.assertEqual(replica_monitor.measure_lag('replica1'), 0.0)
+        self.assertEqual(replica_monitor.healthy(), ['replica1'])
+
+
+@override_settings(REPLICAS=REPLICAS)
+class ReplicaRouterTests(SimpleTestCase):
+
+    def test_read_only_view_chooses_alias(self):
+        @read_only_view
+        def view(request):
+            return current_read_alias()
+
+        factory = RequestFactory()
+        with mock.patch.object(replica_monitor, 'choose', return_value='replica1'):
+            self.assertEqual(view(factory.get('/')), 'replica1')
+            self.assertIsNone(view(factory.post('/')))
+            sticky = factory.get('/')
+            sticky.COOKIES[STICKY_COOKIE] = '1'
+            self.assertIsNone(view(sticky))
+        self.assertIsNone(current_read_alias())
+
+    def test_replicas_are_not_migrated(self):
+        router = ReplicaRouter()
+        self.assertIs(router.allow_migrate('replica1', 'mission'), False)
+        self.assertIsNone(router.allow_migrate('default', 'mission'))
+        self.assertEqual(router.db_for_write(Mission), 'default')
@@ -0,0 +1,87 @@
+from io import StringIO
+
+from django.core.checks import run_checks
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+
+from mission.models import Client
+from my_airtable_api.utils.search import _has_fts_table, missing_search_triggers, search_clients
+
+
+def _clients(term):
+    return set(search_clients(term).values_list('id', flat=True))
+
+
+def _skip_without_fts(test):
+    if connection.vendor != 'sqlite' or not _has_fts_table(connection, 'mission_client'):
+        test.skipTest("SQLite sans FTS5 (tokenizer trigram) : recherche par icontains")
+
+
+class SearchTriggersTests(TestCase):
+    """Les triggers tiennent la table FTS5 des clients à jour à chaque écriture."""
+
+    def setUp(self):
+        _skip_without_fts(self)
+
+    def test_create_rename_delete(self):
+        client = Client.objects.create(nom="Lefebvre", prenom="Anne", email="anne@example.com")
+        self.assertEqual(_clients("febv"), {client.id})
+
+        client.nom = "Martinez"
+        client.save()
+        self.assertEqual(_clients("febv"), set())
+        self.assertEqual(_clients("tinez"), {client.id})
+
+        client.delete()
+        self.assertEqual(_clients("tinez"), set())
+
+    def test_missing_triggers_are_reported_and_recreated(self):
+        self.assertEqual(missing_search_triggers(), [])
+        self.assertEqual(run_checks(tags=['database'], databases=['default']), [])
+        with connection.cursor() as cursor:
+            cursor.execute("DROP TRIGGER mission_client_fts_ai")
+
+        self.assertEqual(missing_search_triggers(), ['mission_client_fts_ai'])
+        [error] = run_checks(tags=['database'], databases=['default'])
+        self.assertEqual(error.id, 'search.E001')
+
+        # Un client créé sans trigger n'est retrouvé qu'après la reconstruction
+        client = Client.objects.create(nom="Lefebvre", prenom="Anne", email="anne@example.com")
+        self.assertEqual(_clients("febv"), set())
+        with self.assertLogs('my_airtable_api.utils.search', 'WARNING'):
+            call_command('rebuild_search_indexes', stdout=StringIO())
+        self.assertEqual(missing_search_triggers(), [])
+        self.assertEqual(_clients("febv"), {client.id})
+
+
+class AlterFieldTriggersTests(TransactionTestCase):
+    """Sur SQLite, modifier une colonne recrée la table : les triggers sont perdus."""
+
+    def setUp(self):
+        _skip_without_fts(self)
+
+    def alter_nom(self, max_length):
+        old_field = Client._meta.get_field('nom')
+        new_field = old_field.clone()
+        new_field.set_attributes_from_name('nom')
+        new_field.max_length = max_length
+        with connection.schema_editor() as editor:
+            editor.alter_field(Client, old_field, new_field)
+
+    def test_alter_field_drops_triggers(self):
+        max_length = Client._meta.get_field('nom').max_length
+        try:
+            self.alter_nom(max_length + 10)
+            self.assertEqual(
+                missing_search_triggers(),
+                ['mission_client_fts_ai', 'mission_client_fts_ad', 'mission_client_fts_au'],
+            )
+        finally:
+            # Schéma et triggers d'origine pour les tests suivants
+            self.alter_nom(max_length)
+            with self.assertLogs('my_airtable_api.utils.search', 'WARNING'):
+                call_command('rebuild_search_indexes', stdout=StringIO())
+        self.assertEqual(missing_search_triggers(), [])
+        client = Client.objects.create(nom="Lefebvre", prenom="Anne", email="anne@example.com")
+        self.assertEqual(_clients("febv"), {client.id})
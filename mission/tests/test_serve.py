@@ -0,0 +1,19 @@
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, override_settings
+
+
+class ServeCommandTests(SimpleTestCase):
+
+    def test_refuses_process_local_cache_with_several_workers(self):
+        # settings_test : cache de la liste en LocMemCache
+        with self.assertRaisesMessage(CommandError, "propre à chaque processus"):
+            call_command('serve', '127.0.0.1:0', workers=2)
+
+    @override_settings(CACHES={
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+        'list_view': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': '/tmp/unused'},
+    })
+    def test_shared_cache_passes_the_check(self):
+        # La vérification passe : la commande échoue ensuite sur l'adresse invalide, avant tout fork
+        with self.assertRaisesMessage(CommandError, "Adresse invalide"):
+            call_command('serve', 'adresse', workers=2)
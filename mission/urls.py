@@ -1,19 +1,36 @@
 
 from django.urls import path
-from mission.views.list_views import list_view, show_mission_view, list_interventions_view
-from mission.views.form_views import get_mission_form_view, post_mission_form_view, get_update_mission_view, post_update_mission_view, delete_mission_view, create_intervention_view, update_intervention_view, delete_intervention_view
+from mission.views.list_views import list_view, list_tab_view, export_missions_view, show_mission_view, list_interventions_view
+from mission.views.autocomplete_views import autocomplete_clients_view, autocomplete_vehicules_view, autocomplete_interventions_view
+from mission.views.async_views import list_view_async, list_tab_view_async, show_mission_view_async, list_interventions_view_async
+from mission.views.form_views import get_mission_form_view, post_mission_form_view, get_update_mission_view, post_update_mission_view, delete_mission_view, delete_missions_view, create_intervention_view, update_intervention_view, delete_intervention_view
 
 
 urlpatterns = [ 
     path('', list_view, name="list_view"),
+    path('liste/missions/', list_tab_view, {'onglet': 'missions'}, name='list_missions'),
+    path('liste/vehicules/', list_tab_view, {'onglet': 'vehicules'}, name='list_vehicules'),
+    path('liste/clients/', list_tab_view, {'onglet': 'clients'}, name='list_clients'),
+    path('export/', export_missions_view, name='export_missions'),
     path('new/', get_mission_form_view, name='get_mission_form_view'),
     path('new/post', post_mission_form_view, name='post_mission_form_view'),
     path('edit/<int:mission_id>/', get_update_mission_view, name='edit_mission'),
     path('edit/<int:mission_id>/post', post_update_mission_view, name='post_update_mission'),
     path('delete/<int:mission_id>/', delete_mission_view, name='delete_mission'),
+    path('delete/', delete_missions_view, name='delete_missions'),
     path('show/<int:mission_id>/', show_mission_view, name='show_mission'),
     path('intervention/', list_interventions_view, name='list_interventions_view'),
     path('intervention/edit/<int:intervention_id>/', update_intervention_view, name='edit_intervention'),
     path('intervention/delete/<int:intervention_id>/', delete_intervention_view, name='delete_intervention'),
-    path('intervention/new/', create_intervention_view, name='create_intervention')
+    path('intervention/new/', create_intervention_view, name='create_intervention'),
+    path('autocomplete/clients/', autocomplete_clients_view, name='autocomplete_clients'),
+    path('autocomplete/vehicules/', autocomplete_vehicules_view, name='autocomplete_vehicules'),
+    path('autocomplete/interventions/', autocomplete_interventions_view, name='autocomplete_interventions'),
+    # Vues de lecture asynchrones, à servir sous ASGI
+    path('async/', list_view_async, name='list_view_async'),
+    path('async/liste/missions/', list_tab_view_async, {'onglet': 'missions'}, name='list_missions_async'),
+    path('async/liste/vehicules/', list_tab_view_async, {'onglet': 'vehicules'}, name='list_vehicules_async'),
+    path('async/liste/clients/', list_tab_view_async, {'onglet': 'clients'}, name='list_clients_async'),
+    path('async/show/<int:mission_id>/', show_mission_view_async, name='show_mission_async'),
+    path('async/intervention/', list_interventions_view_async, name='list_interventions_async'),
 ]
\ No newline at end of file
@@ -0,0 +1,218 @@
+"""
+Versions asynchrones (ASGI) des vues de lecture : liste, détail d'une mission, catalogue des interventions
+
+Les requêtes passent par l'ORM asynchrone (afirst, async for) et le worker ASGI n'est
+pas bloqué pendant les allers-retours avec la base. Les requêtes indépendantes d'une même vue
+sont lancées ensemble avec asyncio.gather ; Django les exécute sur la connexion de la requête,
+le gain principal sous charge reste de libérer le worker pendant l'attente de la base.
+
+Les vues synchrones restent servies sous WSGI ; sous ASGI, ce sont ces vues qu'il faut router.
+"""
+import asyncio
+import logging
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.views import redirect_to_login
+from django.forms.models import model_to_dict
+from django.http import Http404
+from django.shortcuts import render
+
+from ..models import Client, Intervention, Mission, MissionIntervention, MissionSummary, Priorite, Vehicule
+from my_airtable_api.utils.cache import list_view_cache
+from my_airtable_api.utils.catalog import intervention_catalog
+from my_airtable_api.utils.error_manage import render_with_error_handling
+from my_airtable_api.utils.filters import filter_missions
+from my_airtable_api.utils.pagination import KeysetPaginator
+from my_airtable_api.utils.query_budget import query_budget
+from my_airtable_api.db.router import read_only_view
+from .list_views import (
+    ONGLETS, _tab, _tab_request, _tab_render_context, _mission_row, _vehicule_row, _client_row,
+    _vehicules_missions_query, _clients_vehicules_query,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def async_login_required(view_func):
+    """Équivalent de login_required pour une vue asynchrone.
+
+    L'utilisateur est chargé (session puis base) hors de la boucle d'événements.
+
+    Args:
+        view_func (coroutine function): La vue à protéger.
+
+    Returns:
+        coroutine function: La vue qui redirige vers la connexion si l'utilisateur est anonyme.
+    """
+    @wraps(view_func)
+    async def wrapper(request, *args, **kwargs):
+        is_authenticated = await sync_to_async(lambda: request.user.is_authenticated)()
+        if not is_authenticated:
+            return redirect_to_login(request.get_full_path())
+        return await view_func(request, *args, **kwargs)
+    return wrapper
+
+
+async def _alist(queryset):
+    """Évalue un queryset avec l'ORM asynchrone."""
+    return [obj async for obj in queryset]
+
+
+async def _amissions_tab(filters, cursor, page_size):
+    """Version asynchrone de l'onglet missions (lecture de MissionSummary)."""
+    summaries_query = filter_missions(MissionSummary.objects.all(), filters)
+    page = await KeysetPaginator(summaries_query, ('date_demande', 'mission_id'), page_size).apage(cursor)
+    return _tab([_mission_row(summary) for summary in page], page)
+
+
+async def _avehicules_tab(filters, cursor, page_size):
+    """Version asynchrone de l'onglet véhicules : la page, puis les missions de ses véhicules."""
+    vehicules_query = Vehicule.objects.select_related('client')
+    page = await KeysetPaginator(vehicules_query, ('marque', 'modele', 'id'), page_size).apage(cursor)
+
+    vehicules_group = {vehicule.id: _vehicule_row(vehicule) for vehicule in page}
+    async for mission in _vehicules_missions_query(vehicules_group.keys(), filters):
+        vehicules_group[mission.pop('vehicule_id')]['missions'][mission['id']] = mission
+
+    for vehicule in vehicules_group.values():
+        vehicule['missions'] = list(vehicule['missions'].values())
+    return _tab(list(vehicules_group.values()), page)
+
+
+async def _aclients_tab(filters, cursor, page_size):
+    """Version asynchrone de l'onglet clients : la page, puis les véhicules de ses clients."""
+    page = await KeysetPaginator(Client.objects.all(), ('nom', 'prenom', 'id'), page_size).apage(cursor)
+
+    clients_group = {client.id: _client_row(client) for client in page}
+    async for vehicule in _clients_vehicules_query(clients_group.keys()):
+        clients_group[vehicule['client_id']]['vehicules'].append(vehicule)
+    return _tab(list(clients_group.values()), page)
+
+
+ASYNC_TAB_BUILDERS = {
+    'missions': _amissions_tab,
+    'vehicules': _avehicules_tab,
+    'clients': _aclients_tab,
+}
+
+
+async def _atab_context(request, onglet):
+    """Version asynchrone de _tab_context (même cache, mêmes clés que la vue synchrone).
+
+    Args:
+        request (HttpRequest): La requête HTTP contenant les filtres et le curseur.
+        onglet (str): L'onglet à construire.
+
+    Returns:
+        tuple: Le contexte de l'onglet, et True si les données venaient du cache.
+    """
+    filters, cursor, page_size, key = await sync_to_async(_tab_request)(request, onglet)
+    tab, hit = await list_view_cache.aget_or_compute(
+        key, lambda: ASYNC_TAB_BUILDERS[onglet](filters, cursor, page_size)
+    )
+    return _tab_render_context(request, onglet, filters, tab), hit
+
+
+@query_budget(6)
+@async_login_required
+@read_only_view
+async def list_view_async(request):
+    """Version asynchrone de list_view : seul l'onglet affiché est calculé.
+
+    Args:
+        request (HttpRequest): La requête HTTP contenant les paramètres de filtrage.
+
+    Returns:
+        HttpResponse: La réponse HTTP contenant le rendu du template avec les données filtrées.
+    """
+    onglet = request.GET.get('onglet')
+    if onglet not in ONGLETS:
+        onglet = 'missions'
+
+    context, hit = await _atab_context(request, onglet)
+    context['priorites_choices'] = [(choix.name, choix.value) for choix in Priorite]
+    response = render(request, 'list-view.html', context)
+    response['X-List-Cache'] = 'HIT' if hit else 'MISS'
+    return response
+
+
+@query_budget(5)
+@async_login_required
+@read_only_view
+async def list_tab_view_async(request, onglet):
+    """Version asynchrone de list_tab_view (fragment HTML d'un onglet).
+
+    Args:
+        request (HttpRequest): La requête HTTP contenant les filtres et le curseur.
+        onglet (str): L'onglet demandé ('missions', 'vehicules' ou 'clients').
+
+    Raises:
+        Http404: Si l'onglet est inconnu.
+
+    Returns:
+        HttpResponse: Le fragment HTML du tableau de l'onglet.
+    """
+    if onglet not in ONGLETS:
+        raise Http404(f"Onglet inconnu : {onglet}")
+    context, hit = await _atab_context(request, onglet)
+    response = render(request, f'partials/{onglet}_list.html', context)
+    response['X-List-Cache'] = 'HIT' if hit else 'MISS'
+    return response
+
+
+@query_budget(10)
+@async_login_required
+@read_only_view
+async def show_mission_view_async(request, mission_id):
+    """Version asynchrone de show_mission_view.
+
+    La mission (avec son client et son véhicule), ses lignes et ses interventions ne dépendent
+    que de l'identifiant : les trois requêtes sont lancées ensemble.
+
+    Args:
+        request (HttpRequest): La requête HTTP
+        mission_id (int): L'ID de la mission à afficher
+
+    Returns:
+        HttpResponse: La réponse HTTP contenant le rendu du template avec les détails de la mission
+    """
+    mission, lignes, interventions = await asyncio.gather(
+        Mission.objects.select_related('client', 'vehicule').filter(id=mission_id).afirst(),
+        _alist(MissionIntervention.objects.filter(mission_id=mission_id).order_by('id')),
+        _alist(Intervention.objects.filter(missions=mission_id)),
+    )
+    if not mission:
+        logger.error("Mission with id %s does not exist.", mission_id)
+        return render_with_error_handling(request, 'error.html', {
+            'error': f"Mission with id {mission_id} does not exist.",
+            'template_error': True,
+            'error_type': 'template_render_error'
+        })
+
+    mission_data = model_to_dict(mission, exclude=['interventions'])
+    mission_data['interventions'] = interventions
+    return render(request, 'show_mission.html', {
+        'mission': mission_data,
+        'client': model_to_dict(mission.client),
+        'vehicule': model_to_dict(mission.vehicule),
+        'mission_intervention': [model_to_dict(ligne) for ligne in lignes]
+    })
+
+
+@query_budget(3)
+@async_login_required
+@read_only_view
+async def list_interventions_view_async(request):
+    """Version asynchrone de list_interventions_view (catalogue des interventions).
+
+    Args:
+        request (HttpRequest): La requête HTTP
+
+    Returns:
+        HttpResponse: La réponse HTTP contenant le rendu du template avec la liste des interventions
+    """
+    interventions = await sync_to_async(intervention_catalog.all)()
+    return render(request, 'list_interventions.html', {
+        'interventions': interventions
+    })
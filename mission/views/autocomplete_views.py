@@ -0,0 +1,55 @@
+from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
+
+from my_airtable_api.utils.autocomplete import get_limit, autocomplete_clients, autocomplete_vehicules, autocomplete_interventions
+from my_airtable_api.utils.query_budget import query_budget
+from my_airtable_api.db.router import read_only_view
+
+
+@query_budget(3)
+@login_required
+@read_only_view
+def autocomplete_clients_view(request):
+    """Retourne en JSON les clients dont le nom, le prénom, l'email ou le téléphone commence par `q`.
+
+    Args:
+        request (HttpRequest): La requête HTTP (paramètres `q` et `limite`).
+
+    Returns:
+        JsonResponse: Les clients trouvés et l'indicateur de troncature.
+    """
+    return JsonResponse(autocomplete_clients(request.GET.get('q', ''), get_limit(request.GET)))
+
+
+@query_budget(3)
+@login_required
+@read_only_view
+def autocomplete_vehicules_view(request):
+    """Retourne en JSON les véhicules dont l'immatriculation ou le numéro de série commence par `q`.
+
+    Le paramètre `client` limite la recherche aux véhicules d'un client.
+
+    Args:
+        request (HttpRequest): La requête HTTP (paramètres `q`, `client` et `limite`).
+
+    Returns:
+        JsonResponse: Les véhicules trouvés et l'indicateur de troncature.
+    """
+    client_id = request.GET.get('client', '')
+    client_id = int(client_id) if client_id.isdigit() else None
+    return JsonResponse(autocomplete_vehicules(request.GET.get('q', ''), get_limit(request.GET), client_id))
+
+
+@query_budget(3)
+@login_required
+@read_only_view
+def autocomplete_interventions_view(request):
+    """Retourne en JSON les interventions du catalogue dont le libellé commence par `q`.
+
+    Args:
+        request (HttpRequest): La requête HTTP (paramètres `q` et `limite`).
+
+    Returns:
+        JsonResponse: Les interventions trouvées et l'indicateur de troncature.
+    """
+    return JsonResponse(autocomplete_interventions(request.GET.get('q', ''), get_limit(request.GET)))
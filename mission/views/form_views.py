@@ -1,6 +1,9 @@
 from my_airtable_api.utils.extract_data import ValidationError, extract_data_client, extract_data_vehicule, extract_data_intervention, extract_data_mission, extract_data_mission_intervention
 from my_airtable_api.utils.crud import create_taches, get_all_mission_intervention_by_id, create_client, create_vehicule, get_client_by_id, get_vehicule_by_id, get_mission_by_id, update_taches
 from my_airtable_api.utils.error_manage import handle_template_errors, render_with_error_handling
+from my_airtable_api.utils.summary import refresh_mission_summaries
+from my_airtable_api.utils.query_budget import query_budget
+from my_airtable_api.utils.pricing import reprice_interventions
 from mission.models import Client, Vehicule, Intervention, Priorite, Taux
 from mission.form import InterventionForm
 
@@ -11,7 +14,39 @@ from django.shortcuts import render, redirect
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 
+logger = logging.getLogger(__name__)
 
+
+def _mission_form_context(valeurs=None, erreurs=None):
+    """Construit le contexte du formulaire de création de mission.
+
+    Les clients, véhicules et interventions ne sont plus intégrés à la page : le formulaire
+    les recherche au fil de la saisie (vues autocomplete). Seuls le client et le véhicule déjà
+    choisis, lors d'un nouvel affichage après erreur, sont relus pour afficher leur libellé.
+
+    Args:
+        valeurs (dict, optional): Les valeurs envoyées par le formulaire. Defaults to None.
+        erreurs (dict, optional): Les erreurs de validation. Defaults to None.
+
+    Returns:
+        dict: Le contexte du template new_mission.html.
+    """
+    valeurs = valeurs or {}
+    context = {
+        'priorites': [(choix.name, choix.value) for choix in Priorite],
+        'taux': [(choix.name, choix.value) for choix in Taux],
+    }
+    if erreurs is not None:
+        context['erreurs'] = erreurs
+        context['valeurs'] = valeurs
+    if valeurs.get('client', '').isdigit():
+        context['client_choisi'] = Client.objects.filter(id=valeurs['client']).first()
+    if valeurs.get('vehicule_id', '').isdigit():
+        context['vehicule_choisi'] = Vehicule.objects.filter(id=valeurs['vehicule_id']).first()
+    return context
+
+
+@query_budget(3)
 @handle_template_errors()
 @login_required
 def get_mission_form_view(request):
@@ -22,13 +57,7 @@ def get_mission_form_view(request):
         HttpResponse: La réponse HTTP contenant le rendu du template du formulaire de création de mission.
     """
     
-    return render_with_error_handling(request, 'new_mission.html', {
-        'clients': Client.objects.all(),
-        'vehicules': Vehicule.objects.all(),
-        'interventions': Intervention.objects.all(),
-        'priorites': [(choix.name, choix.value) for choix in Priorite],
-        'taux': [(choix.name, choix.value) for choix in Taux]
-    })
+    return render_with_error_handling(request, 'new_mission.html', _mission_form_context())
 
 def post_mission_form_view(request):
     """Fonction pour traiter les données du formulaire de création d'une nouvelle mission.
@@ -49,13 +78,13 @@ def post_mission_form_view(request):
         with transaction.atomic():
             # 1. Extraction des données
             client_data = extract_data_client(request, erreurs)
-            logging.info(f"Client data extracted: {client_data}")
+            logger.debug("Client data extracted: %s", client_data)
             if client_data.get('id'): 
                 client = get_client_by_id(client_data['id'])  # objet existant
             else:
                 client = create_client(client_data, erreurs)  # sinon on le crée
 
-            logging.info(f"Client data extracted: {client}")
+            logger.debug("Client data extracted: %s", client)
             
             vehicule_data = extract_data_vehicule(request, client, erreurs)
             if vehicule_data.get('id'):
@@ -65,14 +94,14 @@ def post_mission_form_view(request):
                     raise ValidationError("Erreur(s) dans le formulaire", details=erreurs)
             else:
                 vehicule = create_vehicule(vehicule_data, client, erreurs)
-            logging.info(f"Vehicule data extracted: {vehicule}")
+            logger.debug("Vehicule data extracted: %s", vehicule)
             
             interventions = extract_data_intervention(request, erreurs)
-            logging.info(f"Interventions data extracted: {interventions}")
+            logger.debug("Interventions data extracted: %s", interventions)
             mission_data = extract_data_mission(request, vehicule, client, erreurs, mission_id=None)
-            logging.info(f"Mission data extracted: {mission_data}")
+            logger.debug("Mission data extracted: %s", mission_data)
             mission_interventions = extract_data_mission_intervention(request, mission_data, interventions, erreurs)
-            logging.info(f"Mission Intervention data extracted: {mission_interventions}")
+            logger.debug("Mission Intervention data extracted: %s", mission_interventions)
             # Récuperation des données 
             # INFO:Client data extracted: Samy Samy
             # my_airtable_api     | INFO:Vehicle created for client Samy Samy: Renault Clio
@@ -83,24 +112,18 @@ def post_mission_form_view(request):
             # my_airtable_api     | INFO:extract_data_intervention - Total interventions extraites: 2
             # my_airtable_api     | INFO:Interventions data extracted: {'interventions': [<Intervention: Intervention object (3)>, <Intervention: Intervention object (7)>]}
             # my_airtable_api     | INFO:Mission data extracted: {'id': None, 'remarque': '', 'priorite': 'URGENTE', 'vehicule': <Vehicule: Renault Clio>, 'client': <Client: Samy Samy>}
-            create_taches(mission_interventions, client, vehicule)
+            create_taches(mission_interventions, client, vehicule, erreurs)
             messages.success(request, f'Mission créée avec succès pour le client {client.prenom} {client.nom}!')
             return redirect('list_view')
     
     except ValidationError as ve:
-        logging.error(f"Validation error: {ve.message}")
-        return render_with_error_handling(request, 'new_mission.html', {
-            'erreurs': erreurs,
-            'valeurs': request.POST.dict(),
-            'clients': Client.objects.all(),
-            'vehicules': Vehicule.objects.all(),
-            'interventions': Intervention.objects.all(),
-            'priorites': [(choix.name, choix.value) for choix in Priorite],
-            'taux': [(choix.name, choix.value) for choix in Taux] 
-            })
+        logger.error("Validation error: %s", ve.message)
+        return render_with_error_handling(request, 'new_mission.html', _mission_form_context(
+            request.POST.dict(), erreurs
+        ))
     
     except Exception as e:
-        logging.error(f"Error creating mission: {e}")
+        logger.error("Error creating mission: %s", e)
         # Variable pour gérer l'affichage du template d'erreur
         return render(request, 'error.html', {
             'error': str(e),
@@ -108,6 +131,7 @@ def post_mission_form_view(request):
             'error_type': 'template_render_error'
         })
 
+@query_budget(10)
 @login_required
 def get_update_mission_view(request, mission_id):
     """Fonction pour afficher le formulaire de mise à jour d'une mission existante.
@@ -129,7 +153,7 @@ def get_update_mission_view(request, mission_id):
     mission_intervention_list = get_all_mission_intervention_by_id(mission_id)
     mission = get_mission_by_id(mission_id)
     if not mission:
-        logging.error(f"Mission with id {mission_id} does not exist.")
+        logger.error("Mission with id %s does not exist.", mission_id)
         return render_with_error_handling(request, 'error.html', {
             'error':  f"Mission with id {mission_id} does not exist.",
             'template_error': True,
@@ -158,7 +182,6 @@ def get_update_mission_view(request, mission_id):
             'client': mission.client,
         },
         'mission_intervention_list': mission_intervention_display,
-        'interventions': Intervention.objects.all(),
         'priorites': [(choix.name, choix.value) for choix in Priorite],
         'taux': [(choix.name, choix.value) for choix in Taux],
         'erreurs': erreurs,
@@ -184,7 +207,7 @@ def post_update_mission_view(request, mission_id):
     mission_intervention_list = get_all_mission_intervention_by_id(mission_id)
     mission = get_mission_by_id(mission_id)
     if not mission:
-        logging.error(f"Mission with id {mission_id} does not exist.")
+        logger.error("Mission with id %s does not exist.", mission_id)
         return render_with_error_handling(request, 'error.html', {
             'error': str(e),
             'template_error': True,
@@ -224,7 +247,7 @@ def post_update_mission_view(request, mission_id):
         messages.success(request, f'Mission mise à jour avec succès!')
         return redirect('list_view')
     except ValidationError as ve:
-        logging.warning(f"Validation error: {ve}")
+        logger.warning("Validation error: %s", ve)
         return render_with_error_handling(request, 'update_mission.html', {
             'erreurs': erreurs,
             'valeurs': request.POST.dict(),
@@ -236,12 +259,11 @@ def post_update_mission_view(request, mission_id):
                 'client': mission.client,
             },
             'mission_intervention_list': mission_intervention_display,
-            'interventions': Intervention.objects.all(),
             'priorites': [(choix.name, choix.value) for choix in Priorite],
             'taux': [(choix.name, choix.value) for choix in Taux],
         })
     except Exception as e:
-        logging.error(f"Error updating GLOBAL: {e}")
+        logger.error("Error updating GLOBAL: %s", e)
         return render(request, 'error.html', {
             'error': str(e),
             'template_error': True,
@@ -264,7 +286,7 @@ def delete_mission_view(request, mission_id):
         return redirect('list_view')
     
     # Debug pour vérifier les données de la requête
-    logging.info(f"Requête de suppression pour mission {mission_id}")
+    logger.info("Requête de suppression pour mission %s", mission_id)
     
     try:
         from my_airtable_api.utils.crud import delete_mission
@@ -273,20 +295,20 @@ def delete_mission_view(request, mission_id):
         result = delete_mission(mission_id)
         
         if result['success']:
-            logging.info(f"Mission {mission_id} supprimée avec succès par l'utilisateur")
+            logger.info("Mission %s supprimée avec succès par l'utilisateur", mission_id)
             # Créer un message de succès pour l'afficher dans la liste
             messages.success(request, f"Mission {mission_id} supprimée avec succès. "
                            f"{result['nb_interventions_supprimees']} intervention(s) associée(s) supprimée(s).")
             
             return redirect('list_view')
         else:
-            logging.error(f"Échec de la suppression de la mission {mission_id}: {result.get('message', 'Erreur inconnue')}")
+            logger.error("Échec de la suppression de la mission %s: %s", mission_id, result.get('message', 'Erreur inconnue'))
             return render_with_error_handling(request, 'error.html', {
                 'error': f"Impossible de supprimer la mission: {result.get('message', 'Erreur inconnue')}"
             })
             
     except ValidationError as ve:
-        logging.error(f"Erreur de validation lors de la suppression de la mission {mission_id}: {ve}")
+        logger.error("Erreur de validation lors de la suppression de la mission %s: %s", mission_id, ve)
         return render_with_error_handling(request, 'error.html', {
             'error': str(ve),
             'template_error': True,
@@ -294,13 +316,69 @@ def delete_mission_view(request, mission_id):
         })
         
     except Exception as e:
-        logging.error(f"Erreur inattendue lors de la suppression de la mission {mission_id}: {e}")
+        logger.error("Erreur inattendue lors de la suppression de la mission %s: %s", mission_id, e)
         return render_with_error_handling(request, 'error.html', {
             'error': str(e),
             'template_error': True,
             'error_type': 'template_render_error'
         })
 
+@query_budget(12)
+@login_required
+def delete_missions_view(request):
+    """Vue pour supprimer plusieurs missions en une seule requête.
+
+    Les missions sont désignées par le champ `missions` (IDs séparés par des virgules, ou répétés),
+    ou, si `filtre` vaut 1, par les filtres de la liste envoyés avec le formulaire.
+
+    Args:
+        request (HttpRequest): La requête HTTP POST
+
+    Returns:
+        HttpResponse: Redirection vers la liste des missions, avec le bilan de la suppression
+    """
+    if request.method != 'POST':
+        # Seules les requêtes POST sont autorisées pour la suppression
+        return redirect('list_view')
+
+    from my_airtable_api.utils.crud import delete_missions
+    from my_airtable_api.utils.filters import get_filters, has_active_filter
+
+    mission_ids = None
+    filters = None
+    valeurs = [valeur.strip() for champ in request.POST.getlist('missions') for valeur in champ.split(',') if valeur.strip()]
+    if valeurs:
+        if not all(valeur.isdigit() for valeur in valeurs):
+            messages.error(request, "Identifiants de missions invalides.")
+            return redirect('list_view')
+        mission_ids = valeurs
+    if request.POST.get('filtre') == '1':
+        filters = get_filters(request.POST)
+        if not has_active_filter(filters):
+            # Sans filtre actif, toutes les missions seraient supprimées
+            messages.error(request, "Aucun filtre actif : la suppression de toutes les missions est refusée.")
+            return redirect('list_view')
+    if mission_ids is None and filters is None:
+        messages.error(request, "Aucune mission sélectionnée.")
+        return redirect('list_view')
+
+    try:
+        result = delete_missions(mission_ids, filters)
+    except ValidationError as ve:
+        logger.error("Erreur lors de la suppression en masse des missions : %s", ve)
+        return render_with_error_handling(request, 'error.html', {
+            'error': str(ve),
+            'template_error': True,
+            'error_type': 'template_render_error'
+        })
+
+    logger.info("%s mission(s) supprimée(s) par l'utilisateur %s", result['nb_missions_supprimees'], request.user.username)
+    messages.success(request, f"{result['nb_missions_supprimees']} mission(s) supprimée(s). "
+                     f"{result['nb_interventions_supprimees']} intervention(s) associée(s) supprimée(s).")
+    if result['introuvables']:
+        messages.warning(request, f"Missions introuvables : {', '.join(map(str, result['introuvables']))}.")
+    return redirect('list_view')
+
 @login_required
 def create_intervention_view(request):
     """Vue pour créer une nouvelle intervention.
@@ -342,7 +420,14 @@ def update_intervention_view(request, intervention_id):
     if request.method == 'POST':
         form = InterventionForm(request.POST, instance=intervention)
         if form.is_valid():
-            intervention = form.save()
+            with transaction.atomic():
+                intervention = form.save()
+                if {'prix_unitaire', 'forfait'} & set(form.changed_data):
+                    # Les coûts des lignes existantes suivent le nouveau tarif (résumés compris)
+                    reprice_interventions([intervention.id])
+                if 'libelle' in form.changed_data:
+                    # Le libellé apparaît dans les résumés des missions qui utilisent l'intervention
+                    refresh_mission_summaries(intervention.missions.values_list('id', flat=True))
             messages.success(request, f'Intervention "{intervention.libelle}" modifiée avec succès!')
             return redirect('list_interventions_view')
     else:
@@ -368,7 +453,8 @@ def delete_intervention_view(request, intervention_id):
     """
     # Sécurité : seules les requêtes POST sont autorisées
     if request.method != 'POST':
-        logging.warning(f"Tentative de suppression d'intervention {intervention_id} avec méthode {request.method} par utilisateur {request.user.username}")
+        logger.warning("Tentative de suppression d'intervention %s avec méthode %s par utilisateur %s",
+                       intervention_id, request.method, request.user.username)
         messages.error(request, "Méthode non autorisée pour la suppression.")
         return redirect('list_interventions_view')
     
@@ -383,8 +469,8 @@ def delete_intervention_view(request, intervention_id):
             nb_missions = missions_liees.count()
             missions_ids = list(missions_liees.values_list('id', flat=True))
             
-            logging.warning(f"Tentative de suppression d'intervention {intervention_id} ({intervention_name}) "
-                          f"liée à {nb_missions} mission(s) (IDs: {missions_ids}) par utilisateur {request.user.username}")
+            logger.warning("Tentative de suppression d'intervention %s (%s) liée à %s mission(s) (IDs: %s) par utilisateur %s",
+                           intervention_id, intervention_name, nb_missions, missions_ids, request.user.username)
             
             messages.error(request, 
                 f'Impossible de supprimer l\'intervention "{intervention_name}". '
@@ -397,8 +483,8 @@ def delete_intervention_view(request, intervention_id):
             intervention.delete()
             
             # Logging de sécurité pour audit
-            logging.info(f"Intervention {intervention_id} ({intervention_name}) supprimée avec succès "
-                        f"par utilisateur {request.user.username} depuis IP {request.META.get('REMOTE_ADDR', 'inconnue')}")
+            logger.info("Intervention %s (%s) supprimée avec succès par utilisateur %s depuis IP %s",
+                        intervention_id, intervention_name, request.user.username, request.META.get('REMOTE_ADDR', 'inconnue'))
             
             messages.success(request, f'Intervention "{intervention_name}" supprimée avec succès!')
             
@@ -406,8 +492,8 @@ def delete_intervention_view(request, intervention_id):
         
     except Exception as e:
         # Logging d'erreur pour audit de sécurité
-        logging.error(f"Erreur lors de la suppression de l'intervention {intervention_id} "
-                     f"par utilisateur {request.user.username}: {str(e)}")
+        logger.error("Erreur lors de la suppression de l'intervention %s par utilisateur %s: %s",
+                     intervention_id, request.user.username, e)
         
         messages.error(request, 
             'Une erreur est survenue lors de la suppression. '
@@ -1,180 +1,317 @@
 from django.shortcuts import render
-from django.shortcuts import render
 import logging
-logging.basicConfig(level=logging.INFO, format='%(levelname)s:%(message)s')
-from django.db.models import Q
-from datetime import datetime
 from django.contrib.auth.decorators import login_required
 from django.forms.models import model_to_dict
+from django.db.models import Sum
+from django.http import Http404, StreamingHttpResponse, HttpResponseBadRequest
 
-from ..models import Client, Vehicule, MissionIntervention, Priorite
+from ..models import Client, Vehicule, Mission, MissionSummary, Priorite
 from my_airtable_api.utils.error_manage import render_with_error_handling
 from my_airtable_api.utils.crud import get_all_mission_intervention_by_id, get_mission_by_id, get_all_interventions
+from my_airtable_api.utils.filters import get_filters, filter_missions
+from my_airtable_api.utils.pagination import KeysetPaginator, get_page_size, cursor_querystring
+from my_airtable_api.utils.cache import list_view_cache, normalize_filters
+from my_airtable_api.utils.aggregates import StringConcat
+from my_airtable_api.utils.export import EXPORT_FORMATS, stream_export
+from my_airtable_api.utils.query_budget import query_budget
+from my_airtable_api.db.router import read_only_view
+
+logger = logging.getLogger(__name__)
+
+ONGLETS = ('missions', 'vehicules', 'clients')
+
+
+def _page_links(request, onglet, tab):
+    """Construit les chaînes de requête vers les pages suivante et précédente d'un onglet."""
+    param = f'curseur_{onglet}'
+    return {
+        f'{onglet}_suivant': cursor_querystring(request.GET, param, tab['next_cursor'], onglet=onglet),
+        f'{onglet}_precedent': cursor_querystring(request.GET, param, tab['previous_cursor'], onglet=onglet),
+    }
+
+
+def _tab(rows, page):
+    """Regroupe les lignes d'une page et ses curseurs (valeur mise en cache)."""
+    return {'rows': rows, 'next_cursor': page.next_cursor, 'previous_cursor': page.previous_cursor}
+
+
+def _mission_row(summary):
+    """Convertit un résumé de mission en ligne de l'onglet missions."""
+    return {
+        'id': summary.mission_id,
+        'date_demande': summary.date_demande,
+        'remarque': summary.remarque,
+        'priorite': summary.priorite.replace('_', ' ').title(),
+        'taux': summary.taux.title(),
+        'vehicule': summary.vehicule_libelle,
+        'client': summary.client_libelle,
+        'cout_total': summary.cout_total,
+        'duree_supplementaire': summary.duree_supplementaire,
+        'interventions': summary.interventions_libelles,
+        'nb_lignes': summary.nb_lignes,
+    }
+
+
+def _vehicule_row(vehicule):
+    """Convertit un véhicule (client chargé) en ligne de l'onglet véhicules."""
+    return {
+        'id': vehicule.id,
+        'marque': vehicule.marque,
+        'modele': vehicule.modele,
+        'immatriculation': vehicule.immatriculation,
+        'numero_serie': vehicule.numero_serie,
+        'mise_circulation': vehicule.mise_circulation,
+        'kilometrage': vehicule.kilometrage,
+        'remarque': vehicule.remarque,
+        'client_id': vehicule.client_id,
+        'client': f"{vehicule.client.nom} {vehicule.client.prenom}",
+        'vo': vehicule.vo,
+        'boite_vitesse': vehicule.boite_vitesse,
+        'carburant': vehicule.carburant,
+        'missions': {}
+    }
+
+
+def _client_row(client):
+    """Convertit un client en ligne de l'onglet clients."""
+    return {
+        'id': client.id,
+        'nom': client.nom,
+        'prenom': client.prenom,
+        'email': client.email,
+        'societe': client.societe,
+        'telephone': client.telephone,
+        'adresse': client.adresse,
+        'code_postal': client.code_postal,
+        'ville': client.ville,
+        'vehicules': []
+    }
+
+
+def _vehicules_missions_query(vehicule_ids, filters):
+    """Une ligne par mission des véhicules de la page : total et interventions agrégés par la base."""
+    return filter_missions(
+        Mission.objects.filter(vehicule_id__in=vehicule_ids), filters
+    ).order_by('date_demande', 'id').values('id', 'vehicule_id', 'date_demande', 'priorite').annotate(
+        cout_total=Sum('missionintervention__cout_total', default=0),
+        interventions=StringConcat('missionintervention__intervention__libelle', ordering='missionintervention__id'),
+    )
+
+
+def _clients_vehicules_query(client_ids):
+    """Les véhicules des clients de la page, joints sur client_id (et non sur "nom prénom")."""
+    return Vehicule.objects.filter(client_id__in=client_ids).order_by('marque', 'modele', 'id').values(
+        'client_id', 'marque', 'modele'
+    )
+
+
+def _missions_tab(filters, cursor, page_size):
+    """Construit une page de l'onglet missions, paginée sur (date_demande, id).
+
+    La page est lue dans la seule table MissionSummary, tenue à jour à chaque écriture.
+
+    Args:
+        filters (dict): Les filtres de la liste.
+        cursor (str): Le curseur de la page demandée.
+        page_size (int): Le nombre de missions par page.
+
+    Returns:
+        dict: Les missions de la page et les curseurs voisins.
+    """
+    summaries_query = filter_missions(MissionSummary.objects.all(), filters)
+    page = KeysetPaginator(summaries_query, ('date_demande', 'mission_id'), page_size).page(cursor)
+
+    missions = [_mission_row(summary) for summary in page]
+    return _tab(missions, page)
+
+
+def _vehicules_tab(filters, cursor, page_size):
+    """Construit une page de l'onglet véhicules, paginée sur (marque, modele, id).
+
+    Args:
+        filters (dict): Les filtres de la liste, appliqués aux missions des véhicules.
+        cursor (str): Le curseur de la page demandée.
+        page_size (int): Le nombre de véhicules par page.
+
+    Returns:
+        dict: Les véhicules de la page et les curseurs voisins.
+    """
+    vehicules_query = Vehicule.objects.select_related('client')
+    page = KeysetPaginator(vehicules_query, ('marque', 'modele', 'id'), page_size).page(cursor)
+
+    vehicules_group = {vehicule.id: _vehicule_row(vehicule) for vehicule in page}
+
+    # Une ligne par mission des véhicules de la page : total et interventions agrégés par la base
+    missions = _vehicules_missions_query(vehicules_group.keys(), filters)
+    for mission in missions:
+        vehicules_group[mission.pop('vehicule_id')]['missions'][mission['id']] = mission
+
+    for vehicule in vehicules_group.values():
+        vehicule['missions'] = list(vehicule['missions'].values())
+    return _tab(list(vehicules_group.values()), page)
+
+
+def _clients_tab(filters, cursor, page_size):
+    """Construit une page de l'onglet clients, paginée sur (nom, prenom, id).
+
+    Args:
+        filters (dict): Les filtres de la liste (non utilisés par cet onglet).
+        cursor (str): Le curseur de la page demandée.
+        page_size (int): Le nombre de clients par page.
+
+    Returns:
+        dict: Les clients de la page et les curseurs voisins.
+    """
+    page = KeysetPaginator(Client.objects.all(), ('nom', 'prenom', 'id'), page_size).page(cursor)
+
+    clients_group = {client.id: _client_row(client) for client in page}
+
+    # Jointure sur client_id (et non sur "nom prénom") pour les seuls clients de la page
+    for vehicule in _clients_vehicules_query(clients_group.keys()):
+        clients_group[vehicule['client_id']]['vehicules'].append(vehicule)
+
+    return _tab(list(clients_group.values()), page)
+
+
+TAB_BUILDERS = {
+    'missions': _missions_tab,
+    'vehicules': _vehicules_tab,
+    'clients': _clients_tab,
+}
+
+
+def _tab_request(request, onglet):
+    """Lit les paramètres d'un onglet dans la requête.
+
+    Args:
+        request (HttpRequest): La requête HTTP contenant les filtres et le curseur.
+        onglet (str): L'onglet demandé.
 
+    Returns:
+        tuple: (filtres, curseur, taille de page, clé de cache de l'onglet).
+    """
+    filters = get_filters(request.GET)
+    page_size = get_page_size(request.GET)
+    cursor = request.GET.get(f'curseur_{onglet}', '')
+
+    # L'onglet clients ne dépend pas des filtres
+    key_filters = normalize_filters(filters) if onglet != 'clients' else ()
+    key = list_view_cache.make_key(onglet, key_filters, cursor, page_size)
+    return filters, cursor, page_size, key
+
+
+def _tab_render_context(request, onglet, filters, tab):
+    """Construit le contexte de rendu d'un onglet à partir de ses données."""
+    return {
+        onglet: tab['rows'],
+        **_page_links(request, onglet, tab),
+        'onglet': onglet,
+        # Valeurs actuelles des filtres
+        'filter_client': filters['client'],
+        'filter_vehicule': filters['vehicule'],
+        'filter_priorite': filters['priorite'],
+        'filter_date_debut': filters['date_debut'],
+        'filter_date_fin': filters['date_fin'],
+    }
+
+
+def _tab_context(request, onglet):
+    """Construit le contexte d'un seul onglet de la liste.
+
+    Les données de l'onglet sont lues dans le cache des résultats filtrés, indexé par
+    l'onglet, le tuple normalisé des filtres, le curseur et la taille de page.
+
+    Args:
+        request (HttpRequest): La requête HTTP contenant les filtres et le curseur.
+        onglet (str): L'onglet à construire ('missions', 'vehicules' ou 'clients').
+
+    Returns:
+        tuple: Le contexte de l'onglet avec les filtres courants, et True si les données venaient du cache.
+    """
+    filters, cursor, page_size, key = _tab_request(request, onglet)
+    tab, hit = list_view_cache.get_or_compute(key, lambda: TAB_BUILDERS[onglet](filters, cursor, page_size))
+    return _tab_render_context(request, onglet, filters, tab), hit
+
+
+@query_budget(6)
 @login_required
+@read_only_view
 def list_view(request):
     """Affiche la liste des missions, véhicules et clients avec filtrage.
 
+    Seul l'onglet affiché (paramètre `onglet`, missions par défaut) est calculé ;
+    les autres sont chargés à la demande par `list_tab_view`. Chaque onglet est
+    paginé par curseur.
+
     Args:
         request (HttpRequest): La requête HTTP contenant les paramètres de filtrage.
 
     Returns:
         HttpResponse: La réponse HTTP contenant le rendu du template avec les données filtrées.
     """
-    # Récupération des paramètres de filtrage
-    filter_client = request.GET.get('client-filtrage', '')
-    filter_vehicule = request.GET.get('vehicule-filtrage', '')
-    filter_priorite = request.GET.get('priorite-filtrage', '')
-    filter_date_debut = request.GET.get('date_debut', '')
-    filter_date_fin = request.GET.get('date_fin', '')
-    
-    # Construction de la requête avec filtres
-    missions_interventions_query = MissionIntervention.objects.select_related(
-        'mission', 'mission__vehicule', 'mission__client', 'intervention'
-    )
-    
-    # Q -> permet d’écrire des filtres avec des conditions "OU" (|) et "NON" (~), ou de combiner plusieurs conditions.
-    # Application des filtres
-    if filter_client:
-        missions_interventions_query = missions_interventions_query.filter(
-            Q(mission__client__nom__icontains=filter_client) | 
-            Q(mission__client__prenom__icontains=filter_client)
-        )
-    
-    if filter_vehicule:
-        missions_interventions_query = missions_interventions_query.filter(
-            Q(mission__vehicule__marque__icontains=filter_vehicule) |
-            Q(mission__vehicule__modele__icontains=filter_vehicule) |
-            Q(mission__vehicule__immatriculation__icontains=filter_vehicule)
-        )
-    
-    if filter_priorite:
-        missions_interventions_query = missions_interventions_query.filter(
-            mission__priorite=filter_priorite
-        )
-    
-    if filter_date_debut:
-        try:
-            date_debut = datetime.strptime(filter_date_debut, '%Y-%m-%d').date()
-            missions_interventions_query = missions_interventions_query.filter(
-                mission__date_demande__date__gte=date_debut
-            )
-        except ValueError:
-            pass  # Ignorer les dates mal formatées
-    
-    if filter_date_fin:
-        try:
-            date_fin = datetime.strptime(filter_date_fin, '%Y-%m-%d').date()
-            missions_interventions_query = missions_interventions_query.filter(
-                mission__date_demande__date__lte=date_fin
-            )
-        except ValueError:
-            pass  # Ignorer les dates mal formatées
-    
-    missions_interventions = missions_interventions_query.all().order_by('mission__date_demande')
-    
-    missions_group = {}
-    for mi in missions_interventions:
-        mission = mi.mission
-        mission_id = mission.id
-        if mission_id not in missions_group:
-            missions_group[mission_id] = {
-                'id': mission.id,
-                'date_demande': mission.date_demande,
-                'remarque': mission.remarque,
-                'priorite': mission.priorite.replace('_', ' ').title(),
-                'taux': mi.taux.title(),
-                'vehicule': f"{mission.vehicule.marque} {mission.vehicule.modele} {mission.vehicule.immatriculation}",
-                'client': f"{mission.client.nom} {mission.client.prenom}",
-                'cout_total': mi.cout_total,
-                'duree_supplementaire': mi.duree_supplementaire,
-                'interventions': []
-            }
-        missions_group[mission_id]['interventions'].append({
-            'libelle': mi.intervention.libelle,
-            'prix_unitaire': mi.intervention.prix_unitaire,
-        })
-        
-        
-    missions = list(missions_group.values())
-    
-    # Récupération de la table Véhicule avec les relations nécessaires
-    vehicules = Vehicule.objects.all().order_by('marque', 'modele')
-    vehicules_group = {}
-    for vehicule in vehicules:
-        vehicules_group[vehicule.id] = {
-            'id': vehicule.id,
-            'marque': vehicule.marque,
-            'modele': vehicule.modele,
-            'immatriculation': vehicule.immatriculation,
-            'numero_serie': vehicule.numero_serie,
-            'mise_circulation': vehicule.mise_circulation,
-            'kilometrage': vehicule.kilometrage,
-            'remarque': vehicule.remarque,
-            'client': f"{vehicule.client.nom} {vehicule.client.prenom}",
-            'vo': vehicule.vo,
-            'boite_vitesse': vehicule.boite_vitesse,
-            'carburant': vehicule.carburant
-        }
-        for mi in missions_interventions:
-            if mi.mission.vehicule.id == vehicule.id:
-                vehicules_group[vehicule.id]['missions'] = vehicules_group[vehicule.id].get('missions', [])
-                vehicules_group[vehicule.id]['missions'].append({
-                    'id': mi.mission.id,
-                    'date_demande': mi.mission.date_demande,
-                    'priorite': mi.mission.priorite,
-                    'cout_total': mi.cout_total,
-                    'interventions': [
-                        {
-                            'libelle': mi.intervention.libelle
-                        }
-                    ]
-                })
-    vehicules = list(vehicules_group.values())  
-    
-    # Récupération de la table Client
-    clients = Client.objects.all().order_by('nom', 'prenom')
-    clients_group = {}
-    for client in clients:
-        clients_group[client.id] = {
-            'id': client.id,
-            'nom': client.nom,
-            'prenom': client.prenom,
-            'email': client.email,
-            'societe': client.societe,
-            'telephone': client.telephone,
-            'adresse': client.adresse,
-            'code_postal': client.code_postal,
-            'ville': client.ville,
-            'vehicules': []
-        }
-        for vehicule in vehicules:
-            if vehicule['client'] == f"{client.nom} {client.prenom}":
-                clients_group[client.id]['vehicules'].append(vehicule)
-    clients = list(clients_group.values())
-    
-    # Préparation des données pour les filtres
-    all_clients = Client.objects.all().order_by('nom', 'prenom')
-    all_vehicules = Vehicule.objects.all().order_by('marque', 'modele')
-    priorites_choices = [(choix.name, choix.value) for choix in Priorite]
-    
-    return render(request, 'list-view.html', {
-        'missions': missions,
-        'vehicules': vehicules,
-        'clients': clients,
-        # Données pour les filtres
-        'all_clients': all_clients,
-        'all_vehicules': all_vehicules,
-        'priorites_choices': priorites_choices,
-        # Valeurs actuelles des filtres
-        'filter_client': filter_client,
-        'filter_vehicule': filter_vehicule,
-        'filter_priorite': filter_priorite,
-        'filter_date_debut': filter_date_debut,
-        'filter_date_fin': filter_date_fin,
-        })
+    onglet = request.GET.get('onglet')
+    if onglet not in ONGLETS:
+        onglet = 'missions'
+
+    context, hit = _tab_context(request, onglet)
+    # Données pour les filtres
+    context['priorites_choices'] = [(choix.name, choix.value) for choix in Priorite]
+    response = render(request, 'list-view.html', context)
+    response['X-List-Cache'] = 'HIT' if hit else 'MISS'
+    return response
+
+
+@query_budget(5)
+@login_required
+@read_only_view
+def list_tab_view(request, onglet):
+    """Retourne le fragment HTML d'un onglet de la liste, chargé à la demande.
+
+    Args:
+        request (HttpRequest): La requête HTTP contenant les filtres et le curseur.
+        onglet (str): L'onglet demandé ('missions', 'vehicules' ou 'clients').
+
+    Raises:
+        Http404: Si l'onglet est inconnu.
+
+    Returns:
+        HttpResponse: Le fragment HTML du tableau de l'onglet.
+    """
+    if onglet not in ONGLETS:
+        raise Http404(f"Onglet inconnu : {onglet}")
+    context, hit = _tab_context(request, onglet)
+    response = render(request, f'partials/{onglet}_list.html', context)
+    response['X-List-Cache'] = 'HIT' if hit else 'MISS'
+    return response
+
+
+@query_budget(2)
+@login_required
+def export_missions_view(request):
+    """Exporte en flux les lignes des missions filtrées comme dans la liste.
+
+    Le format est choisi par le paramètre `format` ('csv' par défaut, 'jsonl' ou 'xlsx').
+    Le budget ne couvre que la préparation de la réponse (session, utilisateur) : les requêtes
+    du flux, proportionnelles au nombre de lignes, sont comptées à part.
+
+    Args:
+        request (HttpRequest): La requête HTTP contenant les paramètres de filtrage.
+
+    Returns:
+        StreamingHttpResponse: Le fichier exporté, envoyé au fur et à mesure de la lecture.
+    """
+    export_format = request.GET.get('format', 'csv')
+    if export_format not in EXPORT_FORMATS:
+        return HttpResponseBadRequest(f"Format d'export inconnu : {export_format}")
+
+    content_type, extension = EXPORT_FORMATS[export_format]
+    response = StreamingHttpResponse(stream_export(get_filters(request.GET), export_format), content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="missions.{extension}"'
+    return response
     
+@query_budget(10)
 @login_required
+@read_only_view
 def show_mission_view(request, mission_id):
     """Affiche les détails d'une mission spécifique.
 
@@ -187,7 +324,7 @@ def show_mission_view(request, mission_id):
     """
     mission = get_mission_by_id(mission_id)
     if not mission:
-        logging.error(f"Mission with id {mission_id} does not exist.")
+        logger.error("Mission with id %s does not exist.", mission_id)
         return render_with_error_handling(request, 'error.html', {
             'error': f"Mission with id {mission_id} does not exist.",
             'template_error': True,
@@ -201,7 +338,7 @@ def show_mission_view(request, mission_id):
     mission_intervention = [model_to_dict(intervention) for intervention in mission_intervention]
     mission = model_to_dict(mission)
 
-    logging.info(f"Mission data retrieved for id {mission_id}: {mission}")
+    logger.debug("Mission data retrieved for id %s", mission_id)
     return render(request, 'show_mission.html', {
         'mission': mission,
         'client': client,
@@ -209,7 +346,9 @@ def show_mission_view(request, mission_id):
         'mission_intervention': mission_intervention
     })
     
+@query_budget(3)
 @login_required
+@read_only_view
 def list_interventions_view(request):
     """Affiche la liste des interventions.
 
@@ -0,0 +1,24 @@
+from django.http import HttpResponse, HttpResponseForbidden
+
+from my_airtable_api.utils.metrics import collect, metrics_settings, registry, render_prometheus
+from my_airtable_api.utils.query_budget import query_budget
+
+
+@query_budget(0)
+def metrics_view(request):
+    """Expose les métriques de tous les workers au format texte de Prometheus.
+
+    Réservé aux adresses de METRICS['ALLOWED_IPS'] (le Prometheus local) : aucune authentification.
+
+    Args:
+        request (HttpRequest): La requête HTTP du collecteur.
+
+    Returns:
+        HttpResponse: Les métriques, ou une réponse 403 pour une autre adresse.
+    """
+    config = metrics_settings()
+    if request.META.get('REMOTE_ADDR') not in config['ALLOWED_IPS']:
+        return HttpResponseForbidden()
+    # Les mesures du worker qui répond sont à jour ; celles des autres datent de FLUSH_INTERVAL au plus
+    registry.flush(config['DIRECTORY'])
+    return HttpResponse(render_prometheus(collect(config['DIRECTORY'])), content_type='text/plain; version=0.0.4; charset=utf-8')
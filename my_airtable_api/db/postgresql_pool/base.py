@@ -0,0 +1,78 @@
+"""
+Backend PostgreSQL avec pool de connexions par processus
+
+Identique au backend PostgreSQL de Django, mais les connexions sont empruntées à un pool
+(my_airtable_api.utils.pool) au lieu d'être ouvertes, et lui sont rendues au lieu d'être fermées.
+Avec CONN_MAX_AGE à 0, Django « ferme » la connexion à chaque fin de requête : elle retourne
+simplement dans le pool. Le pool se règle par la clé POOL de la base dans DATABASES :
+
+    'POOL': {'MAX_SIZE': 10, 'TIMEOUT': 10, 'MAX_IDLE': 300, 'MAX_LIFETIME': 3600, 'CHECK_AFTER': 30}
+
+Chaque worker a son propre pool : prévoir MAX_SIZE au moins égal à son nombre de threads.
+Le backend n'est utilisé que si DB_POOL=1 ; par défaut, le backend PostgreSQL de Django est utilisé.
+"""
+from django.db.backends.postgresql import base
+
+from my_airtable_api.utils import pool
+
+# État de transaction libpq (psycopg2 et psycopg 3)
+TRANSACTION_IDLE = 0
+TRANSACTION_UNKNOWN = 4
+
+
+def _check(connection, requete):
+    """Indique si une connexion est utilisable ; avec `requete`, l'interroge par un SELECT 1."""
+    if connection.closed:
+        return False
+    if not requete:
+        return connection.info.transaction_status != TRANSACTION_UNKNOWN
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        if connection.info.transaction_status != TRANSACTION_IDLE:
+            connection.rollback()
+    except base.Database.Error:
+        return False
+    return True
+
+
+def _reset(connection):
+    """Annule la transaction laissée ouverte par la requête précédente."""
+    status = connection.info.transaction_status
+    if status == TRANSACTION_UNKNOWN:
+        raise base.Database.OperationalError("état de connexion inconnu")
+    if status != TRANSACTION_IDLE:
+        connection.rollback()
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    @property
+    def pool_key(self):
+        # La base de test remplace NAME : ses connexions ne doivent pas se mêler à celles de la base principale
+        return f"{self.alias}/{self.settings_dict['NAME']}"
+
+    def _create_pool(self):
+        config = {key.lower(): value for key, value in self.settings_dict.get('POOL', {}).items()}
+        return pool.ConnectionPool(self.pool_key, check=_check, reset=_reset, **config)
+
+    @property
+    def connection_pool(self):
+        return pool.get_pool(self.pool_key, self._create_pool)
+
+    def get_new_connection(self, conn_params):
+        return self.connection_pool.checkout(lambda: super(DatabaseWrapper, self).get_new_connection(conn_params))
+
+    def _close(self):
+        if self.connection is None:
+            return
+        with self.wrap_database_errors:
+            if self.in_atomic_block:
+                # Django garde la référence jusqu'à la fin du bloc : la connexion ne doit pas être prêtée entre-temps
+                self.connection_pool.discard(self.connection)
+            else:
+                self.connection_pool.checkin(self.connection)
+
+    def close_pool(self):
+        # Appelée avant DROP/CREATE DATABASE … TEMPLATE et au changement de fuseau horaire
+        super().close_pool()
+        self.connection_pool.close_idle()
@@ -0,0 +1,225 @@
+"""
+Lectures sur les réplicas PostgreSQL pour les vues en lecture seule
+
+Les vues décorées par `@read_only_view` lisent sur un réplica sain ; tout le reste (écritures,
+autres vues, sessions et authentification) reste sur la base principale. Un réplica est écarté
+lorsque son retard de réplication dépasse REPLICAS['MAX_LAG'] secondes ou qu'il ne répond pas ;
+le retard est mesuré au plus toutes les REPLICAS['LAG_CHECK_INTERVAL'] secondes par processus.
+
+Un client qui vient d'écrire (requête POST, ou écriture pendant la requête) reçoit un cookie
+qui le garde sur la base principale pendant REPLICAS['STICKY_SECONDS'] secondes : il relit
+toujours ses propres écritures.
+"""
+import contextvars
+import logging
+import random
+import threading
+import time
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+logger = logging.getLogger(__name__)
+
+STICKY_COOKIE = 'db_primary'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# Base de lecture de la vue en cours (None : base principale)
+_read_alias = contextvars.ContextVar('read_alias', default=None)
+# État de la requête en cours, partagé avec les threads de sync_to_async : {'wrote': bool}
+_request_state = contextvars.ContextVar('request_state', default=None)
+
+# Retard de réplication (en secondes, None si injoignable) pour les bases PostgreSQL
+LAG_SQL = {
+    'postgresql': (
+        "SELECT CASE WHEN NOT pg_is_in_recovery() "
+        "OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+        "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+    ),
+}
+
+
+def replica_settings():
+    """Retourne la configuration des réplicas, complétée des valeurs par défaut."""
+    config = getattr(settings, 'REPLICAS', {})
+    return {
+        'ALIASES': list(config.get('ALIASES', [])),
+        'MAX_LAG': config.get('MAX_LAG', 5.0),
+        'STICKY_SECONDS': config.get('STICKY_SECONDS', 5),
+        'LAG_CHECK_INTERVAL': config.get('LAG_CHECK_INTERVAL', 2.0),
+    }
+
+
+class ReplicaMonitor:
+    """Mesure périodiquement le retard des réplicas et choisit ceux qui peuvent servir les lectures."""
+
+    def __init__(self):
+        self._lags = {}
+        self._checked_at = {}
+        self._lock = threading.Lock()
+
+    def measure_lag(self, alias):
+        """Mesure le retard de réplication d'un réplica.
+
+        La requête passe par le curseur du pilote, hors des wrappers d'exécution de Django :
+        elle n'est pas comptée dans le budget de requêtes de la vue.
+
+        Args:
+            alias (str): L'alias du réplica.
+
+        Returns:
+            float: Le retard en secondes, ou None si le réplica ne répond pas.
+        """
+        connection = connections[alias]
+        sql = LAG_SQL.get(connection.vendor)
+        try:
+            connection.ensure_connection()
+            if sql is None:
+                # Autres moteurs (SQLite en test) : pas de réplication à mesurer
+                return 0.0
+            with connection.connection.cursor() as cursor:
+                cursor.execute(sql)
+                lag = cursor.fetchone()[0]
+            return float(lag or 0)
+        except Exception as e:
+            logger.warning("Réplica %s injoignable : %s", alias, e)
+            connection.close()
+            return None
+
+    def lag(self, alias, interval):
+        """Retourne le dernier retard mesuré, en le mesurant de nouveau après `interval` secondes."""
+        now = time.monotonic()
+        if now - self._checked_at.get(alias, float('-inf')) >= interval:
+            lag = self.measure_lag(alias)
+            with self._lock:
+                self._lags[alias] = lag
+                self._checked_at[alias] = now
+            if lag is not None and lag > replica_settings()['MAX_LAG']:
+                logger.warning("Réplica %s écarté : %.1f s de retard", alias, lag)
+        return self._lags.get(alias)
+
+    def healthy(self):
+        """Retourne les réplicas joignables dont le retard est acceptable."""
+        config = replica_settings()
+        return [
+            alias for alias in config['ALIASES']
+            if (lag := self.lag(alias, config['LAG_CHECK_INTERVAL'])) is not None and lag <= config['MAX_LAG']
+        ]
+
+    def choose(self):
+        """Retourne l'alias d'un réplica sain, ou None s'il faut lire sur la base principale."""
+        healthy = self.healthy()
+        return random.choice(healthy) if healthy else None
+
+    def stats(self):
+        """Retourne le dernier retard mesuré par réplica (None : injoignable)."""
+        with self._lock:
+            return dict(self._lags)
+
+
+replica_monitor = ReplicaMonitor()
+
+
+def current_read_alias():
+    """Retourne le réplica utilisé par la vue en cours, ou None (base principale)."""
+    return _read_alias.get()
+
+
+def _mark_write():
+    state = _request_state.get()
+    if state is not None:
+        state['wrote'] = True
+
+
+class ReplicaRouter:
+    """Envoie les lectures des vues en lecture seule vers le réplica choisi, le reste vers la base principale."""
+
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        _mark_write()
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Les réplicas contiennent les mêmes données que la base principale
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Les réplicas reçoivent le schéma par la réplication
+        if db in replica_settings()['ALIASES']:
+            return False
+        return None
+
+
+def _use_primary(request):
+    return request.method not in SAFE_METHODS or STICKY_COOKIE in request.COOKIES
+
+
+def read_only_view(view_func):
+    """Fait lire la vue sur un réplica sain, sauf pour un client qui vient d'écrire.
+
+    Args:
+        view_func (callable): La vue, synchrone ou asynchrone ; elle ne doit pas écrire en base.
+
+    Returns:
+        callable: La vue dont les lectures sont routées vers un réplica.
+    """
+    if iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def wrapper(request, *args, **kwargs):
+            alias = None if _use_primary(request) else await sync_to_async(replica_monitor.choose)()
+            token = _read_alias.set(alias)
+            try:
+                return await view_func(request, *args, **kwargs)
+            finally:
+                _read_alias.reset(token)
+    else:
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            alias = None if _use_primary(request) else replica_monitor.choose()
+            token = _read_alias.set(alias)
+            try:
+                return view_func(request, *args, **kwargs)
+            finally:
+                _read_alias.reset(token)
+    return wrapper
+
+
+class PrimaryStickinessMiddleware:
+    """Pose le cookie qui garde sur la base principale un client qui vient d'écrire."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sticky_seconds = replica_settings()['STICKY_SECONDS']
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state = {'wrote': False}
+        token = _request_state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_state.reset(token)
+        return self._finish(request, response, state)
+
+    async def __acall__(self, request):
+        state = {'wrote': False}
+        token = _request_state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _request_state.reset(token)
+        return self._finish(request, response, state)
+
+    def _finish(self, request, response, state):
+        if self.sticky_seconds and (state['wrote'] or request.method not in SAFE_METHODS):
+            response.set_cookie(STICKY_COOKIE, '1', max_age=self.sticky_seconds, httponly=True, samesite='Lax')
+        return response
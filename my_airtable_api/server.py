@@ -0,0 +1,320 @@
+"""
+Serveur WSGI de production : processus pré-forkés, application préchargée, caches chauds
+
+Le processus maître charge l'application et la prépare (résolveur d'URL, templates, catalogue
+des interventions) avant d'ouvrir le port. Il forke ensuite les workers, qui héritent de ces
+imports et de ces caches. Chaque worker sert les connexions du socket partagé avec un pool de
+threads de taille fixe.
+
+Signaux du maître :
+    SIGTERM, SIGINT : arrêt gracieux (les requêtes en cours se terminent).
+    SIGHUP : redémarrage gracieux des workers, un par un.
+
+Un worker qui meurt ou qui atteint `max_requests` est remplacé. Seule la bibliothèque standard
+et le serveur HTTP de Django sont utilisés : aucun service externe n'est nécessaire.
+"""
+import logging
+import os
+import signal
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.core.servers.basehttp import WSGIRequestHandler, WSGIServer
+from django.core.wsgi import get_wsgi_application
+from django.db import connections
+from django.template.loader import get_template
+from django.urls import get_resolver
+
+from my_airtable_api.utils.metrics import clear_directory, registry
+
+logger = logging.getLogger(__name__)
+
+WORKERS = 2
+THREADS = 8
+BACKLOG = 128
+GRACEFUL_TIMEOUT = 30
+# Un worker est recyclé après ce nombre de requêtes (0 : jamais)
+MAX_REQUESTS = 0
+
+# Backends de cache dont le contenu n'est pas partagé entre les workers
+PROCESS_LOCAL_CACHE_BACKENDS = {'django.core.cache.backends.locmem.LocMemCache'}
+
+
+def load_application():
+    """Charge l'application WSGI, comme runserver (fichiers statiques servis en DEBUG).
+
+    Returns:
+        callable: L'application WSGI.
+    """
+    application = get_wsgi_application()
+    if settings.DEBUG and 'django.contrib.staticfiles' in settings.INSTALLED_APPS:
+        from django.contrib.staticfiles.handlers import StaticFilesHandler
+        application = StaticFilesHandler(application)
+    return application
+
+
+def is_process_local_cache(alias):
+    """Indique si un alias de cache est propre à chaque processus (invisible des autres workers).
+
+    Args:
+        alias (str): L'alias du cache Django.
+
+    Returns:
+        bool: True pour LocMemCache.
+    """
+    return settings.CACHES[alias]['BACKEND'] in PROCESS_LOCAL_CACHE_BACKENDS
+
+
+def _template_names():
+    """Liste les templates des dossiers du projet et des applications."""
+    dossiers = [Path(dossier) for config in settings.TEMPLATES for dossier in config.get('DIRS', [])]
+    # Les templates de django.contrib (admin…) sont chargés à la demande
+    dossiers += [Path(app.path) / 'templates' for app in apps.get_app_configs() if not app.name.startswith('django.')]
+    noms = set()
+    for dossier in dossiers:
+        if dossier.is_dir():
+            noms.update(str(chemin.relative_to(dossier)) for chemin in dossier.rglob('*.html'))
+    return sorted(noms)
+
+
+def warm_up():
+    """Prépare les caches du processus avant les premières requêtes.
+
+    Returns:
+        dict: Le nombre d'éléments préparés par cache.
+    """
+    resolver = get_resolver()
+    # Le dictionnaire inverse (reverse, {% url %}) est construit à la première utilisation
+    urls = len(resolver.reverse_dict)
+
+    templates = 0
+    for nom in _template_names():
+        try:
+            get_template(nom)
+            templates += 1
+        except Exception as e:
+            logger.warning("Template %s non préchargé : %s", nom, e)
+
+    interventions = 0
+    try:
+        from my_airtable_api.utils.catalog import intervention_catalog
+        interventions = len(intervention_catalog.all())
+    except Exception as e:
+        # La base peut ne pas être prête au démarrage : le catalogue sera chargé à la première lecture
+        logger.warning("Catalogue des interventions non préchargé : %s", e)
+    finally:
+        # Les connexions ne doivent pas être partagées entre le maître et les workers
+        connections.close_all()
+
+    return {'urls': urls, 'templates': templates, 'interventions': interventions}
+
+
+class PooledWSGIServer(WSGIServer):
+    """Serveur WSGI de Django sur un socket hérité, avec un pool de threads de taille fixe."""
+
+    def __init__(self, sock, threads, max_requests=0):
+        """
+        Args:
+            sock (socket.socket): Le socket d'écoute partagé par les workers.
+            threads (int): Le nombre de threads qui traitent les requêtes.
+            max_requests (int, optional): Le nombre de requêtes avant recyclage (0 : jamais). Defaults to 0.
+        """
+        super().__init__(sock.getsockname()[:2], WSGIRequestHandler, bind_and_activate=False)
+        self.socket.close()
+        self.socket = sock
+        # Ce que fait server_bind(), sans lier de nouveau socket
+        host, port = sock.getsockname()[:2]
+        self.server_name = socket.getfqdn(host)
+        self.server_port = port
+        self.setup_environ()
+        self.max_requests = max_requests
+        self.requests = 0
+        self._executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='wsgi')
+        self._lock = threading.Lock()
+
+    def process_request(self, request, client_address):
+        with self._lock:
+            self.requests += 1
+            if self.max_requests and self.requests == self.max_requests:
+                logger.info("Worker %d : %d requêtes servies, recyclage", os.getpid(), self.requests)
+                threading.Thread(target=self.shutdown, daemon=True).start()
+        self._executor.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        # Attend la fin des requêtes en cours ; le socket d'écoute appartient au maître
+        self._executor.shutdown(wait=True)
+
+
+def run_worker(sock, application, threads, max_requests):
+    """Boucle d'un worker : sert les requêtes jusqu'à SIGTERM ou jusqu'à max_requests.
+
+    Args:
+        sock (socket.socket): Le socket d'écoute hérité du maître.
+        application (callable): L'application WSGI préchargée.
+        threads (int): Le nombre de threads du worker.
+        max_requests (int): Le nombre de requêtes avant recyclage (0 : jamais).
+    """
+    server = PooledWSGIServer(sock, threads, max_requests)
+    server.set_app(application)
+
+    def stop(signum, frame):
+        # shutdown() attend la fin de serve_forever : il doit être appelé depuis un autre thread
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGHUP, signal.SIG_IGN)
+    logger.info("Worker %d démarré (%d threads)", os.getpid(), threads)
+    server.serve_forever()
+    server.server_close()
+    logger.info("Worker %d arrêté après %d requête(s)", os.getpid(), server.requests)
+
+
+class PreforkServer:
+    """Processus maître : socket d'écoute, fork et supervision des workers."""
+
+    def __init__(self, application, host, port, workers=WORKERS, threads=THREADS, backlog=BACKLOG,
+                 graceful_timeout=GRACEFUL_TIMEOUT, max_requests=MAX_REQUESTS, stdout=print):
+        """
+        Args:
+            application (callable): L'application WSGI préchargée.
+            host (str): L'adresse d'écoute.
+            port (int): Le port d'écoute.
+            workers (int, optional): Le nombre de processus workers. Defaults to WORKERS.
+            threads (int, optional): Le nombre de threads par worker. Defaults to THREADS.
+            backlog (int, optional): La taille de la file d'attente du socket. Defaults to BACKLOG.
+            graceful_timeout (int, optional): Le délai laissé aux workers pour terminer (s). Defaults to GRACEFUL_TIMEOUT.
+            max_requests (int, optional): Le nombre de requêtes avant recyclage d'un worker. Defaults to MAX_REQUESTS.
+            stdout (callable, optional): La fonction d'affichage. Defaults to print.
+        """
+        self.application = application
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.threads = threads
+        self.backlog = backlog
+        self.graceful_timeout = graceful_timeout
+        self.max_requests = max_requests
+        self.stdout = stdout
+        self.children = {}
+        self.socket = None
+        self._stopping = False
+        self._reload = False
+
+    def spawn(self):
+        """Forke un worker et retourne son PID."""
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                run_worker(self.socket, self.application, self.threads, self.max_requests)
+            except Exception:
+                logger.exception("Worker %d interrompu par une erreur", os.getpid())
+                code = 1
+            finally:
+                # os._exit n'exécute pas atexit : les métriques et les logs en file sont écrits avant de sortir
+                try:
+                    registry.flush()
+                except OSError as e:
+                    logger.warning("Métriques du worker %d non écrites : %s", os.getpid(), e)
+                logging.shutdown()
+                os._exit(code)
+        self.children[pid] = time.monotonic()
+        return pid
+
+    def reap(self):
+        """Récupère les workers terminés et retourne leurs PID."""
+        morts = []
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            if self.children.pop(pid, None) is not None:
+                morts.append(pid)
+                if not self._stopping and os.waitstatus_to_exitcode(status) != 0:
+                    logger.warning("Worker %d terminé avec le code %d", pid, os.waitstatus_to_exitcode(status))
+        return morts
+
+    def stop_worker(self, pid, timeout):
+        """Demande l'arrêt gracieux d'un worker et le tue s'il dépasse le délai."""
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            return
+        limite = time.monotonic() + timeout
+        while pid in self.children and time.monotonic() < limite:
+            self.reap()
+            time.sleep(0.1)
+        if pid in self.children:
+            logger.warning("Worker %d toujours actif après %ds : arrêt forcé", pid, timeout)
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+            self.children.pop(pid, None)
+
+    def reload(self):
+        """Remplace les workers un par un : un nouveau worker démarre avant l'arrêt de l'ancien."""
+        for pid in list(self.children):
+            self.spawn()
+            self.stop_worker(pid, self.graceful_timeout)
+        self.stdout(f"{self.workers} worker(s) redémarré(s)")
+
+    def _handle_stop(self, signum, frame):
+        self._stopping = True
+
+    def _handle_reload(self, signum, frame):
+        self._reload = True
+
+    def run(self):
+        """Ouvre le socket, démarre les workers et les supervise jusqu'à l'arrêt."""
+        family = socket.AF_INET6 if ':' in self.host else socket.AF_INET
+        self.socket = socket.create_server((self.host, self.port), family=family, backlog=self.backlog)
+        # Les fichiers de métriques d'un démarrage précédent seraient additionnés aux nouveaux
+        clear_directory()
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+        signal.signal(signal.SIGHUP, self._handle_reload)
+
+        for _ in range(self.workers):
+            self.spawn()
+        self.stdout(f"Écoute sur http://{self.host}:{self.port} "
+                    f"({self.workers} worker(s) x {self.threads} thread(s), PID maître {os.getpid()})")
+
+        while not self._stopping:
+            time.sleep(0.5)
+            self.reap()
+            if self._reload:
+                self._reload = False
+                self.reload()
+            while not self._stopping and len(self.children) < self.workers:
+                self.spawn()
+
+        self.stdout("Arrêt gracieux des workers…")
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        limite = time.monotonic() + self.graceful_timeout
+        while self.children and time.monotonic() < limite:
+            self.reap()
+            time.sleep(0.1)
+        for pid in list(self.children):
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+        self.socket.close()
@@ -12,6 +12,8 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 
 from pathlib import Path
 import os
+import sys
+import tempfile
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -43,6 +45,11 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # En premier pour mesurer la durée complète des requêtes
+    'my_airtable_api.utils.metrics.MetricsMiddleware',
+    # Avant les sessions et l'authentification pour compter aussi leurs requêtes
+    'my_airtable_api.utils.query_budget.QueryBudgetMiddleware',
+    'my_airtable_api.db.router.PrimaryStickinessMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -50,13 +57,16 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # Inactif sauf si PROFILE_ENABLED=1
+    'my_airtable_api.utils.profiling.SamplingProfilerMiddleware',
 ]
 
 ROOT_URLCONF = 'my_airtable_api.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # DjangoTemplates, avec la durée de rendu de chaque template dans les métriques
+        'BACKEND': 'my_airtable_api.utils.metrics.TimedDjangoTemplates',
         'DIRS': [os.path.join(BASE_DIR, 'templates')],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -84,13 +94,122 @@ WSGI_APPLICATION = 'my_airtable_api.wsgi.application'
 # }
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        # Pool de connexions par worker (my_airtable_api.db.postgresql_pool) : activé par DB_POOL=1
+        'ENGINE': ('my_airtable_api.db.postgresql_pool' if os.environ.get('DB_POOL', '0') == '1'
+                   else 'django.db.backends.postgresql'),
         'NAME': os.environ.get('DJANGO_DB_NAME'),
         'USER': os.environ.get('DJANGO_DB_USER'),
         'PASSWORD': os.environ.get('DJANGO_DB_PASSWORD'),
         'HOST': os.environ.get('POSTGRES_HOST', 'db'),
         'PORT': os.environ.get('POSTGRES_PORT', '5432'),
+        'POOL': {
+            'MAX_SIZE': int(os.environ.get('DB_POOL_MAX_SIZE', 10)),
+            'TIMEOUT': float(os.environ.get('DB_POOL_TIMEOUT', 10)),
+            'MAX_IDLE': float(os.environ.get('DB_POOL_MAX_IDLE', 300)),
+            'MAX_LIFETIME': float(os.environ.get('DB_POOL_MAX_LIFETIME', 3600)),
+        },
+    }
+}
+
+# Réplicas en lecture (vues @read_only_view) : DB_REPLICA_HOSTS=hote1,hote2:5433
+REPLICAS = {
+    'ALIASES': [],
+    # Retard de réplication maximal toléré (s) avant d'écarter un réplica
+    'MAX_LAG': float(os.environ.get('DB_REPLICA_MAX_LAG', 5)),
+    # Durée pendant laquelle un client qui vient d'écrire lit sur la base principale (s)
+    'STICKY_SECONDS': int(os.environ.get('DB_REPLICA_STICKY_SECONDS', 5)),
+    'LAG_CHECK_INTERVAL': float(os.environ.get('DB_REPLICA_LAG_CHECK_INTERVAL', 2)),
+}
+for numero, adresse in enumerate(filter(None, os.environ.get('DB_REPLICA_HOSTS', '').split(',')), start=1):
+    hote, _, port = adresse.strip().partition(':')
+    DATABASES[f'replica{numero}'] = {
+        **DATABASES['default'],
+        'HOST': hote,
+        'PORT': port or DATABASES['default']['PORT'],
+        # En test, le réplica est la base de test principale
+        'TEST': {'MIRROR': 'default'},
     }
+    REPLICAS['ALIASES'].append(f'replica{numero}')
+DATABASE_ROUTERS = ['my_airtable_api.db.router.ReplicaRouter']
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# Le cache de la liste porte les numéros de version du cache des filtres et du catalogue des
+# interventions : il doit être partagé par tous les workers (backend fichier par défaut).
+# Un cache propre au processus (LIST_VIEW_CACHE_BACKEND=...LocMemCache) est réservé au
+# serveur de développement et à `serve --workers 1`.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'list_view': {
+        'BACKEND': os.environ.get('LIST_VIEW_CACHE_BACKEND', 'django.core.cache.backends.filebased.FileBasedCache'),
+        'LOCATION': os.environ.get('LIST_VIEW_CACHE_LOCATION', str(Path(tempfile.gettempdir()) / 'my_airtable_api_cache')),
+        'TIMEOUT': 300,
+        'OPTIONS': {
+            'MAX_ENTRIES': 2000,
+        },
+    },
+}
+
+# Cache des résultats filtrés de la liste des missions
+LIST_VIEW_CACHE = {
+    'ALIAS': 'list_view',
+    'MAX_ENTRIES': int(os.environ.get('LIST_VIEW_CACHE_MAX_ENTRIES', 1000)),
+    'TIMEOUT': int(os.environ.get('LIST_VIEW_CACHE_TIMEOUT', 300)),
+}
+
+# Durée maximale (s) de la copie locale du catalogue des interventions, même sans
+# changement de version (filet de sécurité si une invalidation est perdue)
+INTERVENTION_CATALOG_TTL = int(os.environ.get('INTERVENTION_CATALOG_TTL', 60))
+
+# Budgets de requêtes SQL par vue (@query_budget) : un dépassement lève une exception
+# en mode strict (tests) et produit un avertissement sinon
+QUERY_BUDGET_STRICT = os.environ.get('QUERY_BUDGET_STRICT', '1' if 'test' in sys.argv else '0') == '1'
+
+# Journalisation JSON écrite par un thread d'arrière-plan (my_airtable_api/utils/logs.py)
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
+# Un QuerySet passé en argument d'un log lève une erreur au lieu d'être masqué
+LOG_STRICT = os.environ.get('LOG_STRICT', '1' if 'test' in sys.argv else '0') == '1'
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'json': {'()': 'my_airtable_api.utils.logs.JsonFormatter'},
+        'text': {'format': '%(levelname)s:%(name)s:%(message)s'},
+    },
+    'handlers': {
+        'queue': {
+            '()': 'my_airtable_api.utils.logs.QueueHandler',
+            'formatter': os.environ.get('LOG_FORMAT', 'json'),
+        },
+    },
+    'root': {'handlers': ['queue'], 'level': LOG_LEVEL},
+    'loggers': {
+        # Remplace la configuration par défaut de Django (console en DEBUG, mails aux administrateurs)
+        'django': {'handlers': ['queue'], 'level': 'INFO', 'propagate': False},
+    },
+}
+
+# Profilage par échantillonnage (my_airtable_api/utils/profiling.py)
+PROFILING = {
+    'ENABLED': os.environ.get('PROFILE_ENABLED', '0') == '1',
+    # Fraction des requêtes profilées ; les utilisateurs staff peuvent aussi envoyer l'en-tête HEADER
+    'SAMPLE_RATE': float(os.environ.get('PROFILE_SAMPLE_RATE', 0.01)),
+    'HEADER': 'X-Profile',
+    'INTERVAL': float(os.environ.get('PROFILE_INTERVAL', 0.005)),
+    # Hors de l'arborescence du code (montée dans le conteneur)
+    'DIRECTORY': Path(os.environ.get('PROFILE_DIR', Path(tempfile.gettempdir()) / 'my_airtable_api_profiles')),
+    'MAX_FILES': int(os.environ.get('PROFILE_MAX_FILES', 200)),
+}
+
+# Métriques Prometheus exposées sur /metrics (my_airtable_api/utils/metrics.py)
+METRICS = {
+    # Un fichier par processus, additionnés par /metrics ; hors de l'arborescence du code
+    'DIRECTORY': Path(os.environ.get('METRICS_DIR', Path(tempfile.gettempdir()) / 'my_airtable_api_metrics')),
+    'FLUSH_INTERVAL': float(os.environ.get('METRICS_FLUSH_INTERVAL', 5)),
+    'ALLOWED_IPS': os.environ.get('METRICS_ALLOWED_IPS', '127.0.0.1,::1').split(','),
 }
 
 # Password validation
@@ -0,0 +1,49 @@
+"""
+Réglages des tests : deux bases SQLite locales, sans serveur PostgreSQL
+
+    python manage.py test --settings=my_airtable_api.settings_test
+
+La base `replica1` est un miroir de la base de test principale ; elle n'est déclarée comme
+réplica (REPLICAS['ALIASES']) que par les tests du routeur. La base `autre` est une base
+distincte, pour les écritures dirigées explicitement vers un autre alias (import --database).
+"""
+import tempfile
+
+from .settings import *  # noqa: F401,F403
+
+_TMP = Path(tempfile.gettempdir())
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': _TMP / 'my_airtable_api.sqlite3',
+        # Fichier plutôt que mémoire : le réplica miroir ouvre sa propre connexion
+        'TEST': {'NAME': _TMP / 'test_my_airtable_api.sqlite3'},
+    },
+    'replica1': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': _TMP / 'my_airtable_api.sqlite3',
+        'TEST': {'MIRROR': 'default'},
+    },
+    'autre': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': _TMP / 'my_airtable_api-autre.sqlite3',
+        'TEST': {'NAME': _TMP / 'test_my_airtable_api-autre.sqlite3'},
+    },
+}
+REPLICAS = {**REPLICAS, 'ALIASES': []}
+
+CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    'list_view': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'list_view-test'},
+}
+
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+QUERY_BUDGET_STRICT = True
+LOG_STRICT = True
+LOG_LEVEL = 'WARNING'
+LOGGING['root']['level'] = LOG_LEVEL
+
+METRICS = {**METRICS, 'DIRECTORY': _TMP / 'my_airtable_api-test-metrics'}
+PROFILING = {**PROFILING, 'ENABLED': False, 'DIRECTORY': _TMP / 'my_airtable_api-test-profiles'}
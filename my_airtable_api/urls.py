@@ -17,6 +17,7 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 from django.contrib.auth import views as auth_views
+from mission.views.metrics_views import metrics_view
 
 
 urlpatterns = [
@@ -24,4 +25,5 @@ urlpatterns = [
     path('missions/', include('mission.urls')),  
     path('', auth_views.LoginView.as_view(), name='login'),
     path('logout/', auth_views.LogoutView.as_view(), name='logout'),
+    path('metrics', metrics_view, name='metrics'),
 ]
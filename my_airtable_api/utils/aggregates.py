@@ -0,0 +1,46 @@
+"""
+Agrégats SQL communs aux différentes bases (PostgreSQL, SQLite)
+"""
+from django.db.models import Aggregate, F, TextField, Value
+
+
+class StringConcat(Aggregate):
+    """Concatène les valeurs d'un groupe avec un séparateur, côté base de données.
+
+    PostgreSQL : STRING_AGG(expression, séparateur ORDER BY tri).
+    SQLite : GROUP_CONCAT(expression, séparateur), dans l'ordre de parcours des lignes.
+    """
+    function = 'STRING_AGG'
+    name = 'StringConcat'
+    output_field = TextField()
+
+    def __init__(self, expression, separator=', ', ordering=None, **extra):
+        """
+        Args:
+            expression (str | Expression): La colonne à concaténer.
+            separator (str, optional): Le séparateur. Defaults to ', '.
+            ordering (str | Expression, optional): Le tri des valeurs (PostgreSQL). Defaults to None.
+        """
+        super().__init__(expression, Value(separator), **extra)
+        self.ordering = F(ordering) if isinstance(ordering, str) else ordering
+
+    def resolve_expression(self, query=None, allow_joins=True, reuse=None, summarize=False, for_save=False):
+        # Le tri est résolu avant l'agrégat, qui peut être enveloppé dans un Coalesce (paramètre default)
+        clone = self.copy()
+        if clone.ordering is not None:
+            clone.ordering = clone.ordering.resolve_expression(query, allow_joins, reuse, summarize)
+        return super(StringConcat, clone).resolve_expression(query, allow_joins, reuse, summarize, for_save)
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        if self.ordering is None:
+            return self.as_sql(compiler, connection, **extra_context)
+        ordering_sql, ordering_params = compiler.compile(self.ordering)
+        sql, params = self.as_sql(
+            compiler, connection,
+            template=f"%(function)s(%(distinct)s%(expressions)s ORDER BY {ordering_sql})",
+            **extra_context
+        )
+        return sql, (*params, *ordering_params)
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return self.as_sql(compiler, connection, function='GROUP_CONCAT', **extra_context)
@@ -0,0 +1,138 @@
+"""
+Recherche par préfixe pour l'autocomplétion du formulaire de mission
+
+Les recherches utilisent le lookup `istartswith` de Django et des index créés par la
+migration 0008_prefix_indexes pour la forme exacte du SQL généré : sur PostgreSQL
+`UPPER(col::text) LIKE UPPER('terme%')`, servi par un index d'expression text_pattern_ops ;
+sur SQLite `col LIKE 'terme%'`, servi par un index COLLATE NOCASE. Le nombre de résultats est toujours borné.
+
+Les interventions sont filtrées dans le catalogue en mémoire (catalog.intervention_catalog),
+sans requête SQL tant qu'il est à jour.
+"""
+import logging
+from django.db.models import Q
+from mission.models import Client, Vehicule
+from my_airtable_api.utils.catalog import intervention_catalog
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 50
+
+# En dessous, un préfixe sélectionne une trop grande part des clients ou des véhicules
+MIN_PREFIX_LENGTH = 2
+
+# Colonnes indexées par table
+PREFIX_COLUMNS = {
+    'mission_client': ('nom', 'prenom', 'email', 'telephone'),
+    'mission_vehicule': ('immatriculation', 'numero_serie'),
+}
+
+
+def get_limit(params, param='limite'):
+    """Lit le nombre de résultats demandé en le bornant entre 1 et MAX_LIMIT.
+
+    Args:
+        params (QueryDict): Les paramètres GET de la requête.
+        param (str, optional): Le nom du paramètre. Defaults to 'limite'.
+
+    Returns:
+        int: Le nombre maximal de résultats à retourner.
+    """
+    try:
+        limit = int(params.get(param, DEFAULT_LIMIT))
+    except (TypeError, ValueError):
+        return DEFAULT_LIMIT
+    return max(1, min(limit, MAX_LIMIT))
+
+
+def _prefix_filter(fields, term):
+    """Construit la condition « un des champs commence par le terme » (insensible à la casse)."""
+    condition = Q()
+    for field in fields:
+        condition |= Q(**{f'{field}__istartswith': term})
+    return condition
+
+
+def _results(rows, limit, label):
+    """Tronque les lignes à la limite et les met au format de la réponse JSON."""
+    rows = list(rows)
+    return {
+        'resultats': [{**row, 'label': label(row)} for row in rows[:limit]],
+        'tronque': len(rows) > limit,
+    }
+
+
+def _empty():
+    return {'resultats': [], 'tronque': False}
+
+
+def autocomplete_clients(term, limit=DEFAULT_LIMIT):
+    """Recherche les clients dont le nom, le prénom, l'email ou le téléphone commence par le terme.
+
+    Args:
+        term (str): Le préfixe saisi.
+        limit (int, optional): Le nombre maximal de résultats. Defaults to DEFAULT_LIMIT.
+
+    Returns:
+        dict: Les clients trouvés ('resultats') et si la liste est tronquée ('tronque').
+    """
+    term = term.strip()
+    if len(term) < MIN_PREFIX_LENGTH:
+        return _empty()
+    rows = (
+        Client.objects.filter(_prefix_filter(PREFIX_COLUMNS['mission_client'], term))
+        .order_by('nom', 'prenom', 'id')
+        .values('id', 'nom', 'prenom', 'email', 'telephone')[:limit + 1]
+    )
+    return _results(rows, limit, lambda row: f"{row['nom']} {row['prenom']} — {row['email']}")
+
+
+def autocomplete_vehicules(term, limit=DEFAULT_LIMIT, client_id=None):
+    """Recherche les véhicules dont l'immatriculation ou le numéro de série commence par le terme.
+
+    Si un client est donné, seuls ses véhicules sont retournés et le terme peut être vide.
+
+    Args:
+        term (str): Le préfixe saisi.
+        limit (int, optional): Le nombre maximal de résultats. Defaults to DEFAULT_LIMIT.
+        client_id (int, optional): Le client propriétaire des véhicules. Defaults to None.
+
+    Returns:
+        dict: Les véhicules trouvés ('resultats') et si la liste est tronquée ('tronque').
+    """
+    term = term.strip()
+    queryset = Vehicule.objects.all()
+    if client_id:
+        queryset = queryset.filter(client_id=client_id)
+    elif len(term) < MIN_PREFIX_LENGTH:
+        return _empty()
+    if term:
+        queryset = queryset.filter(_prefix_filter(PREFIX_COLUMNS['mission_vehicule'], term))
+    rows = queryset.order_by('marque', 'modele', 'id').values(
+        'id', 'marque', 'modele', 'immatriculation', 'numero_serie', 'client_id'
+    )[:limit + 1]
+    return _results(rows, limit, lambda row: f"{row['marque']} {row['modele']} ({row['immatriculation']})")
+
+
+def autocomplete_interventions(term, limit=DEFAULT_LIMIT):
+    """Recherche les interventions du catalogue dont le libellé commence par le terme.
+
+    Le catalogue est servi par la copie en mémoire du processus. Un terme vide retourne le début
+    du catalogue, par ordre alphabétique.
+
+    Args:
+        term (str): Le préfixe saisi.
+        limit (int, optional): Le nombre maximal de résultats. Defaults to DEFAULT_LIMIT.
+
+    Returns:
+        dict: Les interventions trouvées ('resultats') et si la liste est tronquée ('tronque').
+    """
+    prefix = term.strip().casefold()
+    interventions = sorted(
+        (intervention for intervention in intervention_catalog.all()
+         if intervention.libelle.casefold().startswith(prefix)),
+        key=lambda intervention: (intervention.libelle, intervention.id),
+    )
+    rows = [{'id': intervention.id, 'libelle': intervention.libelle} for intervention in interventions[:limit + 1]]
+    return _results(rows, limit, lambda row: row['libelle'])
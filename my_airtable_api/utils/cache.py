@@ -0,0 +1,213 @@
+"""
+Cache des résultats filtrés de la liste des missions
+
+Les entrées sont stockées dans un cache Django (mémoire locale ou fichiers) sous une clé
+qui inclut un compteur de génération. Toute écriture sur les modèles affichés incrémente
+ce compteur : les anciennes entrées ne sont plus jamais lues et finissent évincées.
+
+Une entrée calculée sur un réplica juste après une incrémentation peut ne pas contenir la
+dernière écriture : elle n'est pas enregistrée tant que le retard de réplication toléré
+(REPLICAS['MAX_LAG']) n'est pas écoulé.
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from my_airtable_api.db.router import current_read_alias, replica_settings
+from my_airtable_api.utils.metrics import CACHE_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+GENERATION_KEY = 'list_view:generation'
+BUMPED_AT_KEY = 'list_view:bumped_at'
+HITS_KEY = 'list_view:hits'
+MISSES_KEY = 'list_view:misses'
+
+
+def normalize_filters(filters):
+    """Retourne le tuple normalisé des filtres (client, véhicule, priorité, dates).
+
+    Args:
+        filters (dict): Les filtres retournés par get_filters.
+
+    Returns:
+        tuple: Les valeurs des filtres, en minuscules pour les recherches textuelles.
+    """
+    return (
+        filters['client'].lower(),
+        filters['vehicule'].lower(),
+        filters['priorite'],
+        filters['date_debut_parsed'].isoformat() if filters['date_debut_parsed'] else '',
+        filters['date_fin_parsed'].isoformat() if filters['date_fin_parsed'] else '',
+    )
+
+
+class FilterResultCache:
+    """Cache LRU borné des onglets de la liste, invalidé par compteur de génération."""
+
+    def __init__(self, alias, max_entries, timeout):
+        """
+        Args:
+            alias (str): L'alias du cache Django utilisé pour le stockage.
+            max_entries (int): Le nombre maximal d'entrées suivies par processus.
+            timeout (int): La durée de vie des entrées en secondes.
+        """
+        self.alias = alias
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def backend(self):
+        return caches[self.alias]
+
+    def generation(self):
+        """Retourne le compteur de génération courant (initialisé s'il a été évincé)."""
+        generation = self.backend.get(GENERATION_KEY)
+        if generation is None:
+            # Valeur initiale horodatée : une réinitialisation ne retombe jamais sur une ancienne génération
+            self.backend.add(GENERATION_KEY, time.time_ns(), timeout=None)
+            generation = self.backend.get(GENERATION_KEY)
+        return generation
+
+    def bump_generation(self):
+        """Incrémente le compteur de génération, invalidant toutes les entrées."""
+        try:
+            self.backend.incr(GENERATION_KEY)
+        except ValueError:
+            self.backend.add(GENERATION_KEY, time.time_ns(), timeout=None)
+        self.backend.set(BUMPED_AT_KEY, time.time(), timeout=None)
+
+    def _may_store(self):
+        """Indique si une valeur calculée par la requête en cours peut être enregistrée.
+
+        Une valeur lue sur un réplica moins de MAX_LAG secondes après une écriture peut
+        précéder cette écriture : l'enregistrer la servirait jusqu'à la prochaine invalidation.
+        """
+        if current_read_alias() is None:
+            return True
+        bumped_at = self.backend.get(BUMPED_AT_KEY)
+        return bumped_at is None or time.time() - bumped_at > replica_settings()['MAX_LAG']
+
+    def make_key(self, onglet, filters, *extra):
+        """Construit la clé d'une entrée à partir de l'onglet, des filtres et de la génération courante.
+
+        Args:
+            onglet (str): L'onglet concerné.
+            filters (tuple): Le tuple normalisé des filtres.
+            *extra: Les autres paramètres de la page (curseur, taille).
+
+        Returns:
+            str: La clé de cache.
+        """
+        payload = json.dumps([onglet, list(filters), list(extra)], separators=(',', ':'))
+        digest = hashlib.sha1(payload.encode()).hexdigest()
+        return f"list_view:{self.generation()}:{digest}"
+
+    def _count(self, key):
+        try:
+            self.backend.incr(key)
+        except ValueError:
+            self.backend.add(key, 1, timeout=None)
+
+    def get(self, key):
+        """Lit une entrée, ou None si elle est absente."""
+        value = self.backend.get(key)
+        with self._lock:
+            if value is not None and key in self._lru:
+                self._lru.move_to_end(key)
+        self._count(HITS_KEY if value is not None else MISSES_KEY)
+        CACHE_REQUESTS.inc(self.alias, 'hit' if value is not None else 'miss')
+        return value
+
+    def set(self, key, value):
+        """Enregistre une entrée en évinçant les moins récemment utilisées au-delà de la limite."""
+        with self._lock:
+            self._lru[key] = None
+            self._lru.move_to_end(key)
+            evicted = []
+            while len(self._lru) > self.max_entries:
+                evicted.append(self._lru.popitem(last=False)[0])
+        self.backend.set(key, value, timeout=self.timeout)
+        if evicted:
+            self.backend.delete_many(evicted)
+
+    def get_or_compute(self, key, compute):
+        """Retourne l'entrée en cache ou la calcule et l'enregistre.
+
+        Args:
+            key (str): La clé construite par make_key.
+            compute (callable): La fonction calculant la valeur en cas d'absence.
+
+        Returns:
+            tuple: (valeur, True si elle venait du cache).
+        """
+        value = self.get(key)
+        if value is not None:
+            return value, True
+        value = compute()
+        if self._may_store():
+            self.set(key, value)
+        return value, False
+
+    async def aget_or_compute(self, key, compute):
+        """Version asynchrone de get_or_compute, pour les vues ASGI.
+
+        Args:
+            key (str): La clé construite par make_key.
+            compute (callable): La coroutine calculant la valeur en cas d'absence.
+
+        Returns:
+            tuple: (valeur, True si elle venait du cache).
+        """
+        value = await sync_to_async(self.get)(key)
+        if value is not None:
+            return value, True
+        value = await compute()
+        if await sync_to_async(self._may_store)():
+            await sync_to_async(self.set)(key, value)
+        return value, False
+
+    def stats(self):
+        """Retourne les compteurs de succès et d'échecs du cache."""
+        hits = self.backend.get(HITS_KEY) or 0
+        misses = self.backend.get(MISSES_KEY) or 0
+        total = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / total if total else 0.0,
+            'entries': len(self._lru),
+        }
+
+
+list_view_cache = FilterResultCache(
+    alias=settings.LIST_VIEW_CACHE['ALIAS'],
+    max_entries=settings.LIST_VIEW_CACHE['MAX_ENTRIES'],
+    timeout=settings.LIST_VIEW_CACHE['TIMEOUT'],
+)
+
+
+def invalidate_list_cache(using='default'):
+    """Invalide le cache de la liste après validation de la transaction en cours.
+
+    Plusieurs écritures dans une même transaction ne provoquent qu'une seule incrémentation.
+
+    Args:
+        using (str, optional): L'alias de la base de données. Defaults to 'default'.
+    """
+    connection = transaction.get_connection(using)
+    if not connection.in_atomic_block:
+        list_view_cache.bump_generation()
+        return
+    if not any(callback[1] == list_view_cache.bump_generation for callback in connection.run_on_commit):
+        transaction.on_commit(list_view_cache.bump_generation, using=using)
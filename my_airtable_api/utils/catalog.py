@@ -0,0 +1,139 @@
+"""
+Cache en mémoire du catalogue des interventions
+
+Le catalogue change rarement mais il est lu à chaque validation de formulaire et à chaque
+affichage de la liste des interventions. Chaque processus en garde une copie, associée au
+numéro de version lu dans le cache partagé de la liste (fichiers par défaut, communs à tous les
+workers). Toute écriture sur une intervention incrémente ce numéro après validation de la
+transaction ; les autres processus rechargent le catalogue (une requête) à leur prochaine lecture.
+La copie locale est de toute façon rechargée après INTERVENTION_CATALOG_TTL secondes, au cas où
+une invalidation serait perdue (numéro évincé, écriture faite hors de l'ORM).
+
+Les objets retournés sont partagés entre les requêtes du processus : ils ne doivent pas être modifiés.
+"""
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, transaction
+from mission.models import Intervention
+from my_airtable_api.utils.metrics import CACHE_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = 'intervention_catalog:version'
+
+# Durée maximale de la copie locale (s), sauf réglage INTERVENTION_CATALOG_TTL
+TTL = 60
+
+
+class InterventionCatalog:
+    """Copie locale au processus du catalogue des interventions, invalidée par numéro de version."""
+
+    def __init__(self, alias):
+        """
+        Args:
+            alias (str): L'alias du cache Django qui porte le numéro de version partagé.
+        """
+        self.alias = alias
+        self._version = None
+        self._loaded_at = 0.0
+        self._by_id = {}
+        self._ordered = []
+        self._lock = threading.Lock()
+
+    @property
+    def backend(self):
+        return caches[self.alias]
+
+    def version(self):
+        """Retourne le numéro de version partagé (initialisé s'il a été évincé)."""
+        version = self.backend.get(VERSION_KEY)
+        if version is None:
+            # Valeur initiale horodatée : une réinitialisation ne retombe jamais sur une ancienne version
+            self.backend.add(VERSION_KEY, time.time_ns(), timeout=None)
+            version = self.backend.get(VERSION_KEY)
+        return version
+
+    def bump_version(self):
+        """Incrémente le numéro de version : tous les processus rechargeront le catalogue."""
+        try:
+            self.backend.incr(VERSION_KEY)
+        except ValueError:
+            self.backend.add(VERSION_KEY, time.time_ns(), timeout=None)
+
+    def _fresh(self, version):
+        ttl = getattr(settings, 'INTERVENTION_CATALOG_TTL', TTL)
+        return version == self._version and time.monotonic() - self._loaded_at < ttl
+
+    def _load(self):
+        """Recharge le catalogue si la version locale n'est plus la version partagée ou a expiré."""
+        version = self.version()
+        if self._fresh(version):
+            CACHE_REQUESTS.inc('intervention_catalog', 'hit')
+            return self._by_id, self._ordered
+        with self._lock:
+            if not self._fresh(version):
+                CACHE_REQUESTS.inc('intervention_catalog', 'miss')
+                # Toujours sur la base principale : un réplica en retard figerait un catalogue périmé
+                ordered = list(Intervention.objects.using(DEFAULT_DB_ALIAS).order_by('id'))
+                self._by_id = {intervention.id: intervention for intervention in ordered}
+                self._ordered = ordered
+                self._version = version
+                self._loaded_at = time.monotonic()
+                logger.info("Catalogue des interventions rechargé : %d intervention(s), version %s",
+                            len(ordered), version)
+            return self._by_id, self._ordered
+
+    def all(self):
+        """Retourne toutes les interventions du catalogue, par identifiant croissant.
+
+        Returns:
+            list: Les objets Intervention.
+        """
+        return list(self._load()[1])
+
+    def get(self, intervention_id):
+        """Retourne une intervention par son identifiant.
+
+        Args:
+            intervention_id (int): L'identifiant de l'intervention.
+
+        Returns:
+            Intervention: L'intervention, ou None si elle n'existe pas.
+        """
+        return self._load()[0].get(intervention_id)
+
+    def in_bulk(self, intervention_ids):
+        """Équivalent de QuerySet.in_bulk, servi par le catalogue.
+
+        Args:
+            intervention_ids (iterable): Les identifiants recherchés.
+
+        Returns:
+            dict: {identifiant: Intervention} pour les identifiants trouvés.
+        """
+        by_id = self._load()[0]
+        return {intervention_id: by_id[intervention_id] for intervention_id in intervention_ids
+                if intervention_id in by_id}
+
+
+intervention_catalog = InterventionCatalog(alias=settings.LIST_VIEW_CACHE['ALIAS'])
+
+
+def invalidate_catalog(using='default'):
+    """Invalide le catalogue des interventions après validation de la transaction en cours.
+
+    Plusieurs écritures dans une même transaction ne provoquent qu'une seule incrémentation.
+
+    Args:
+        using (str, optional): L'alias de la base de données. Defaults to 'default'.
+    """
+    connection = transaction.get_connection(using)
+    if not connection.in_atomic_block:
+        intervention_catalog.bump_version()
+        return
+    if not any(callback[1] == intervention_catalog.bump_version for callback in connection.run_on_commit):
+        transaction.on_commit(intervention_catalog.bump_version, using=using)
@@ -1,7 +1,77 @@
 import logging
-from mission.models import Client, Vehicule, Intervention, Mission, MissionIntervention
+from mission.models import Client, Vehicule, Mission, MissionIntervention
 from my_airtable_api.utils.extract_data import ValidationError
-from django.db import transaction
+from my_airtable_api.utils.summary import refresh_mission_summaries
+from my_airtable_api.utils.cache import invalidate_list_cache
+from my_airtable_api.utils.catalog import intervention_catalog
+from my_airtable_api.utils.filters import filter_missions, has_active_filter
+from my_airtable_api.utils.pricing import CENTIME, to_decimal
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from django.db import IntegrityError, router, transaction
+from django.db.models import Count, Q
+
+logger = logging.getLogger(__name__)
+
+# Champs d'une ligne de mission modifiables depuis le formulaire
+MISSION_INTERVENTION_FIELDS = ['taux', 'cout_total', 'duree_supplementaire']
+
+# Nombre de missions supprimées par requête DELETE lors d'une suppression en masse
+DELETE_CHUNK_SIZE = 500
+
+
+# Contraintes d'unicité vérifiées par la base -> (section d'erreurs, champ, message du formulaire)
+UNIQUE_ERRORS = {
+    Client: [(('email',), 'client', 'email', "Un client avec cet email existe déjà")],
+    Vehicule: [(('numero_serie',), 'vehicule', 'numero_serie', "Un véhicule avec ce numéro de série existe déjà")],
+    Mission: [(('vehicule', 'client'), 'mission', 'vehicule_client', "Ce véhicule est déjà associé à une mission pour ce client")],
+}
+
+
+def _unique_violation(error, model, fields):
+    """Indique si une IntegrityError provient de la contrainte d'unicité portant sur `fields`.
+
+    PostgreSQL détaille la clé en double (« Key (col, ...)=(...) »), SQLite liste les colonnes
+    (« UNIQUE constraint failed: table.col, ... »).
+    """
+    table = model._meta.db_table
+    columns = [model._meta.get_field(field).column for field in fields]
+    message = str(error)
+    if f"({', '.join(columns)})=" in message:
+        return True
+    return all(f"{table}.{column}" in message for column in columns)
+
+
+@contextmanager
+def unique_errors(model, erreurs, using='default'):
+    """Traduit les violations d'unicité d'une écriture en erreurs de formulaire.
+
+    Les doublons sont détectés par les contraintes de la base au moment de l'écriture, sans
+    lecture préalable : la détection reste exacte lorsque deux formulaires sont envoyés en même
+    temps. Dans une transaction, l'écriture est faite dans un savepoint : seul le savepoint est
+    annulé et la transaction englobante reste utilisable après la ValidationError (PostgreSQL
+    refuse toute requête dans une transaction interrompue par une erreur).
+
+    Args:
+        model (Model): Le modèle écrit (clé de UNIQUE_ERRORS).
+        erreurs (dict): Le dictionnaire des erreurs du formulaire.
+        using (str, optional): L'alias de la base de données. Defaults to 'default'.
+
+    Raises:
+        ValidationError: Si une contrainte d'unicité connue est violée.
+    """
+    in_transaction = transaction.get_connection(using).in_atomic_block
+    try:
+        with transaction.atomic(using=using) if in_transaction else nullcontext():
+            yield
+    except IntegrityError as e:
+        for fields, section, field, message in UNIQUE_ERRORS.get(model, []):
+            if _unique_violation(e, model, fields):
+                logger.warning("Doublon refusé par la base (%s.%s): %s", model.__name__, '/'.join(fields), e)
+                erreurs.setdefault(section, {})[field] = message
+                raise ValidationError("Erreur(s) dans le formulaire", details=erreurs)
+        raise
+
 
 def create_client(data, erreurs):
     """Crée un client à partir des données fournies.
@@ -19,18 +89,13 @@ def create_client(data, erreurs):
     
     try:
         data.pop('id', None)  # retire 'id' si déjà présent
-        # Vérification client déjà existant
-        if 'email' in data:
-            client = Client.objects.filter(email=data['email']).first()
-            if client:
-                erreurs['client']['email'] = "Un client avec cet email existe déjà"
-                raise ValidationError("Erreur(s) dans le formulaire", details=erreurs)
-            
-        client = Client.objects.create(**data)
-        logging.info(f"Client created: {client.nom} {client.prenom}")
+        # L'unicité de l'email est vérifiée par la contrainte unique_email
+        with unique_errors(Client, erreurs):
+            client = Client.objects.create(**data)
+        logger.info("Client created: %s %s", client.nom, client.prenom)
         return client
     except Exception as e:
-        logging.error(f"Error creating client: {e}")
+        logger.error("Error creating client: %s", e)
         raise
 
 def create_vehicule(data, client, erreurs):
@@ -49,28 +114,26 @@ def create_vehicule(data, client, erreurs):
     """
     try:
         data.pop('id', None)  # retire 'id' si déjà présent
-        vehicule = Vehicule.objects.filter(numero_serie=data.get('numero_serie')).first()
-        if vehicule:
-            erreurs['vehicule']['numero_serie'] = "Un véhicule avec ce numéro de série existe déjà"
-            raise ValidationError("Erreur(s) dans le formulaire", details=erreurs)
-            
         data.pop('client', None)  # retire 'client' si déjà présent
         data['client'] = client
         # vehicule.full_clean()
-        vehicule = Vehicule.objects.create(**data)
-        logging.info(f"Vehicle created for client {client.nom} {client.prenom}: {vehicule}")
+        # L'unicité du numéro de série est vérifiée par la base
+        with unique_errors(Vehicule, erreurs):
+            vehicule = Vehicule.objects.create(**data)
+        logger.info("Vehicle created for client %s %s: %s", client.nom, client.prenom, vehicule)
         return vehicule
     except Exception as e:
-        logging.error(f"Error creating vehicle: {e}")
+        logger.error("Error creating vehicle: %s", e)
         raise
 
-def create_taches(mission_interventions, client, vehicule):
+def create_taches(mission_interventions, client, vehicule, erreurs=None):
     """Crée les tâches (missions et interventions) à partir des données fournies.
 
     Args:
         mission_interventions (list): Liste des données des missions et interventions à créer.
         client (Client): L'objet client auquel les missions et interventions sont associées.
         vehicule (Vehicule): L'objet véhicule auquel les missions et interventions sont associées.
+        erreurs (dict, optional): Le dictionnaire des erreurs du formulaire. Defaults to None.
 
     Raises:
         ValidationError: Si des erreurs de validation sont détectées dans les données.
@@ -78,6 +141,7 @@ def create_taches(mission_interventions, client, vehicule):
     Returns:
         Mission: L'objet mission créé.
     """
+    erreurs = {} if erreurs is None else erreurs
     try:
         with transaction.atomic():
             # Création de la mission à partir du premier élément (toutes les interventions ont la même mission)
@@ -85,7 +149,7 @@ def create_taches(mission_interventions, client, vehicule):
             mission_data['client'] = client
             mission_data['vehicule'] = vehicule
 
-            mission = create_mission(mission_data, erreurs={})
+            mission = create_mission(mission_data, erreurs)
 
             # Création des liaisons mission-intervention
             mission_intervention_list = []
@@ -101,9 +165,14 @@ def create_taches(mission_interventions, client, vehicule):
 
             create_mission_interventions(mission_intervention_list, erreurs={})
 
+            # Mise à jour du résumé de la mission dans la même transaction
+            refresh_mission_summaries([mission.id])
+
         return mission
+    except ValidationError:
+        raise
     except Exception as e: 
-        logging.error(f"Error in create_taches: {e}")
+        logger.error("Error in create_taches: %s", e)
         raise ValidationError("Erreur lors de la création des tâches")
 
 def create_mission(mission_data, erreurs):
@@ -121,16 +190,19 @@ def create_mission(mission_data, erreurs):
         Mission: L'objet mission créé.
     """
     try:
-        logging.info(f"Type mission_data client: {type(mission_data.get('client'))}")
 
         fields = ['remarque', 'priorite', 'client', 'vehicule']
-        mission = Mission.objects.create(**{f: mission_data[f] for f in fields})
+        # Un seul couple véhicule/client par mission : contrainte unique_together
+        with unique_errors(Mission, erreurs):
+            mission = Mission.objects.create(**{f: mission_data[f] for f in fields})
 
-        logging.info(f"Mission created: {mission}")
+        logger.info("Mission created: %s", mission)
         
         return mission
+    except ValidationError:
+        raise
     except Exception as e:
-        logging.error(f"Error creating mission: {e}")
+        logger.error("Error creating mission: %s", e)
         raise ValidationError("Erreur lors de la création de la mission", details=erreurs)
     
 def create_mission_interventions(mission_interventions, erreurs):
@@ -144,11 +216,12 @@ def create_mission_interventions(mission_interventions, erreurs):
         ValidationError: Si des erreurs de validation sont détectées dans les données.
     """
     try:
-        for mi_data in mission_interventions:
-            MissionIntervention.objects.create(**mi_data)
-        logging.info("Mission interventions created successfully.")
+        # Une seule insertion pour toutes les lignes ; bulk_create ne déclenche pas les signaux
+        MissionIntervention.objects.bulk_create([MissionIntervention(**mi_data) for mi_data in mission_interventions])
+        invalidate_list_cache()
+        logger.info("Mission interventions created successfully.")
     except Exception as e:
-        logging.error(f"Error creating mission interventions: {e}")
+        logger.error("Error creating mission interventions: %s", e)
         raise ValidationError("Erreur lors de la création des interventions", details=erreurs)
 
 def update_client(data, erreurs):
@@ -168,12 +241,13 @@ def update_client(data, erreurs):
         for key, value in data.items():
             if value is not None and key != 'id':
                 setattr(client, key, value)
-        client.save()
-        logging.info(f"Client mis à jour : {client}")
+        with unique_errors(Client, erreurs):
+            client.save()
+        logger.info("Client mis à jour : %s", client)
         return client
     except Client.DoesNotExist:
         erreurs['client']['id'] = "Client introuvable."
-        logging.error(f"Client introuvable : id={data.get('id')}")
+        logger.error("Client introuvable : id=%s", data.get('id'))
 
 def update_vehicule(data, erreurs):
     """Met à jour les informations d'un véhicule.
@@ -193,15 +267,18 @@ def update_vehicule(data, erreurs):
             if value is not None and key != 'id':
                 setattr(vehicule, key, value)
         # vehicule.full_clean()
-        vehicule.save()
-        logging.info(f"Véhicule mis à jour : {vehicule}")
+        with unique_errors(Vehicule, erreurs):
+            vehicule.save()
+        logger.info("Véhicule mis à jour : %s", vehicule)
         return vehicule
     except Vehicule.DoesNotExist:
         erreurs['vehicule']['id'] = "Véhicule introuvable."
-        logging.error(f"Véhicule introuvable : id={data.get('id')}")
+        logger.error("Véhicule introuvable : id=%s", data.get('id'))
+    except ValidationError:
+        raise
     except Exception as e:
         erreurs['vehicule']['error'] = str(e)
-        logging.error(f"Erreur lors de la mise à jour du véhicule : {e}")
+        logger.error("Erreur lors de la mise à jour du véhicule : %s", e)
             
 def update_taches(data, erreurs):
     """Met à jour les tâches (mission, client, véhicule) à partir des données fournies.
@@ -224,10 +301,17 @@ def update_taches(data, erreurs):
 
             update_mission_interventions(data['mission_interventions'], mission)
 
+            # Les libellés client/véhicule apparaissent dans les résumés de toutes leurs missions
+            refresh_mission_summaries(
+                Mission.objects.filter(Q(id=mission.id) | Q(client=client) | Q(vehicule=vehicule)).values_list('id', flat=True)
+            )
+
             return mission
+    except ValidationError:
+        raise
     except Exception as e:
         erreurs['mission']['error'] = str(e)
-        logging.error(f"Erreur lors de la mise à jour des tâches : {e}")
+        logger.error("Erreur lors de la mise à jour des tâches : %s", e)
     
 def update_mission(data, erreurs):
     """Met à jour les informations d'une mission.
@@ -247,12 +331,13 @@ def update_mission(data, erreurs):
         mission.priorite = data.get('priorite')
         mission.vehicule = data.get('vehicule')
         mission.client = data.get('client')
-        mission.save()
-        logging.info(f"Mission mise à jour : {mission}")
+        with unique_errors(Mission, erreurs):
+            mission.save()
+        logger.info("Mission mise à jour : %s", mission)
         return mission
     except Mission.DoesNotExist:
         erreurs['mission']['id'] = "Mission introuvable."
-        logging.error(f"Mission introuvable : id={data.get('id')}")
+        logger.error("Mission introuvable : id=%s", data.get('id'))
     
 def update_mission_interventions(interventions_data, mission):
     """Met à jour les interventions liées à une mission.
@@ -263,28 +348,55 @@ def update_mission_interventions(interventions_data, mission):
 
     Returns:
         list: Liste des objets MissionIntervention mis à jour.
-    """    
-    try: 
-        MissionIntervention.objects.filter(mission=mission).delete()  # reset
-        
-        updated = []
 
-        for mi in interventions_data:
-            mi_obj = MissionIntervention.objects.create(
-                mission=mission,
-                intervention=mi['intervention'],
-                taux=mi['taux'],
-                cout_total=mi['cout_total'],
-                duree_supplementaire=mi.get('duree_supplementaire', 0.0)  # Ajout de la durée supplémentaire
-            )
-            updated.append(mi_obj)
+    Seules les différences avec les lignes existantes sont écrites : un bulk_create pour les
+    nouvelles lignes, un bulk_update pour les lignes modifiées et une suppression filtrée pour
+    les lignes retirées. Les lignes d'une même intervention sont appariées dans l'ordre : une
+    ligne existante n'est reprise qu'une fois, même si l'intervention est saisie plusieurs fois.
+    """
+    try:
+        existing = defaultdict(list)
+        for mi_obj in MissionIntervention.objects.filter(mission=mission).order_by('id'):
+            existing[mi_obj.intervention_id].append(mi_obj)
 
-        logging.info(f"{len(updated)} interventions liées à la mission recréées.")
-        logging.info(f"update_mission_interventions - Nouvelles interventions: {[mi.intervention.id for mi in updated]}")
-        return updated
+        lines, to_create, to_update = [], [], []
+        for mi in interventions_data:
+            values = {
+                'taux': mi['taux'],
+                'cout_total': to_decimal(mi['cout_total']).quantize(CENTIME),
+                'duree_supplementaire': to_decimal(mi.get('duree_supplementaire', 0.0)).quantize(CENTIME),  # Ajout de la durée supplémentaire
+            }
+            restantes = existing.get(mi['intervention'].id)
+            if not restantes:
+                mi_obj = MissionIntervention(mission=mission, intervention=mi['intervention'], **values)
+                to_create.append(mi_obj)
+            else:
+                mi_obj = restantes.pop(0)
+                actuelles = (mi_obj.taux, to_decimal(mi_obj.cout_total).quantize(CENTIME),
+                             to_decimal(mi_obj.duree_supplementaire).quantize(CENTIME))
+                if actuelles != tuple(values.values()):
+                    for field, value in values.items():
+                        setattr(mi_obj, field, value)
+                    to_update.append(mi_obj)
+            lines.append(mi_obj)
+
+        # Les lignes existantes qui n'ont pas été appariées sont retirées
+        removed = [mi_obj.id for restantes in existing.values() for mi_obj in restantes]
+        if removed:
+            MissionIntervention.objects.filter(id__in=removed).delete()
+        if to_create:
+            MissionIntervention.objects.bulk_create(to_create)
+        if to_update:
+            MissionIntervention.objects.bulk_update(to_update, MISSION_INTERVENTION_FIELDS)
+        # bulk_create et bulk_update ne déclenchent pas les signaux
+        invalidate_list_cache()
+
+        logger.info("update_mission_interventions - %d ajoutée(s), %d modifiée(s), %d supprimée(s)",
+                    len(to_create), len(to_update), len(removed))
+        return lines
     except Exception as e:
         raise ValidationError(f"Erreur lors de la mise à jour des interventions : {e}")
-        
+
 def intervention_get_by_id(intervention_id):
     """Récupère une intervention par son ID.
 
@@ -297,13 +409,44 @@ def intervention_get_by_id(intervention_id):
     Returns:
         Intervention: L'objet Intervention correspondant à l'ID.
     """
-    try:
-        intervention = Intervention.objects.get(id=intervention_id)
-        return intervention
-    except Intervention.DoesNotExist:
-        logging.error(f"Intervention with id {intervention_id} does not exist.")
+    intervention = intervention_catalog.get(int(intervention_id))
+    if intervention is None:
+        logger.error("Intervention with id %s does not exist.", intervention_id)
         raise ValidationError(f"Intervention with id {intervention_id} does not exist.")
+    return intervention
     
+def interventions_get_many(intervention_ids):
+    """Récupère plusieurs interventions depuis le catalogue en mémoire, dans l'ordre demandé.
+
+    Les identifiants en double ne sont retournés qu'une fois.
+
+    Args:
+        intervention_ids (iterable): Les identifiants des interventions (entiers ou chaînes).
+
+    Raises:
+        ValidationError: Si des interventions n'existent pas ; `details['missing']` les liste toutes.
+
+    Returns:
+        list: Les objets Intervention, dans l'ordre des identifiants reçus.
+    """
+    ids = []
+    missing = []
+    for intervention_id in intervention_ids:
+        value = str(intervention_id).strip()
+        if not value:
+            continue
+        if not value.isdigit():
+            missing.append(value)
+        elif int(value) not in ids:
+            ids.append(int(value))
+
+    interventions = intervention_catalog.in_bulk(ids)
+    missing += [str(intervention_id) for intervention_id in ids if intervention_id not in interventions]
+    if missing:
+        logger.error("Interventions introuvables : %s", ", ".join(missing))
+        raise ValidationError(f"Interventions with ids {', '.join(missing)} do not exist.", details={'missing': missing})
+    return [interventions[intervention_id] for intervention_id in ids]
+
 def get_client_by_id(client_id):
     """Récupère un client par son ID.
 
@@ -317,7 +460,7 @@ def get_client_by_id(client_id):
         client = Client.objects.get(id=client_id)
         return client
     except Client.DoesNotExist:
-        logging.error(f"Client with id {client_id} does not exist.")
+        logger.error("Client with id %s does not exist.", client_id)
         return None
     
 def get_vehicule_by_id(vehicule_id):
@@ -333,7 +476,7 @@ def get_vehicule_by_id(vehicule_id):
         vehicule = Vehicule.objects.get(id=vehicule_id)
         return vehicule
     except Vehicule.DoesNotExist:
-        logging.error(f"Vehicle with id {vehicule_id} does not exist.")
+        logger.error("Vehicle with id %s does not exist.", vehicule_id)
         return None
     
 def get_all_mission_intervention_by_id(mission_id):
@@ -347,27 +490,27 @@ def get_all_mission_intervention_by_id(mission_id):
     """
     try:
         missions_interventions = MissionIntervention.objects.filter(mission_id=mission_id).select_related('mission', 'intervention')
-        logging.info(f"Mission intervention found: {missions_interventions}")
+        logger.debug("Lignes d'intervention de la mission %s demandées", mission_id)
         return missions_interventions
     except MissionIntervention.DoesNotExist:
-        logging.error(f"Mission intervention with id {mission_id} does not exist.")
+        logger.error("Mission intervention with id %s does not exist.", mission_id)
         return None
     
 def get_all_interventions():
-    """Récupère toutes les interventions.
+    """Récupère toutes les interventions (depuis le catalogue en mémoire).
 
     Raises:
         ValidationError: Si une erreur survient lors de la récupération des interventions.
 
     Returns:
-        QuerySet: Un queryset contenant toutes les interventions.
+        list: La liste de toutes les interventions.
     """
     try:
-        interventions = Intervention.objects.all()
-        logging.info(f"All interventions retrieved: {interventions.count()} found.")
+        interventions = intervention_catalog.all()
+        logger.debug("All interventions retrieved: %d found.", len(interventions))
         return interventions
     except Exception as e:
-        logging.error(f"Error retrieving all interventions: {e}")
+        logger.error("Error retrieving all interventions: %s", e)
         raise ValidationError("Erreur lors de la récupération des interventions.")    
 
 def get_mission_by_id(mission_id):
@@ -381,12 +524,93 @@ def get_mission_by_id(mission_id):
     """
     try:
         mission = Mission.objects.get(id=mission_id)
-        logging.info(f"Mission found: {mission}")
+        logger.debug("Mission found: %s", mission_id)
         return mission
     except Mission.DoesNotExist:
-        logging.error(f"Mission with id {mission_id} does not exist.")
+        logger.error("Mission with id %s does not exist.", mission_id)
         return None
     
+def delete_missions(mission_ids=None, filters=None, chunk_size=DELETE_CHUNK_SIZE):
+    """Supprime plusieurs missions, désignées par leurs IDs et/ou par les filtres de la liste.
+
+    Les informations retournées sont lues avant la suppression en deux requêtes (les missions avec
+    leur client et leur véhicule, puis le nombre de lignes par mission). La suppression se fait
+    ensuite par lots d'IDs dans une seule transaction, avec le collecteur de Django : les lignes
+    et les résumés sont supprimés en cascade et les signaux post_delete sont envoyés. Le cache de
+    la liste n'est invalidé qu'une fois, à la validation de la transaction.
+
+    Args:
+        mission_ids (iterable, optional): Les IDs des missions à supprimer. Defaults to None.
+        filters (dict, optional): Les filtres retournés par get_filters. Defaults to None.
+        chunk_size (int, optional): Le nombre de missions supprimées par lot. Defaults to DELETE_CHUNK_SIZE.
+
+    Raises:
+        ValidationError: Si aucune mission n'est désignée, si un ID n'est pas numérique, si les
+            filtres ne contiennent aucun filtre actif, ou si une erreur survient lors de la suppression.
+
+    Returns:
+        dict: Les missions supprimées ('missions'), les IDs introuvables ('introuvables') et les totaux.
+    """
+    # Lectures et suppressions sur la base d'écriture, dans la même transaction
+    using = router.db_for_write(Mission)
+    queryset = Mission.objects.using(using)
+    if mission_ids is not None:
+        try:
+            mission_ids = {int(mission_id) for mission_id in mission_ids}
+        except (TypeError, ValueError):
+            raise ValidationError("Identifiants de missions invalides")
+        queryset = queryset.filter(id__in=mission_ids)
+    if filters is not None:
+        if not has_active_filter(filters):
+            # Des filtres tous vides désigneraient toute la table
+            raise ValidationError("Aucun filtre actif : la suppression de toutes les missions est refusée")
+        queryset = filter_missions(queryset, filters)
+    if mission_ids is None and filters is None:
+        # Garde-fou : jamais de suppression de toute la table par omission
+        raise ValidationError("Aucune mission désignée pour la suppression")
+
+    try:
+        with transaction.atomic(using=using):
+            missions = list(queryset.order_by('id').values(
+                'id', 'date_demande', 'remarque', 'priorite',
+                'client__prenom', 'client__nom', 'vehicule__marque', 'vehicule__modele',
+            ))
+            ids = [mission['id'] for mission in missions]
+            nb_lignes = dict(
+                MissionIntervention.objects.using(using).filter(mission_id__in=ids)
+                .values_list('mission_id').annotate(nb=Count('id')).order_by()
+            ) if ids else {}
+
+            for debut in range(0, len(ids), chunk_size):
+                Mission.objects.using(using).filter(id__in=ids[debut:debut + chunk_size]).delete()
+    except Exception as e:
+        logger.error("Erreur lors de la suppression des missions : %s", e)
+        raise ValidationError(f"Erreur lors de la suppression des missions : {str(e)}")
+
+    infos = [{
+        'id': mission['id'],
+        'date_demande': mission['date_demande'],
+        'remarque': mission['remarque'],
+        'priorite': mission['priorite'],
+        'client': f"{mission['client__prenom']} {mission['client__nom']}",
+        'vehicule': f"{mission['vehicule__marque']} {mission['vehicule__modele']}",
+        'nb_interventions': nb_lignes.get(mission['id'], 0),
+    } for mission in missions]
+    introuvables = sorted(mission_ids - set(ids)) if mission_ids is not None else []
+    nb_interventions = sum(nb_lignes.values())
+    logger.info("%d mission(s) supprimée(s), %d ligne(s) d'intervention supprimée(s)", len(infos), nb_interventions)
+    if introuvables:
+        logger.warning("Missions introuvables lors de la suppression : %s", introuvables)
+
+    return {
+        'success': True,
+        'missions': infos,
+        'introuvables': introuvables,
+        'nb_missions_supprimees': len(infos),
+        'nb_interventions_supprimees': nb_interventions,
+        'message': f"{len(infos)} mission(s) supprimée(s) avec succès",
+    }
+
 def delete_mission(mission_id):
     """Supprime une mission et toutes ses relations associées.
 
@@ -400,41 +624,16 @@ def delete_mission(mission_id):
     Returns:
         dict: Un dictionnaire contenant les informations sur la suppression.
     """
-    try:
-        with transaction.atomic():
-            # Récupération de la mission
-            mission = Mission.objects.get(id=mission_id)
-            
-            # Récupération des informations avant suppression pour le retour
-            mission_info = {
-                'id': mission.id,
-                'date_demande': mission.date_demande,
-                'remarque': mission.remarque,
-                'priorite': mission.priorite,
-                'client': f"{mission.client.prenom} {mission.client.nom}",
-                'vehicule': f"{mission.vehicule.marque} {mission.vehicule.modele}"
-            }
-            
-            # Comptage des MissionIntervention liées (pour information)
-            nb_interventions = MissionIntervention.objects.filter(mission=mission).count()
-            
-            # Suppression de la mission
-            # Les MissionIntervention seront supprimées automatiquement grâce à CASCADE
-            mission.delete()
-            
-            logging.info(f"Mission supprimée avec succès : {mission_info}")
-            logging.info(f"Nombre d'interventions liées supprimées : {nb_interventions}")
-            
-            return {
-                'success': True,
-                'mission_info': mission_info,
-                'nb_interventions_supprimees': nb_interventions,
-                'message': f"Mission {mission_id} supprimée avec succès"
-            }
-            
-    except Mission.DoesNotExist:
-        logging.error(f"Mission avec l'ID {mission_id} introuvable")
+    result = delete_missions([mission_id])
+    if not result['missions']:
+        logger.error("Mission avec l'ID %s introuvable", mission_id)
         raise ValidationError(f"Mission avec l'ID {mission_id} introuvable")
-    except Exception as e:
-        logging.error(f"Erreur lors de la suppression de la mission {mission_id}: {e}")
-        raise ValidationError(f"Erreur lors de la suppression de la mission : {str(e)}")
+
+    mission_info = result['missions'][0]
+    logger.info("Mission supprimée avec succès : %s", mission_info)
+    return {
+        'success': True,
+        'mission_info': mission_info,
+        'nb_interventions_supprimees': mission_info['nb_interventions'],
+        'message': f"Mission {mission_id} supprimée avec succès"
+    }
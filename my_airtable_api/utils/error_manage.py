@@ -21,7 +21,7 @@ def handle_template_errors(error_template='error.html'):
             try:
                 return view_func(request, *args, **kwargs)
             except (TemplateDoesNotExist, TemplateSyntaxError) as e:
-                logger.error(f"Template error in {view_func.__name__}: {str(e)}")
+                logger.error("Template error in %s: %s", view_func.__name__, e)
                 return render(request, error_template, {
                     'error': f"Erreur de template : {str(e)}",
                     'template_error': True,
@@ -29,7 +29,7 @@ def handle_template_errors(error_template='error.html'):
                     'view_name': view_func.__name__
                 })
             except Exception as e:
-                logger.error(f"Unexpected error in {view_func.__name__}: {str(e)}")
+                logger.error("Unexpected error in %s: %s", view_func.__name__, e)
                 return render(request, error_template, {
                     'error': str(e),
                     'template_error': True,
@@ -55,7 +55,7 @@ def render_with_error_handling(request, template_name, context=None, error_templ
     try:
         return render(request, template_name, context or {})
     except (TemplateDoesNotExist, TemplateSyntaxError) as e:
-        logger.error(f"Template error with {template_name}: {str(e)}")
+        logger.error("Template error with %s: %s", template_name, e)
         return render(request, error_template, {
             'error': f"Erreur de template : {str(e)}",
             'template_error': True,
@@ -63,7 +63,7 @@ def render_with_error_handling(request, template_name, context=None, error_templ
             'template_name': template_name
         })
     except Exception as e:
-        logger.error(f"Unexpected error rendering {template_name}: {str(e)}")
+        logger.error("Unexpected error rendering %s: %s", template_name, e)
         return render(request, error_template, {
             'error': str(e),
             'template_error': True,
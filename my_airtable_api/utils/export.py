@@ -0,0 +1,212 @@
+"""
+Export en flux des lignes de missions filtrées (CSV, JSON Lines, XLSX)
+
+Les lignes sont lues par lots avec `QuerySet.iterator(chunk_size=...)` et encodées au fil
+de l'eau : la mémoire utilisée ne dépend pas du nombre de lignes exportées et les
+premiers octets partent dès le premier lot.
+"""
+import csv
+import json
+import zipfile
+from datetime import date, datetime
+from decimal import Decimal
+from xml.sax.saxutils import escape
+
+from mission.models import MissionIntervention
+from my_airtable_api.utils.filters import filter_missions
+
+CHUNK_SIZE = 2000
+
+# (en-tête, chemin du champ depuis MissionIntervention)
+EXPORT_COLUMNS = [
+    ('mission_id', 'mission_id'),
+    ('date_demande', 'mission__date_demande'),
+    ('priorite', 'mission__priorite'),
+    ('client_nom', 'mission__client__nom'),
+    ('client_prenom', 'mission__client__prenom'),
+    ('client_email', 'mission__client__email'),
+    ('vehicule_marque', 'mission__vehicule__marque'),
+    ('vehicule_modele', 'mission__vehicule__modele'),
+    ('vehicule_immatriculation', 'mission__vehicule__immatriculation'),
+    ('vehicule_numero_serie', 'mission__vehicule__numero_serie'),
+    ('intervention', 'intervention__libelle'),
+    ('taux', 'taux'),
+    ('duree_supplementaire', 'duree_supplementaire'),
+    ('cout_total', 'cout_total'),
+]
+
+EXPORT_FORMATS = {
+    'csv': ('text/csv; charset=utf-8', 'csv'),
+    'jsonl': ('application/x-ndjson', 'jsonl'),
+    'xlsx': ('application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', 'xlsx'),
+}
+
+
+def export_rows(filters, chunk_size=CHUNK_SIZE):
+    """Itère sur les lignes de missions correspondant aux filtres de la liste.
+
+    Args:
+        filters (dict): Les filtres retournés par get_filters.
+        chunk_size (int, optional): Le nombre de lignes lues par lot. Defaults to CHUNK_SIZE.
+
+    Returns:
+        iterator: Des tuples de valeurs dans l'ordre de EXPORT_COLUMNS.
+    """
+    queryset = filter_missions(MissionIntervention.objects.all(), filters, prefix='mission__')
+    queryset = queryset.order_by('mission__date_demande', 'mission_id', 'id')
+    return queryset.values_list(*[path for _, path in EXPORT_COLUMNS]).iterator(chunk_size=chunk_size)
+
+
+def _to_text(value):
+    if value is None:
+        return ''
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+class _Echo:
+    """Pseudo-fichier dont `write` retourne la donnée écrite (pour csv.writer)."""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(rows):
+    """Encode les lignes en CSV, une ligne produite par ligne lue."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow([header for header, _ in EXPORT_COLUMNS])
+    for row in rows:
+        yield writer.writerow([_to_text(value) for value in row])
+
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Type non sérialisable : {type(value)}")
+
+
+def stream_jsonl(rows):
+    """Encode les lignes en JSON Lines (un objet par ligne)."""
+    headers = [header for header, _ in EXPORT_COLUMNS]
+    for row in rows:
+        yield json.dumps(dict(zip(headers, row)), default=_json_default, ensure_ascii=False) + "\n"
+
+
+class _ZipStream:
+    """Flux d'écriture non positionnable : zipfile y écrit, le générateur vide les octets produits."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def pop(self):
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+_XLSX_STATIC_PARTS = {
+    '[Content_Types].xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    '_rels/.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    'xl/workbook.xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Missions" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'
+    ),
+    'xl/_rels/workbook.xml.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        '</Relationships>'
+    ),
+}
+
+
+def _xlsx_cell(value):
+    if isinstance(value, (int, float, Decimal)) and not isinstance(value, bool):
+        return f'<c><v>{value}</v></c>'
+    return f'<c t="inlineStr"><is><t>{escape(_to_text(value))}</t></is></c>'
+
+
+def _xlsx_row(values):
+    return '<row>' + ''.join(_xlsx_cell(value) for value in values) + '</row>'
+
+
+def stream_xlsx(rows, flush_every=500):
+    """Encode les lignes en classeur XLSX écrit en flux (chaînes en ligne, sans table partagée).
+
+    Args:
+        rows (iterable): Les lignes à écrire.
+        flush_every (int, optional): Le nombre de lignes entre deux envois d'octets. Defaults to 500.
+    """
+    stream = _ZipStream()
+    with zipfile.ZipFile(stream, mode='w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, content in _XLSX_STATIC_PARTS.items():
+            archive.writestr(name, content)
+        yield stream.pop()
+
+        with archive.open('xl/worksheets/sheet1.xml', mode='w', force_zip64=True) as sheet:
+            sheet.write(
+                b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+            )
+            sheet.write(_xlsx_row([header for header, _ in EXPORT_COLUMNS]).encode())
+            for i, row in enumerate(rows, start=1):
+                sheet.write(_xlsx_row(row).encode())
+                if i % flush_every == 0:
+                    data = stream.pop()
+                    if data:
+                        yield data
+            sheet.write(b'</sheetData></worksheet>')
+    yield stream.pop()
+
+
+STREAM_WRITERS = {
+    'csv': stream_csv,
+    'jsonl': stream_jsonl,
+    'xlsx': stream_xlsx,
+}
+
+
+def stream_export(filters, export_format, chunk_size=CHUNK_SIZE):
+    """Retourne le générateur de contenu d'un export.
+
+    Args:
+        filters (dict): Les filtres retournés par get_filters.
+        export_format (str): 'csv', 'jsonl' ou 'xlsx'.
+        chunk_size (int, optional): Le nombre de lignes lues par lot. Defaults to CHUNK_SIZE.
+
+    Returns:
+        iterator: Les morceaux (str ou bytes) du fichier exporté.
+    """
+    return STREAM_WRITERS[export_format](export_rows(filters, chunk_size))
@@ -1,6 +1,9 @@
 from datetime import datetime
 import logging
 from mission.models import  Taux, Vehicule, Client
+from my_airtable_api.utils.pricing import price_lines, to_decimal
+
+logger = logging.getLogger(__name__)
 
 class ValidationError(Exception):
     def __init__(self, message, field=None, details=None):
@@ -168,31 +171,24 @@ def extract_data_intervention(request, erreurs):
     Returns:
         dict: Un dictionnaire contenant les données de l'intervention
     """
-    from .crud import intervention_get_by_id
+    from .crud import interventions_get_many
     import logging
 
     # Récupération de toutes les interventions (actuelles + nouvelles)
     intervention_ids = request.POST.get('interventions', '') 
-    logging.info(f"extract_data_intervention - IDs reçus: '{intervention_ids}'")
-    
-    interventions = []
+    logger.debug("extract_data_intervention - IDs reçus: '%s'", intervention_ids)
     
-    if intervention_ids.strip():  # Vérifier que ce n'est pas vide
-        for i in intervention_ids.split(','):
-            intervention_id = i.strip()  # Nettoyer les espaces
-            if intervention_id:  # Vérifier que l'ID n'est pas vide
-                try:
-                    intervention = intervention_get_by_id(intervention_id)  
-                    interventions.append(intervention)
-                    logging.info(f"Intervention trouvée: {intervention.id} - {intervention.libelle}")
-                except Exception as e:
-                    logging.error(f"Erreur lors de la récupération de l'intervention {intervention_id}: {e}")
-                    erreurs['intervention'][intervention_id] = f"L'intervention avec l'ID {intervention_id} n'existe pas"
-                    raise ValidationError("Erreur(s) dans le formulaire", details=erreurs)
+    try:
+        # Lecture du catalogue en mémoire (aucune requête en régime établi), dans l'ordre du formulaire
+        interventions = interventions_get_many(intervention_ids.split(','))
+    except ValidationError as e:
+        for intervention_id in e.details['missing']:
+            erreurs['intervention'][intervention_id] = f"L'intervention avec l'ID {intervention_id} n'existe pas"
+        raise ValidationError("Erreur(s) dans le formulaire", details=erreurs)
     if not interventions:
         erreurs['intervention']['interventions'] = "Aucune intervention sélectionnée"
         raise ValidationError("Erreur(s) dans le formulaire", details=erreurs)
-    logging.info(f"extract_data_intervention - Total interventions extraites: {len(interventions)}")
+    logger.debug("extract_data_intervention - Total interventions extraites: %d", len(interventions))
     return {'interventions': interventions}
 
 def extract_data_mission(request, vehicule, client, erreurs, mission_id):
@@ -237,11 +233,7 @@ def extract_data_mission(request, vehicule, client, erreurs, mission_id):
         erreurs['mission']['vehicule'] = "Le véhicule est requis"
     if not mission['client']:
         erreurs['mission']['client'] = "Le client est requis"
-    # Vérifier si le vehicule + client sont déja associés à une mission
-    if vehicule_obj.id and client_obj.id:
-        existing_missions = vehicule_obj.mission_set.filter(client=client_obj)
-        if existing_missions.exists():
-            erreurs['mission']['vehicule_client'] = "Ce véhicule est déjà associé à une mission pour ce client"
+    # L'unicité du couple véhicule/client est vérifiée par la base à l'écriture (crud.unique_errors)
     if erreurs['mission']:
         raise ValidationError("Erreur(s) dans le formulaire", details=erreurs)
     
@@ -262,54 +254,35 @@ def extract_data_mission_intervention(request, mission, interventions, erreurs):
     Returns:
         list: Une liste de dictionnaires contenant les données des interventions de mission
     """
-    mission_interventions = []
-    cout_total = 0.0    
     taux = request.POST.get(f'taux', '')
-    duree_supp = float(request.POST.get('duree_supplementaire', 0.0) or 0.0)
-    duree_supp_total = duree_supp + mission.get('duree_supplementaire', 0.0)
-    logging.info(f"extract_data_mission_intervention - Taux: {taux}, Durée supplémentaire: {duree_supp}, Durée totale: {duree_supp_total}")
-
-    match taux:
-        case 'HORAIRE':
-            taux_calcul = 1.0
-        case 'T1':
-            taux_calcul = 1.5
-        case 'T2':
-            taux_calcul = 2.0
-        case 'T3':
-            taux_calcul = 2.5 
-    
-    for intervention in interventions['interventions']:
-        try:
-            if intervention.is_forfait:
-                cout = float(intervention.forfait)
-            else:
-                cout = float(intervention.prix_unitaire) * taux_calcul
-            if duree_supp > 0:   
-                cout *= duree_supp or 1.0
-                
-            cout_total += cout
-            mission_intervention = {
-                'mission': mission,
-                'intervention': intervention,
-                'duree_supplementaire': duree_supp_total, 
-                'taux': taux,
-                'cout_total': cout
-            }
-            erreurs.setdefault('mission_intervention', {})
-            logging.info (f"MISSION INTERVENTION: {mission_intervention}")
-
-            if mission_intervention['cout_total'] < 0:
-                erreurs['mission_intervention']['cout_total'] = "Le coût total ne peut pas être négatif"
-            if not taux or taux not in [choix.name for choix in Taux]:
-                erreurs['mission_intervention']['taux'] = "Le taux horaire est requis et doit être valide"
-            if erreurs['mission_intervention']:
-                raise ValidationError("Erreur(s) dans le formulaire", details=erreurs)
-
-            mission_interventions.append(mission_intervention)
-        
-        except ValueError as e:
-            logging.error(f"Invalid data for intervention {intervention.id}: {e}")
-            raise
+    duree_supp = to_decimal(request.POST.get('duree_supplementaire', 0))
+    duree_supp_total = duree_supp + to_decimal(mission.get('duree_supplementaire', 0))
+    logger.debug("extract_data_mission_intervention - Taux: %s, Durée supplémentaire: %s, Durée totale: %s", taux, duree_supp, duree_supp_total)
+
+    erreurs.setdefault('mission_intervention', {})
+    if not taux or taux not in [choix.name for choix in Taux]:
+        erreurs['mission_intervention']['taux'] = "Le taux horaire est requis et doit être valide"
+        raise ValidationError("Erreur(s) dans le formulaire", details=erreurs)
+
+    # Le coût est calculé sur la durée enregistrée dans la ligne, comme lors d'un repricing
+    couts, _ = price_lines(
+        (intervention, taux, duree_supp_total) for intervention in interventions['interventions']
+    )
+    mission_interventions = []
+    for intervention, cout in zip(interventions['interventions'], couts):
+        mission_intervention = {
+            'mission': mission,
+            'intervention': intervention,
+            'duree_supplementaire': duree_supp_total,
+            'taux': taux,
+            'cout_total': cout
+        }
+        logger.debug("MISSION INTERVENTION: %s", mission_intervention)
+
+        if mission_intervention['cout_total'] < 0:
+            erreurs['mission_intervention']['cout_total'] = "Le coût total ne peut pas être négatif"
+            raise ValidationError("Erreur(s) dans le formulaire", details=erreurs)
+
+        mission_interventions.append(mission_intervention)
 
     return mission_interventions
@@ -0,0 +1,85 @@
+"""
+Utilitaires pour l'extraction et l'application des filtres de la liste des missions
+"""
+from datetime import datetime
+from my_airtable_api.utils.search import search_clients, search_vehicules
+
+# Correspondance entre les paramètres GET et les clés du dictionnaire de filtres
+FILTER_PARAMS = {
+    'client': 'client-filtrage',
+    'vehicule': 'vehicule-filtrage',
+    'priorite': 'priorite-filtrage',
+    'date_debut': 'date_debut',
+    'date_fin': 'date_fin',
+}
+
+# Clés qui restreignent effectivement la liste (une date mal formatée est ignorée)
+ACTIVE_FILTER_KEYS = ('client', 'vehicule', 'priorite', 'date_debut_parsed', 'date_fin_parsed')
+
+
+def _parse_date(value):
+    """Convertit une date au format AAAA-MM-JJ, ou None si elle est vide ou mal formatée."""
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        return None  # Ignorer les dates mal formatées
+
+
+def get_filters(params):
+    """Extrait les filtres de la liste des missions à partir des paramètres GET.
+
+    Args:
+        params (QueryDict): Les paramètres GET de la requête.
+
+    Returns:
+        dict: Les valeurs brutes des filtres (pour le template) et les dates converties.
+    """
+    filters = {key: params.get(param, '').strip() for key, param in FILTER_PARAMS.items()}
+    filters['date_debut_parsed'] = _parse_date(filters['date_debut'])
+    filters['date_fin_parsed'] = _parse_date(filters['date_fin'])
+    return filters
+
+
+def has_active_filter(filters):
+    """Indique si au moins un filtre restreint la liste des missions.
+
+    Args:
+        filters (dict): Les filtres retournés par get_filters.
+
+    Returns:
+        bool: False si filter_missions retournerait le queryset inchangé.
+    """
+    return any(filters.get(key) for key in ACTIVE_FILTER_KEYS)
+
+
+def filter_missions(queryset, filters, prefix=''):
+    """Applique les filtres de la liste sur un queryset de missions.
+
+    Args:
+        queryset (QuerySet): Le queryset à filtrer.
+        filters (dict): Les filtres retournés par get_filters.
+        prefix (str, optional): Le chemin vers la mission depuis le modèle du queryset,
+            par exemple 'mission__' pour un queryset de MissionIntervention. Defaults to ''.
+
+    Returns:
+        QuerySet: Le queryset filtré.
+    """
+    # Les recherches de sous-chaînes passent par les index de recherche (trigrammes / FTS5)
+    if filters['client']:
+        queryset = queryset.filter(**{f'{prefix}client_id__in': search_clients(filters['client'], queryset.db)})
+
+    if filters['vehicule']:
+        queryset = queryset.filter(**{f'{prefix}vehicule_id__in': search_vehicules(filters['vehicule'], queryset.db)})
+
+    if filters['priorite']:
+        queryset = queryset.filter(**{f'{prefix}priorite': filters['priorite']})
+
+    if filters['date_debut_parsed']:
+        queryset = queryset.filter(**{f'{prefix}date_demande__date__gte': filters['date_debut_parsed']})
+
+    if filters['date_fin_parsed']:
+        queryset = queryset.filter(**{f'{prefix}date_demande__date__lte': filters['date_fin_parsed']})
+
+    return queryset
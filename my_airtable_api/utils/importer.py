@@ -0,0 +1,415 @@
+"""
+Import en masse de missions historiques (CSV ou JSON Lines)
+
+Chaque ligne du fichier décrit une ligne de mission avec son client, son véhicule et
+sa mission. Les clients sont dédoublonnés par email et les véhicules par numéro de série,
+en mémoire ; une mission correspond à un couple (client, véhicule). Les insertions passent
+par `COPY ... FROM STDIN` sur PostgreSQL et par `executemany` sur les autres bases, et
+chaque lot est validé dans sa propre transaction, avec les résumés (MissionSummary) de ses
+missions : un import interrompu laisse une base cohérente.
+"""
+import csv
+import io
+import json
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+
+from django.db import connections, transaction
+from django.utils import timezone
+
+from mission.models import Client, Vehicule, Intervention, Mission, MissionIntervention, MissionSummary, Priorite, Taux
+from my_airtable_api.utils.cache import invalidate_list_cache
+from my_airtable_api.utils.summary import build_mission_summaries, refresh_mission_summaries, SUMMARY_FIELDS, CHUNK_SIZE as SUMMARY_CHUNK_SIZE
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 10000
+
+CLIENT_FIELDS = ['nom', 'prenom', 'societe', 'telephone', 'email', 'adresse', 'code_postal', 'ville']
+VEHICULE_FIELDS = [
+    'marque', 'modele', 'immatriculation', 'numero_serie', 'mise_circulation', 'kilometrage', 'remarque',
+    'client_id', 'vo', 'boite_vitesse', 'carburant',
+]
+MISSION_FIELDS = ['date_demande', 'remarque', 'priorite', 'vehicule_id', 'client_id']
+LIGNE_FIELDS = ['mission_id', 'intervention_id', 'duree_supplementaire', 'taux', 'cout_total']
+SUMMARY_COLUMNS = ['mission_id'] + [f"{name}_id" if name in ('client', 'vehicule') else name for name in SUMMARY_FIELDS]
+
+# Les montants sont déjà des Decimal à deux décimales ; seules les dates dépendent de la base
+PREPARED_TYPES = {'DateTimeField', 'DateField'}
+
+TAUX_NAMES = {choix.name for choix in Taux}
+PRIORITE_NAMES = {choix.name for choix in Priorite}
+
+
+class ImportRowError(Exception):
+    """Erreur de validation d'une ligne du fichier importé."""
+
+
+@dataclass
+class ImportReport:
+    """Bilan d'un import : compteurs et erreurs ligne par ligne."""
+    lignes_lues: int = 0
+    clients: int = 0
+    vehicules: int = 0
+    missions: int = 0
+    lignes: int = 0
+    erreurs: list = field(default_factory=list)
+
+    def add_error(self, numero, message):
+        self.erreurs.append({'ligne': numero, 'erreur': message})
+
+    def write_errors(self, path):
+        """Écrit le rapport d'erreurs au format CSV (ligne, erreur)."""
+        with open(path, 'w', encoding='utf-8', newline='') as output:
+            writer = csv.DictWriter(output, fieldnames=['ligne', 'erreur'])
+            writer.writeheader()
+            writer.writerows(self.erreurs)
+
+
+def read_rows(path, file_format=None):
+    """Itère sur les lignes d'un fichier CSV ou JSON Lines.
+
+    Args:
+        path (str): Le chemin du fichier.
+        file_format (str, optional): 'csv' ou 'jsonl' ; déduit de l'extension si absent.
+
+    Returns:
+        iterator: Des couples (numéro de ligne, dictionnaire des colonnes). Une ligne JSON
+            illisible donne une ImportRowError à la place du dictionnaire, reportée par l'import
+            dans les erreurs de la ligne.
+    """
+    file_format = file_format or ('jsonl' if path.endswith(('.jsonl', '.ndjson')) else 'csv')
+    with open(path, encoding='utf-8', newline='') as source:
+        if file_format == 'jsonl':
+            for numero, line in enumerate(source, start=1):
+                if line.strip():
+                    try:
+                        yield numero, json.loads(line)
+                    except json.JSONDecodeError as e:
+                        yield numero, ImportRowError(f"JSON invalide : {e}")
+        else:
+            # Numérotation à partir de 2 : la ligne 1 est l'en-tête
+            yield from enumerate(csv.DictReader(source), start=2)
+
+
+def _text(row, key, max_length=None, required=False):
+    value = row.get(key)
+    value = '' if value is None else str(value).strip()
+    if required and not value:
+        raise ImportRowError(f"colonne {key} requise")
+    if max_length and len(value) > max_length:
+        raise ImportRowError(f"{key} dépasse {max_length} caractères")
+    return value
+
+
+def _decimal(row, key, max_digits=6):
+    value = row.get(key)
+    if value in (None, ''):
+        return Decimal('0.00')
+    try:
+        value = Decimal(str(value)).quantize(Decimal('0.01'))
+    except InvalidOperation:
+        raise ImportRowError(f"{key} n'est pas un nombre : {row.get(key)!r}")
+    if value < 0 or len(value.as_tuple().digits) > max_digits:
+        raise ImportRowError(f"{key} hors limites : {value}")
+    return value
+
+
+def _datetime(row, key):
+    value = _text(row, key)
+    if not value:
+        return timezone.now()
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise ImportRowError(f"{key} n'est pas une date ISO : {value!r}")
+    return parsed if timezone.is_aware(parsed) else timezone.make_aware(parsed)
+
+
+def _date(row, key):
+    value = _text(row, key)
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value[:10], '%Y-%m-%d').date()
+    except ValueError:
+        raise ImportRowError(f"{key} n'est pas une date AAAA-MM-JJ : {value!r}")
+
+
+def _copy_value(value):
+    """Encode une valeur au format texte de COPY (\\N pour NULL)."""
+    if value is None:
+        return '\\N'
+    return str(value).replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+
+
+def insert_rows(model, fields, rows, using='default'):
+    """Insère des lignes brutes dans la table d'un modèle, sans passer par l'ORM.
+
+    PostgreSQL : une seule instruction COPY FROM STDIN. Autres bases : un executemany.
+
+    Args:
+        model (Model): Le modèle cible.
+        fields (list): Les noms d'attributs des colonnes (ex. 'client_id').
+        rows (list): Les tuples de valeurs Python, dans l'ordre de `fields` (montants en Decimal déjà arrondis).
+        using (str, optional): L'alias de la base de données. Defaults to 'default'.
+    """
+    if not rows:
+        return
+    connection = connections[using]
+    columns = [model._meta.get_field(name) for name in fields]
+    table = connection.ops.quote_name(model._meta.db_table)
+    column_names = ", ".join(connection.ops.quote_name(column.column) for column in columns)
+    # Seules les dates ont besoin d'une conversion propre à la base (fuseau, format)
+    to_convert = [i for i, column in enumerate(columns) if column.get_internal_type() in PREPARED_TYPES]
+    prepared = [list(row) for row in rows]
+    for row in prepared:
+        for i in to_convert:
+            row[i] = columns[i].get_db_prep_save(row[i], connection)
+
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            data = "".join("\t".join(_copy_value(value) for value in row) + "\n" for row in prepared)
+            sql = f"COPY {table} ({column_names}) FROM STDIN"
+            raw_cursor = cursor.cursor
+            if hasattr(raw_cursor, 'copy_expert'):  # psycopg2
+                raw_cursor.copy_expert(sql, io.StringIO(data))
+            else:  # psycopg 3
+                with raw_cursor.copy(sql) as copy:
+                    copy.write(data)
+        else:
+            placeholders = ", ".join(["%s"] * len(columns))
+            cursor.executemany(f"INSERT INTO {table} ({column_names}) VALUES ({placeholders})", prepared)
+
+
+class MissionImporter:
+    """Importe des lignes de missions par lots, en dédoublonnant clients et véhicules en mémoire."""
+
+    def __init__(self, using='default', chunk_size=CHUNK_SIZE):
+        """
+        Args:
+            using (str, optional): L'alias de la base de données. Defaults to 'default'.
+            chunk_size (int, optional): Le nombre de lignes du fichier validées par transaction. Defaults to CHUNK_SIZE.
+        """
+        self.using = using
+        self.chunk_size = chunk_size
+        self.report = ImportReport()
+        self.interventions = {
+            libelle.strip().lower(): intervention_id
+            for intervention_id, libelle in Intervention.objects.using(using).values_list('id', 'libelle')
+        }
+        # Caches email -> id, numéro de série -> (id, client_id), couple -> mission_id
+        self.clients = {}
+        self.vehicules = {}
+        self.missions = {}
+        # Missions créées par cet import (les seules complétées par de nouvelles lignes)
+        self.missions_importees = set()
+        self.lignes = set()
+        # Missions dont le résumé a déjà été inséré (par un lot précédent ou un fichier précédent)
+        self.missions_resumees = set()
+        # Clés déjà lues dans le fichier
+        self.emails_lus = set()
+        self.series_lues = set()
+        self.couples_lus = set()
+
+    def run(self, rows, stdout=None):
+        """Importe toutes les lignes, lot par lot.
+
+        Args:
+            rows (iterable): Les couples (numéro de ligne, dictionnaire) retournés par read_rows.
+            stdout (callable, optional): Fonction d'affichage de la progression. Defaults to None.
+
+        Returns:
+            ImportReport: Le bilan de l'import.
+        """
+        chunk = []
+        for numero, row in rows:
+            self.report.lignes_lues += 1
+            chunk.append((numero, row))
+            if len(chunk) >= self.chunk_size:
+                self._import_chunk(chunk)
+                chunk = []
+                if stdout:
+                    stdout(f"  {self.report.lignes_lues} lignes lues, {self.report.lignes} lignes importées")
+        if chunk:
+            self._import_chunk(chunk)
+        logger.info("Import : %d lignes importées sur %d lues, %d erreurs",
+                    self.report.lignes, self.report.lignes_lues, len(self.report.erreurs))
+        return self.report
+
+    def _parse(self, row):
+        """Valide une ligne et retourne ses clés et ses données client, véhicule, mission et ligne.
+
+        Les données d'un client, d'un véhicule ou d'une mission ne sont lues qu'à leur première
+        apparition dans le fichier (la première occurrence l'emporte) : None ensuite.
+        """
+        if isinstance(row, ImportRowError):
+            raise row
+        if not isinstance(row, dict):
+            raise ImportRowError(f"la ligne n'est pas un objet JSON : {type(row).__name__}")
+        email = _text(row, 'client_email', 254, required=True)
+        numero_serie = _text(row, 'vehicule_numero_serie', 17, required=True)
+
+        taux = _text(row, 'taux', required=True).upper()
+        if taux not in TAUX_NAMES:
+            raise ImportRowError(f"taux inconnu : {taux!r}")
+        libelle = _text(row, 'intervention', required=True)
+        intervention_id = self.interventions.get(libelle.lower())
+        if intervention_id is None:
+            raise ImportRowError(f"intervention inconnue : {libelle!r}")
+        ligne = {
+            'intervention_id': intervention_id,
+            'taux': taux,
+            'duree_supplementaire': _decimal(row, 'duree_supplementaire'),
+            'cout_total': _decimal(row, 'cout_total'),
+        }
+
+        client = vehicule = mission = None
+        if email not in self.emails_lus:
+            client = {
+                'nom': _text(row, 'client_nom', 50, required=True),
+                'prenom': _text(row, 'client_prenom', 50),
+                'societe': _text(row, 'client_societe', 50) or None,
+                'telephone': _text(row, 'client_telephone', 10),
+                'email': email,
+                'adresse': _text(row, 'client_adresse', 200),
+                'code_postal': _text(row, 'client_code_postal', 5),
+                'ville': _text(row, 'client_ville', 100),
+            }
+        if numero_serie not in self.series_lues:
+            kilometrage = _text(row, 'vehicule_kilometrage') or '0'
+            if not kilometrage.isdigit():
+                raise ImportRowError(f"vehicule_kilometrage invalide : {kilometrage!r}")
+            vehicule = {
+                'marque': _text(row, 'vehicule_marque', 50, required=True),
+                'modele': _text(row, 'vehicule_modele', 50, required=True),
+                'immatriculation': _text(row, 'vehicule_immatriculation', 9, required=True),
+                'numero_serie': numero_serie,
+                'mise_circulation': _date(row, 'vehicule_mise_circulation'),
+                'kilometrage': int(kilometrage),
+                'remarque': _text(row, 'vehicule_remarque') or None,
+                'vo': _text(row, 'vehicule_vo').lower() in ('1', 'true', 'oui', 'on'),
+                'boite_vitesse': _text(row, 'vehicule_boite_vitesse') or 'Manuelle',
+                'carburant': _text(row, 'vehicule_carburant') or 'Essence',
+            }
+        if (email, numero_serie) not in self.couples_lus:
+            priorite = _text(row, 'priorite').upper() or Priorite.NON_PRIORITAIRE.name
+            if priorite not in PRIORITE_NAMES:
+                raise ImportRowError(f"priorité inconnue : {priorite!r}")
+            mission = {
+                'date_demande': _datetime(row, 'date_demande'),
+                'remarque': _text(row, 'remarque') or None,
+                'priorite': priorite,
+            }
+
+        # La ligne est valide : ses client, véhicule et mission sont désormais connus
+        self.emails_lus.add(email)
+        self.series_lues.add(numero_serie)
+        self.couples_lus.add((email, numero_serie))
+        return email, numero_serie, client, vehicule, mission, ligne
+
+    def _load_existing(self, emails, numeros_serie):
+        """Complète les caches avec les clients, véhicules et missions déjà en base."""
+        emails = [email for email in emails if email not in self.clients]
+        for start in range(0, len(emails), 900):
+            self.clients.update(
+                Client.objects.using(self.using).filter(email__in=emails[start:start + 900]).values_list('email', 'id')
+            )
+        numeros_serie = [numero for numero in numeros_serie if numero not in self.vehicules]
+        for start in range(0, len(numeros_serie), 900):
+            vehicules = Vehicule.objects.using(self.using).filter(numero_serie__in=numeros_serie[start:start + 900])
+            vehicules_ids = {}
+            for numero, vehicule_id, client_id in vehicules.values_list('numero_serie', 'id', 'client_id'):
+                self.vehicules[numero] = (vehicule_id, client_id)
+                vehicules_ids[vehicule_id] = client_id
+            missions = Mission.objects.using(self.using).filter(vehicule_id__in=vehicules_ids)
+            for mission_id, client_id, vehicule_id in missions.values_list('id', 'client_id', 'vehicule_id'):
+                self.missions[(client_id, vehicule_id)] = mission_id
+
+    def _import_chunk(self, chunk):
+        """Valide, dédoublonne et insère un lot de lignes et les résumés de ses missions dans une transaction."""
+        parsed = []
+        for numero, row in chunk:
+            try:
+                parsed.append((numero, *self._parse(row)))
+            except ImportRowError as e:
+                self.report.add_error(numero, str(e))
+
+        self._load_existing({p[1] for p in parsed}, {p[2] for p in parsed})
+
+        with transaction.atomic(using=self.using):
+            # 1. Clients nouveaux
+            nouveaux_clients = [
+                client for _, email, _, client, *_ in parsed if client is not None and email not in self.clients
+            ]
+            insert_rows(Client, CLIENT_FIELDS, [[c[f] for f in CLIENT_FIELDS] for c in nouveaux_clients], self.using)
+            self._load_existing([c['email'] for c in nouveaux_clients], [])
+            self.report.clients += len(nouveaux_clients)
+
+            # 2. Véhicules nouveaux, rattachés au client de leur première ligne
+            nouveaux_vehicules = [
+                {**vehicule, 'client_id': self.clients[email]}
+                for _, email, numero_serie, _, vehicule, *_ in parsed
+                if vehicule is not None and numero_serie not in self.vehicules
+            ]
+            insert_rows(Vehicule, VEHICULE_FIELDS, [[v[f] for f in VEHICULE_FIELDS] for v in nouveaux_vehicules],
+                        self.using)
+            self._load_existing([], [v['numero_serie'] for v in nouveaux_vehicules])
+            self.report.vehicules += len(nouveaux_vehicules)
+
+            # 3. Missions nouvelles : une par couple (client, véhicule)
+            nouvelles_missions = {}
+            valides = []
+            for numero, email, numero_serie, _, _, mission, ligne in parsed:
+                client_id = self.clients[email]
+                vehicule_id, proprietaire_id = self.vehicules[numero_serie]
+                if proprietaire_id != client_id:
+                    self.report.add_error(numero, f"le véhicule {numero_serie} appartient à un autre client")
+                    continue
+                couple = (client_id, vehicule_id)
+                if couple in self.missions and self.missions[couple] not in self.missions_importees:
+                    self.report.add_error(numero, f"une mission existe déjà pour {email} / {numero_serie}")
+                    continue
+                if mission is not None and couple not in self.missions:
+                    nouvelles_missions[couple] = {**mission, 'client_id': client_id, 'vehicule_id': vehicule_id}
+                valides.append((numero, couple, ligne))
+            insert_rows(Mission, MISSION_FIELDS,
+                        [[m[f] for f in MISSION_FIELDS] for m in nouvelles_missions.values()], self.using)
+            vehicules_ids = [vehicule_id for _, vehicule_id in nouvelles_missions]
+            for start in range(0, len(vehicules_ids), 900):
+                missions = Mission.objects.using(self.using).filter(vehicule_id__in=vehicules_ids[start:start + 900])
+                for mission_id, client_id, vehicule_id in missions.values_list('id', 'client_id', 'vehicule_id'):
+                    self.missions[(client_id, vehicule_id)] = mission_id
+                    self.missions_importees.add(mission_id)
+            self.report.missions += len(nouvelles_missions)
+
+            # 4. Lignes de mission, une seule par couple (mission, intervention)
+            lignes = []
+            missions_modifiees = set()
+            for numero, couple, ligne in valides:
+                cle = (self.missions[couple], ligne['intervention_id'])
+                if cle in self.lignes:
+                    self.report.add_error(numero, "intervention en double dans la mission")
+                    continue
+                self.lignes.add(cle)
+                missions_modifiees.add(cle[0])
+                lignes.append([cle[0], *[ligne[f] for f in LIGNE_FIELDS[1:]]])
+            insert_rows(MissionIntervention, LIGNE_FIELDS, lignes, self.using)
+            self.report.lignes += len(lignes)
+
+            # 5. Résumés des missions du lot : les insertions brutes ne déclenchent pas les signaux.
+            # Une mission qui s'étend sur plusieurs lots est insérée puis recalculée
+            self._write_summaries(missions_modifiees)
+            invalidate_list_cache(self.using)
+
+    def _write_summaries(self, missions_modifiees):
+        """Insère les résumés des nouvelles missions et recalcule ceux des missions complétées."""
+        nouvelles = sorted(missions_modifiees - self.missions_resumees)
+        for start in range(0, len(nouvelles), SUMMARY_CHUNK_SIZE):
+            summaries = build_mission_summaries(nouvelles[start:start + SUMMARY_CHUNK_SIZE], self.using)
+            insert_rows(MissionSummary, SUMMARY_COLUMNS,
+                        [[getattr(summary, f) for f in SUMMARY_COLUMNS] for summary in summaries], self.using)
+        refresh_mission_summaries(missions_modifiees & self.missions_resumees, self.using)
+        self.missions_resumees |= missions_modifiees
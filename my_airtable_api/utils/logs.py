@@ -0,0 +1,208 @@
+"""
+Journalisation structurée et non bloquante
+
+Les threads de requête ne font que déposer les enregistrements dans une file : la mise en forme
+JSON et l'écriture sur la sortie sont faites par un thread d'arrière-plan (QueueListener).
+Les messages utilisent le style `%` paresseux : `logger.info("Mission %s", mission_id)` ne met
+rien en forme lorsque le niveau est désactivé.
+
+Un QuerySet passé en argument d'un log serait évalué (une requête SQL) au moment de la mise en
+forme : QuerySetLogFilter le refuse, et la vérification système `logging.E001` signale les appels
+qui mettent leur message en forme avant l'appel (f-string, `%`, `.format`).
+"""
+import ast
+import atexit
+import datetime
+import json
+import logging
+import logging.handlers
+import os
+import queue
+from pathlib import Path
+
+from django.conf import settings
+from django.core.checks import Error, register
+from django.db.models.query import QuerySet
+
+# Types dont la mise en forme peut attendre le thread d'écriture sans risque
+DEFERRED_TYPES = (str, int, float, bool, type(None), datetime.date, datetime.datetime, datetime.time)
+
+# Attributs standard d'un LogRecord, exclus des champs supplémentaires (extra=...)
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+# Threads d'écriture des QueueHandler du processus
+_listeners = []
+
+LOG_METHODS = {'debug', 'info', 'warning', 'error', 'exception', 'critical', 'log'}
+
+
+class JsonFormatter(logging.Formatter):
+    """Met en forme un enregistrement sur une ligne JSON."""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        if record.stack_info:
+            entry['stack'] = self.formatStack(record.stack_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class QuerySetLogFilter(logging.Filter):
+    """Refuse les QuerySet en argument d'un log : leur mise en forme exécuterait la requête.
+
+    Avec LOG_STRICT (tests) l'erreur est levée ; sinon l'argument est remplacé par un texte fixe.
+    """
+
+    def filter(self, record):
+        args = record.args if isinstance(record.args, tuple) else (record.args,) if record.args else ()
+        if not any(isinstance(arg, QuerySet) for arg in args):
+            return True
+        if getattr(settings, 'LOG_STRICT', False):
+            raise TypeError(
+                f"QuerySet passé en argument du log {record.pathname}:{record.lineno} : "
+                "journaliser des valeurs déjà calculées (identifiants, nombre de lignes)"
+            )
+        record.args = tuple('<QuerySet non journalisé>' if isinstance(arg, QuerySet) else arg for arg in args)
+        return True
+
+
+class QueueHandler(logging.handlers.QueueHandler):
+    """Dépose les enregistrements dans une file vidée par un thread d'écriture.
+
+    Le formateur configuré (JSON) est appliqué par le thread d'écriture. Seuls les arguments de
+    types simples y sont mis en forme ; les autres (objets du modèle…) le sont immédiatement,
+    car ils peuvent changer ou accéder à la base entre-temps.
+    """
+
+    def __init__(self, stream=None, maxsize=10000):
+        """
+        Args:
+            stream (file, optional): La sortie du thread d'écriture. Defaults to sys.stderr.
+            maxsize (int, optional): La taille maximale de la file ; au-delà les enregistrements
+                sont perdus plutôt que de bloquer la requête. Defaults to 10000.
+        """
+        super().__init__(queue.Queue(maxsize))
+        self.addFilter(QuerySetLogFilter())
+        self.target = logging.StreamHandler(stream)
+        self.listener = logging.handlers.QueueListener(self.queue, self.target)
+        self.listener.start()
+        _listeners.append(self.listener)
+
+    def setFormatter(self, fmt):
+        # La mise en forme est faite par le handler du thread d'écriture
+        self.target.setFormatter(fmt)
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            # Mieux vaut perdre un log que bloquer le traitement d'une requête
+            pass
+
+    def prepare(self, record):
+        args = record.args if isinstance(record.args, tuple) else (record.args,) if record.args else ()
+        if not all(isinstance(arg, DEFERRED_TYPES) for arg in args):
+            record.msg = record.getMessage()
+            record.args = None
+        if record.exc_info:
+            # La trace référence les frames de la requête : elle est mise en forme tout de suite
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def close(self):
+        if self.listener._thread is not None:
+            self.listener.stop()
+        # Un handler fermé ne doit pas être redémarré après un fork
+        if self.listener in _listeners:
+            _listeners.remove(self.listener)
+        super().close()
+
+
+def stop_listeners():
+    """Vide les files et arrête les threads d'écriture."""
+    for listener in _listeners:
+        if listener._thread is not None:
+            listener.stop()
+
+
+def start_listeners():
+    """Redémarre les threads d'écriture arrêtés par stop_listeners."""
+    for listener in _listeners:
+        if listener._thread is None:
+            listener.start()
+
+
+def _is_log_call(node):
+    func = node.func
+    return (
+        isinstance(func, ast.Attribute) and func.attr in LOG_METHODS
+        and isinstance(func.value, ast.Name) and func.value.id in ('logging', 'logger')
+    )
+
+
+def _eager_message(node):
+    """Retourne la forme de mise en forme anticipée du message, ou None."""
+    if not node.args:
+        return None
+    message = node.args[1] if node.func.attr == 'log' and len(node.args) > 1 else node.args[0]
+    if isinstance(message, ast.JoinedStr):
+        return 'f-string'
+    if isinstance(message, ast.BinOp) and isinstance(message.op, (ast.Mod, ast.Add)):
+        return "opérateur % ou +"
+    if isinstance(message, ast.Call) and isinstance(message.func, ast.Attribute) and message.func.attr == 'format':
+        return '.format()'
+    return None
+
+
+def find_eager_log_calls(path):
+    """Liste les appels de log d'un fichier dont le message est mis en forme avant l'appel.
+
+    Args:
+        path (Path): Le fichier Python à analyser.
+
+    Returns:
+        list: Les tuples (numéro de ligne, forme de la mise en forme).
+    """
+    tree = ast.parse(path.read_text(encoding='utf-8'), filename=str(path))
+    return [
+        (node.lineno, forme) for node in ast.walk(tree)
+        if isinstance(node, ast.Call) and _is_log_call(node) and (forme := _eager_message(node))
+    ]
+
+
+@register('logging')
+def check_lazy_logging(app_configs, **kwargs):
+    """Vérification système : les messages de log du projet utilisent des arguments paresseux."""
+    racine = Path(settings.BASE_DIR)
+    errors = []
+    for dossier in ('my_airtable_api', 'mission'):
+        for path in sorted((racine / dossier).rglob('*.py')):
+            if 'migrations' in path.parts:
+                continue
+            for lineno, forme in find_eager_log_calls(path):
+                errors.append(Error(
+                    f"Message de log mis en forme avant l'appel ({forme}) : {path.relative_to(racine)}:{lineno}",
+                    hint="Passer les valeurs en arguments : logger.info(\"Mission %s\", mission_id).",
+                    id='logging.E001',
+                ))
+    return errors
+
+
+
+atexit.register(stop_listeners)
+if hasattr(os, 'register_at_fork'):
+    # Le thread d'écriture n'existe pas dans le processus enfant : il est arrêté avant le fork
+    # (la file est vidée) puis redémarré des deux côtés
+    os.register_at_fork(before=stop_listeners, after_in_parent=start_listeners, after_in_child=start_listeners)
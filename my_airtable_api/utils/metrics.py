@@ -0,0 +1,365 @@
+"""
+Métriques de l'application au format texte de Prometheus
+
+Chaque processus tient ses compteurs et histogrammes en mémoire (aucune entrée-sortie sur le
+chemin des requêtes) et les écrit, au plus toutes les METRICS['FLUSH_INTERVAL'] secondes, dans
+un fichier JSON qui lui est propre dans METRICS['DIRECTORY']. La vue /metrics additionne les
+fichiers de tous les workers : les compteurs des workers arrêtés restent comptés, les jauges
+(état des pools de connexions, retard des réplicas) ne sont lues que pour les processus vivants.
+
+Mesures :
+    http_requests_total, http_request_duration_seconds : par vue, méthode et statut.
+    db_queries_per_request, db_queries_total, db_query_duration_seconds_total : par vue.
+    template_render_duration_seconds : par template.
+    cache_requests_total : par cache (list_view, intervention_catalog) et résultat.
+"""
+import bisect
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.template.backends.django import DjangoTemplates, Template
+
+logger = logging.getLogger(__name__)
+
+# Bornes des histogrammes de durée (s), celles des clients Prometheus officiels
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+
+FLUSH_INTERVAL = 5.0
+
+
+def metrics_settings():
+    """Retourne la configuration des métriques, complétée des valeurs par défaut."""
+    config = getattr(settings, 'METRICS', {})
+    return {
+        'DIRECTORY': Path(config.get('DIRECTORY', Path(tempfile.gettempdir()) / 'my_airtable_api_metrics')),
+        'FLUSH_INTERVAL': config.get('FLUSH_INTERVAL', FLUSH_INTERVAL),
+        'ALLOWED_IPS': tuple(config.get('ALLOWED_IPS', ('127.0.0.1', '::1'))),
+    }
+
+
+class Metric:
+    """Mesure étiquetée : une valeur par combinaison d'étiquettes."""
+    kind = None
+
+    def __init__(self, registry, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = registry._lock
+        self._values = {}
+
+    def _key(self, labels):
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} : étiquettes attendues {self.labelnames}, reçues {labels}")
+        return tuple(str(label) for label in labels)
+
+    def describe(self):
+        return {'type': self.kind, 'help': self.documentation, 'labels': list(self.labelnames)}
+
+
+class Counter(Metric):
+    """Compteur croissant."""
+    kind = 'counter'
+
+    def inc(self, *labels, amount=1):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        return [[list(key), value] for key, value in self._values.items()]
+
+
+class Histogram(Metric):
+    """Histogramme cumulatif à bornes fixes, avec somme et nombre d'observations."""
+    kind = 'histogram'
+
+    def __init__(self, registry, name, documentation, labelnames=(), buckets=DURATION_BUCKETS):
+        super().__init__(registry, name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, *labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                # Une case par borne, plus la case +Inf, puis la somme
+                counts = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            counts[index] += 1
+            counts[-1] += value
+
+    def samples(self):
+        return [[list(key), list(counts)] for key, counts in self._values.items()]
+
+    def describe(self):
+        return {**super().describe(), 'buckets': list(self.buckets)}
+
+
+class MetricsRegistry:
+    """Ensemble des mesures du processus, écrit périodiquement dans son fichier."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}
+        self._collectors = []
+        self._flushed_at = 0.0
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(self, name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DURATION_BUCKETS):
+        return self._register(Histogram(self, name, documentation, labelnames, buckets))
+
+    def _register(self, metric):
+        self._metrics[metric.name] = metric
+        return metric
+
+    def register_collector(self, collector):
+        """Ajoute une fonction qui retourne des jauges, lue à chaque écriture du fichier.
+
+        Args:
+            collector (callable): Retourne {nom: {'help': str, 'labels': [...], 'samples': [[étiquettes, valeur]]}}.
+        """
+        self._collectors.append(collector)
+
+    def snapshot(self):
+        """Retourne l'état du processus, au format des fichiers de métriques."""
+        with self._lock:
+            metrics = {name: {**metric.describe(), 'samples': metric.samples()} for name, metric in self._metrics.items()}
+        gauges = {}
+        for collector in self._collectors:
+            try:
+                gauges.update(collector())
+            except Exception as e:
+                logger.warning("Jauges de %s non collectées : %s", getattr(collector, '__name__', collector), e)
+        return {'pid': os.getpid(), 'time': time.time(), 'metrics': metrics, 'gauges': gauges}
+
+    def flush(self, directory=None):
+        """Écrit l'état du processus dans son fichier (remplacement atomique)."""
+        directory = directory or metrics_settings()['DIRECTORY']
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f'metrics-{os.getpid()}.json'
+        tmp = path.with_suffix('.tmp')
+        tmp.write_text(json.dumps(self.snapshot(), separators=(',', ':')), encoding='utf-8')
+        os.replace(tmp, path)
+        self._flushed_at = time.monotonic()
+
+    def maybe_flush(self):
+        """Écrit le fichier du processus si la dernière écriture date de plus de FLUSH_INTERVAL."""
+        if time.monotonic() - self._flushed_at < metrics_settings()['FLUSH_INTERVAL']:
+            return
+        try:
+            self.flush()
+        except OSError as e:
+            logger.warning("Métriques non écrites : %s", e)
+            self._flushed_at = time.monotonic()
+
+    def reset(self):
+        """Remet les mesures à zéro (processus enfant après un fork)."""
+        self._lock = threading.Lock()
+        for metric in self._metrics.values():
+            metric._lock = self._lock
+            metric._values = {}
+        self._flushed_at = 0.0
+
+
+registry = MetricsRegistry()
+
+HTTP_REQUESTS = registry.counter('http_requests_total', "Requêtes HTTP traitées", ('view', 'method', 'status'))
+HTTP_DURATION = registry.histogram('http_request_duration_seconds', "Durée de traitement des requêtes HTTP", ('view', 'method'))
+DB_QUERIES_PER_REQUEST = registry.histogram('db_queries_per_request', "Requêtes SQL par requête HTTP", ('view',), QUERY_BUCKETS)
+DB_QUERIES = registry.counter('db_queries_total', "Requêtes SQL exécutées", ('view',))
+DB_DURATION = registry.counter('db_query_duration_seconds_total', "Temps passé en base de données", ('view',))
+TEMPLATE_DURATION = registry.histogram('template_render_duration_seconds', "Durée de rendu des templates", ('template',))
+CACHE_REQUESTS = registry.counter('cache_requests_total', "Lectures des caches applicatifs", ('cache', 'result'))
+
+
+def _database_gauges():
+    from my_airtable_api.db.router import replica_monitor
+    from my_airtable_api.utils.pool import pool_stats
+
+    pools = [
+        [[key, state], stats[state]] for key, stats in pool_stats().items() for state in ('idle', 'in_use', 'waiting')
+    ]
+    lags = [[[alias], lag] for alias, lag in replica_monitor.stats().items() if lag is not None]
+    return {
+        'db_pool_connections': {'help': "Connexions des pools, par état", 'labels': ['pool', 'state'], 'samples': pools},
+        'db_replica_lag_seconds': {'help': "Dernier retard de réplication mesuré", 'labels': ['replica'], 'samples': lags},
+    }
+
+
+registry.register_collector(_database_gauges)
+
+
+def _alive(pid):
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def collect(directory=None):
+    """Additionne les fichiers de métriques de tous les processus.
+
+    Args:
+        directory (Path, optional): Le dossier des fichiers. Defaults to METRICS['DIRECTORY'].
+
+    Returns:
+        dict: {nom: {'type', 'help', 'labels', 'buckets', 'samples': {étiquettes: valeur}}}.
+    """
+    directory = directory or metrics_settings()['DIRECTORY']
+    merged = {}
+    for path in sorted(directory.glob('metrics-*.json')):
+        try:
+            snapshot = json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            # Fichier supprimé ou remplacé pendant la lecture
+            continue
+        sections = [(snapshot['metrics'], None)]
+        if _alive(snapshot['pid']):
+            sections.append((snapshot['gauges'], 'gauge'))
+        for metrics, kind in sections:
+            for name, metric in metrics.items():
+                entry = merged.setdefault(name, {**metric, 'type': kind or metric['type'], 'samples': {}})
+                for labels, value in metric['samples']:
+                    key = tuple(labels)
+                    if isinstance(value, list):
+                        current = entry['samples'].get(key) or [0] * len(value)
+                        entry['samples'][key] = [a + b for a, b in zip(current, value)]
+                    else:
+                        entry['samples'][key] = entry['samples'].get(key, 0) + value
+    return merged
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in list(zip(names, values)) + list(extra)]
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _number(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_prometheus(merged):
+    """Met en forme les métriques additionnées au format texte de Prometheus (version 0.0.4).
+
+    Args:
+        merged (dict): Le résultat de collect().
+
+    Returns:
+        str: Le texte exposé par /metrics.
+    """
+    lines = []
+    for name in sorted(merged):
+        metric = merged[name]
+        lines.append(f"# HELP {name} {metric['help']}")
+        lines.append(f"# TYPE {name} {metric['type']}")
+        for key in sorted(metric['samples']):
+            value = metric['samples'][key]
+            if metric['type'] != 'histogram':
+                lines.append(f"{name}{_labels(metric['labels'], key)} {_number(value)}")
+                continue
+            cumulative = 0
+            for bound, count in zip(list(metric['buckets']) + [float('inf')], value[:-1]):
+                cumulative += count
+                lines.append(f"{name}_bucket{_labels(metric['labels'], key, [('le', _number(bound))])} {cumulative}")
+            lines.append(f"{name}_sum{_labels(metric['labels'], key)} {_number(value[-1])}")
+            lines.append(f"{name}_count{_labels(metric['labels'], key)} {cumulative}")
+    return '\n'.join(lines) + '\n'
+
+
+def clear_directory(directory=None):
+    """Supprime les fichiers de métriques (au démarrage du serveur : les processus précédents sont arrêtés)."""
+    directory = directory or metrics_settings()['DIRECTORY']
+    for path in directory.glob('metrics-*'):
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class MetricsMiddleware:
+    """Mesure la durée, le statut et les requêtes SQL de chaque requête HTTP, par vue.
+
+    Placé en tête de MIDDLEWARE ; le nombre de requêtes SQL vient de QueryBudgetMiddleware.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        start = time.perf_counter()
+        response = self.get_response(request)
+        self._record(request, response, time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        response = await self.get_response(request)
+        self._record(request, response, time.perf_counter() - start)
+        return response
+
+    def _record(self, request, response, duration):
+        match = request.resolver_match
+        # Les URL inconnues sont regroupées : le nombre de séries reste borné
+        view = match.view_name if match else 'aucune'
+        HTTP_REQUESTS.inc(view, request.method, response.status_code)
+        HTTP_DURATION.observe(duration, view, request.method)
+        counter = getattr(request, '_query_counter', None)
+        if counter is not None:
+            DB_QUERIES_PER_REQUEST.observe(counter.count, view)
+            DB_QUERIES.inc(view, amount=counter.count)
+            DB_DURATION.inc(view, amount=counter.duration)
+        registry.maybe_flush()
+
+
+class TimedTemplate(Template):
+    """Template Django dont la durée de rendu est mesurée."""
+
+    def render(self, context=None, request=None):
+        start = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            TEMPLATE_DURATION.observe(time.perf_counter() - start, self.template.origin.template_name or 'chaine')
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """Moteur de templates Django qui mesure la durée de rendu de chaque template."""
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        return TimedTemplate(super().get_template(template_name).template, self)
+
+
+if hasattr(os, 'register_at_fork'):
+    # Les mesures du processus parent ne doivent pas être comptées une seconde fois par l'enfant
+    os.register_at_fork(after_in_child=registry.reset)
@@ -0,0 +1,166 @@
+"""
+Pagination par curseur (keyset) pour les listes volumineuses
+"""
+import base64
+import json
+import logging
+from django.db.models import Q
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+NEXT = 'n'
+PREVIOUS = 'p'
+
+
+def get_page_size(params, param='taille'):
+    """Lit la taille de page demandée en la bornant entre 1 et MAX_PAGE_SIZE.
+
+    Args:
+        params (QueryDict): Les paramètres GET de la requête.
+        param (str, optional): Le nom du paramètre. Defaults to 'taille'.
+
+    Returns:
+        int: La taille de page à utiliser.
+    """
+    try:
+        size = int(params.get(param, DEFAULT_PAGE_SIZE))
+    except (TypeError, ValueError):
+        return DEFAULT_PAGE_SIZE
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+
+class KeysetPage:
+    """Une page de résultats avec les curseurs vers les pages voisines."""
+
+    def __init__(self, items, next_cursor, previous_cursor):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+
+class KeysetPaginator:
+    """Pagine un queryset sur un tuple de champs uniques et croissants.
+
+    Contrairement à la pagination par offset, le coût d'une page ne dépend pas de
+    sa position : chaque page est une lecture d'index bornée par les valeurs de la
+    dernière (ou première) ligne de la page voisine.
+    """
+
+    def __init__(self, queryset, ordering, page_size=DEFAULT_PAGE_SIZE):
+        """
+        Args:
+            queryset (QuerySet): Le queryset à paginer.
+            ordering (tuple): Les champs de tri, le dernier devant être unique (ex. 'id').
+            page_size (int, optional): Le nombre d'éléments par page. Defaults to DEFAULT_PAGE_SIZE.
+        """
+        self.queryset = queryset
+        self.ordering = tuple(ordering)
+        self.page_size = page_size
+        self.fields = [queryset.model._meta.get_field(name) for name in self.ordering]
+
+    def encode_cursor(self, obj, direction):
+        """Encode la position d'un objet dans un curseur opaque."""
+        values = [field.value_to_string(obj) for field in self.fields]
+        payload = json.dumps({'d': direction, 'v': values}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    def decode_cursor(self, cursor):
+        """Décode un curseur, ou retourne (None, None) s'il est invalide."""
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            values = [field.to_python(value) for field, value in zip(self.fields, payload['v'])]
+            if payload['d'] not in (NEXT, PREVIOUS) or len(values) != len(self.fields):
+                raise ValueError("curseur incomplet")
+            return payload['d'], values
+        except Exception as e:
+            logger.warning("Curseur de pagination invalide ignoré: %s", e)
+            return None, None
+
+    def _keyset_filter(self, values, lookup):
+        """Construit la condition (a, b, c) > (x, y, z) sous forme de Q."""
+        condition = Q()
+        for i, name in enumerate(self.ordering):
+            equal = {self.ordering[j]: values[j] for j in range(i)}
+            condition |= Q(**equal, **{f'{name}__{lookup}': values[i]})
+        return condition
+
+    def _page_queryset(self, direction, values):
+        """Construit la requête bornée d'une page (une ligne de plus pour savoir s'il y a une suite)."""
+        if direction == PREVIOUS:
+            reverse_ordering = [f'-{name}' for name in self.ordering]
+            queryset = self.queryset.filter(self._keyset_filter(values, 'lt')).order_by(*reverse_ordering)
+        else:
+            queryset = self.queryset.order_by(*self.ordering)
+            if direction == NEXT:
+                queryset = queryset.filter(self._keyset_filter(values, 'gt'))
+        return queryset[:self.page_size + 1]
+
+    def _make_page(self, direction, rows):
+        """Construit la page et ses curseurs à partir des lignes lues."""
+        if direction == PREVIOUS:
+            has_previous = len(rows) > self.page_size
+            items = rows[:self.page_size][::-1]
+            has_next = True
+        else:
+            has_next = len(rows) > self.page_size
+            items = rows[:self.page_size]
+            has_previous = direction == NEXT
+
+        next_cursor = self.encode_cursor(items[-1], NEXT) if items and has_next else None
+        previous_cursor = self.encode_cursor(items[0], PREVIOUS) if items and has_previous else None
+        return KeysetPage(items, next_cursor, previous_cursor)
+
+    def page(self, cursor=None):
+        """Retourne la page désignée par le curseur (la première page si absent).
+
+        Args:
+            cursor (str, optional): Le curseur reçu dans la requête. Defaults to None.
+
+        Returns:
+            KeysetPage: La page avec ses curseurs suivant et précédent.
+        """
+        direction, values = self.decode_cursor(cursor) if cursor else (None, None)
+        return self._make_page(direction, list(self._page_queryset(direction, values)))
+
+    async def apage(self, cursor=None):
+        """Version asynchrone de page(), lue avec l'ORM asynchrone.
+
+        Args:
+            cursor (str, optional): Le curseur reçu dans la requête. Defaults to None.
+
+        Returns:
+            KeysetPage: La page avec ses curseurs suivant et précédent.
+        """
+        direction, values = self.decode_cursor(cursor) if cursor else (None, None)
+        rows = [row async for row in self._page_queryset(direction, values)]
+        return self._make_page(direction, rows)
+
+
+def cursor_querystring(params, param, cursor, **extra):
+    """Construit la chaîne de requête vers une autre page en conservant les filtres.
+
+    Args:
+        params (QueryDict): Les paramètres GET de la requête courante.
+        param (str): Le nom du paramètre de curseur à remplacer.
+        cursor (str): Le nouveau curseur (None pour aucun lien).
+        **extra: Paramètres supplémentaires à positionner (ex. onglet).
+
+    Returns:
+        str: La chaîne de requête encodée, ou None si le curseur est absent.
+    """
+    if not cursor:
+        return None
+    query = params.copy()
+    query[param] = cursor
+    for key, value in extra.items():
+        query[key] = value
+    return query.urlencode()
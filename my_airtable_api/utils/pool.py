@@ -0,0 +1,307 @@
+"""
+Pool de connexions à la base de données, par processus
+
+Le pool garde ouvertes les connexions rendues en fin de requête et les prête aux requêtes
+suivantes : l'établissement d'une connexion (TCP, authentification, paramétrage) n'est payé
+qu'une fois. Il est borné (une requête attend qu'une connexion se libère, au plus `timeout`
+secondes), vérifie les connexions au moment du prêt et ferme celles qui sont restées inutilisées
+trop longtemps ou qui ont dépassé leur durée de vie.
+
+Les compteurs (connexions prêtées, attentes, durée d'obtention…) sont retournés par pool_stats().
+"""
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+from django.db.utils import OperationalError
+
+logger = logging.getLogger(__name__)
+
+MAX_SIZE = 10
+TIMEOUT = 10.0
+MAX_IDLE = 300.0
+MAX_LIFETIME = 3600.0
+# Au-delà de cette inactivité, une connexion est testée par une requête avant d'être prêtée
+CHECK_AFTER = 30.0
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class PoolTimeout(OperationalError):
+    """Levée lorsqu'aucune connexion ne s'est libérée dans le délai imparti."""
+
+
+class ConnectionPool:
+    """Pool borné de connexions DB-API, sûr entre threads."""
+
+    def __init__(self, alias, check, reset, max_size=MAX_SIZE, timeout=TIMEOUT,
+                 max_idle=MAX_IDLE, max_lifetime=MAX_LIFETIME, check_after=CHECK_AFTER):
+        """
+        Args:
+            alias (str): Le nom du pool dans les logs et les statistiques.
+            check (callable): check(connexion, requete) retourne False si la connexion est inutilisable ;
+                `requete` indique qu'un aller-retour avec le serveur est demandé.
+            reset (callable): Remet une connexion rendue dans un état propre (annule la transaction en cours).
+            max_size (int, optional): Le nombre maximal de connexions ouvertes. Defaults to MAX_SIZE.
+            timeout (float, optional): L'attente maximale d'une connexion libre (s). Defaults to TIMEOUT.
+            max_idle (float, optional): L'inactivité au-delà de laquelle une connexion est fermée (s). Defaults to MAX_IDLE.
+            max_lifetime (float, optional): La durée de vie maximale d'une connexion (s). Defaults to MAX_LIFETIME.
+            check_after (float, optional): L'inactivité au-delà de laquelle une connexion est testée (s). Defaults to CHECK_AFTER.
+        """
+        self.alias = alias
+        self._check = check
+        self._reset = reset
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+        self.check_after = check_after
+        self._init_state()
+
+    def _init_state(self):
+        self._lock = threading.Lock()
+        # Demandeurs en attente, dans l'ordre d'arrivée
+        self._waiters = deque()
+        # Connexions libres : (connexion, date de création, date de restitution), la plus récente à droite
+        self._idle = deque()
+        # Connexions prêtées : id(connexion) -> date de création
+        self._in_use = {}
+        self._opening = 0
+        self.counters = {
+            'checkouts': 0, 'waits': 0, 'timeouts': 0, 'created': 0, 'closed': 0,
+            'failed_checks': 0, 'checkout_seconds': 0.0, 'checkout_max_seconds': 0.0,
+        }
+
+    @property
+    def size(self):
+        return len(self._idle) + len(self._in_use) + self._opening
+
+    def _close(self, connection, raison):
+        with self._lock:
+            self.counters['closed'] += 1
+        logger.debug("Pool %s : connexion fermée (%s)", self.alias, raison)
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def _reap(self, now):
+        """Retire les connexions libres expirées ; à appeler sous le verrou. Retourne celles à fermer."""
+        expirees = []
+        # Les plus anciennes restitutions sont à gauche
+        while self._idle and now - self._idle[0][2] > self.max_idle:
+            expirees.append(self._idle.popleft()[0])
+        return expirees
+
+    def _hand_over(self, entree=None):
+        """Donne une connexion libre (ou, sans connexion, une place pour en ouvrir une) au plus ancien
+        demandeur en attente ; à appeler sous le verrou. Retourne False si personne n'attend."""
+        if not self._waiters:
+            return False
+        waiter = self._waiters.popleft()
+        waiter['entree'] = entree
+        if entree is None:
+            self._opening += 1
+        else:
+            self._in_use[id(entree[0])] = entree[1]
+        waiter['event'].set()
+        return True
+
+    def _acquire(self):
+        """Réserve une connexion libre ou une place, en attendant son tour si le pool est plein.
+
+        Returns:
+            tuple: (connexion, date de création, date de restitution), ou None pour ouvrir une connexion.
+        """
+        entree = None
+        waiter = None
+        with self._lock:
+            expirees = self._reap(time.monotonic())
+            # Les demandeurs en attente sont servis avant les nouveaux, dans l'ordre d'arrivée
+            if self._idle and not self._waiters:
+                # La plus récemment utilisée : les autres finissent par expirer si la charge baisse
+                entree = self._idle.pop()
+                self._in_use[id(entree[0])] = entree[1]
+            elif self.size < self.max_size and not self._waiters:
+                self._opening += 1
+            else:
+                waiter = {'event': threading.Event(), 'entree': None}
+                self._waiters.append(waiter)
+                self.counters['waits'] += 1
+        for connection in expirees:
+            self._close(connection, 'inactive')
+        if waiter is None:
+            return entree
+
+        if not waiter['event'].wait(self.timeout):
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                    self.counters['timeouts'] += 1
+                    raise PoolTimeout(
+                        f"Pool {self.alias} : aucune connexion libre après {self.timeout}s "
+                        f"({self.max_size} connexions prêtées)"
+                    )
+        # Servi, éventuellement juste à l'expiration du délai
+        return waiter['entree']
+
+    def _open(self, connect):
+        """Ouvre une connexion sur une place réservée (_opening)."""
+        try:
+            connection = connect()
+        except Exception:
+            with self._lock:
+                self._opening -= 1
+                self._hand_over()
+            raise
+        with self._lock:
+            self._opening -= 1
+            self._in_use[id(connection)] = time.monotonic()
+            self.counters['created'] += 1
+        return connection
+
+    def checkout(self, connect):
+        """Prête une connexion : une connexion libre, une nouvelle connexion, ou après attente.
+
+        Args:
+            connect (callable): Ouvre une nouvelle connexion si le pool n'en a pas de libre.
+
+        Raises:
+            PoolTimeout: Si aucune connexion ne s'est libérée dans le délai.
+
+        Returns:
+            object: La connexion DB-API.
+        """
+        debut = time.perf_counter()
+        entree = self._acquire()
+        if entree is None:
+            connection = self._open(connect)
+        else:
+            connection, cree, restituee = entree
+            if not self._check(connection, time.monotonic() - restituee > self.check_after):
+                with self._lock:
+                    # La place de la connexion inutilisable sert à en ouvrir une nouvelle
+                    del self._in_use[id(connection)]
+                    self._opening += 1
+                    self.counters['failed_checks'] += 1
+                self._close(connection, 'inutilisable')
+                connection = self._open(connect)
+
+        duree = time.perf_counter() - debut
+        with self._lock:
+            self.counters['checkouts'] += 1
+            self.counters['checkout_seconds'] += duree
+            self.counters['checkout_max_seconds'] = max(self.counters['checkout_max_seconds'], duree)
+        return connection
+
+    def checkin(self, connection):
+        """Rend une connexion au pool (ou la ferme si elle est inutilisable ou trop ancienne).
+
+        Args:
+            connection (object): La connexion prêtée par checkout.
+        """
+        with self._lock:
+            cree = self._in_use.pop(id(connection), None)
+        if cree is None:
+            # Connexion déjà rendue, ou ouverte avant un fork
+            self._close(connection, 'inconnue')
+            return
+        utilisable = True
+        try:
+            self._reset(connection)
+        except Exception as e:
+            logger.warning("Pool %s : connexion non réinitialisable (%s)", self.alias, e)
+            utilisable = False
+        now = time.monotonic()
+        if utilisable and now - cree < self.max_lifetime and self._check(connection, False):
+            with self._lock:
+                if not self._hand_over((connection, cree, now)):
+                    self._idle.append((connection, cree, now))
+            return
+        self._close(connection, 'expirée' if utilisable else 'inutilisable')
+        with self._lock:
+            self._hand_over()
+
+    def discard(self, connection):
+        """Ferme une connexion prêtée au lieu de la rendre au pool.
+
+        Args:
+            connection (object): La connexion prêtée par checkout.
+        """
+        with self._lock:
+            if self._in_use.pop(id(connection), None) is not None:
+                self._hand_over()
+        self._close(connection, 'écartée')
+
+    def close_idle(self):
+        """Ferme toutes les connexions libres (les connexions prêtées ne sont pas touchées)."""
+        with self._lock:
+            idle = [entree[0] for entree in self._idle]
+            self._idle.clear()
+        for connection in idle:
+            self._close(connection, 'fermeture du pool')
+
+    def stats(self):
+        """Retourne l'état et les compteurs du pool.
+
+        Returns:
+            dict: Taille, connexions libres et prêtées, compteurs et durée moyenne d'obtention.
+        """
+        with self._lock:
+            counters = dict(self.counters)
+            stats = {
+                'alias': self.alias, 'max_size': self.max_size, 'size': self.size,
+                'idle': len(self._idle), 'in_use': len(self._in_use), 'waiting': len(self._waiters),
+            }
+        stats.update(counters)
+        stats['checkout_avg_ms'] = (
+            counters['checkout_seconds'] / counters['checkouts'] * 1000 if counters['checkouts'] else 0.0
+        )
+        return stats
+
+
+def get_pool(key, factory):
+    """Retourne le pool d'une base de données, créé au premier appel dans le processus.
+
+    Args:
+        key (str): La clé du pool (alias et nom de la base).
+        factory (callable): Crée le pool s'il n'existe pas encore.
+
+    Returns:
+        ConnectionPool: Le pool de la base.
+    """
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = _pools[key] = factory()
+    return pool
+
+
+def pool_stats():
+    """Retourne les statistiques de tous les pools du processus.
+
+    Returns:
+        dict: {clé du pool: statistiques}.
+    """
+    return {key: pool.stats() for key, pool in list(_pools.items())}
+
+
+def _before_fork():
+    # Une connexion partagée entre deux processus mélangerait leurs échanges avec le serveur
+    for pool in list(_pools.values()):
+        pool.close_idle()
+
+
+def _after_fork_in_child():
+    # Les connexions encore référencées appartiennent au parent : le pool repart de zéro
+    for pool in list(_pools.values()):
+        pool._init_state()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(before=_before_fork, after_in_child=_after_fork_in_child)
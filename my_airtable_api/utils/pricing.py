@@ -0,0 +1,143 @@
+"""
+Calcul du coût des lignes de mission (MissionIntervention), en arithmétique décimale exacte
+
+Le coût d'une ligne est le forfait de l'intervention si elle est au forfait, sinon son prix
+unitaire multiplié par le coefficient du taux. Une durée supplémentaire positive multiplie
+ce coût. Le résultat est arrondi au centime (arrondi commercial).
+"""
+import logging
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from django.db import transaction
+from mission.models import Intervention, MissionIntervention, Taux
+from my_airtable_api.utils.summary import refresh_mission_summaries
+from my_airtable_api.utils.cache import invalidate_list_cache
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 2000
+
+CENTIME = Decimal('0.01')
+
+# Coefficient appliqué au prix unitaire pour chaque taux
+TAUX_COEFFICIENTS = {
+    Taux.HORAIRE.name: Decimal('1.0'),
+    Taux.T1.name: Decimal('1.5'),
+    Taux.T2.name: Decimal('2.0'),
+    Taux.T3.name: Decimal('2.5'),
+}
+
+
+def to_decimal(value):
+    """Convertit une valeur (str, int, float, Decimal, None) en Decimal sans erreur de représentation.
+
+    Args:
+        value: La valeur à convertir ; None et '' valent 0.
+
+    Raises:
+        ValueError: Si la valeur n'est pas un nombre.
+
+    Returns:
+        Decimal: La valeur convertie.
+    """
+    if value is None or value == '':
+        return Decimal(0)
+    if isinstance(value, Decimal):
+        return value
+    try:
+        # str() évite de propager l'erreur binaire des flottants (0.1 -> 0.1000000000000000055...)
+        return Decimal(str(value))
+    except InvalidOperation:
+        raise ValueError(f"Valeur numérique invalide : {value!r}")
+
+
+def price_line(intervention, taux, duree_supplementaire=0):
+    """Calcule le coût d'une ligne de mission.
+
+    Args:
+        intervention (Intervention): L'intervention facturée (is_forfait, forfait, prix_unitaire).
+        taux (str): Le nom du taux (HORAIRE, T1, T2, T3).
+        duree_supplementaire (Decimal | float | str, optional): La durée supplémentaire. Defaults to 0.
+
+    Raises:
+        ValueError: Si le taux est inconnu ou la durée invalide.
+
+    Returns:
+        Decimal: Le coût de la ligne, arrondi au centime.
+    """
+    try:
+        coefficient = TAUX_COEFFICIENTS[taux]
+    except KeyError:
+        raise ValueError(f"Taux inconnu : {taux!r}")
+
+    if intervention.is_forfait:
+        cout = to_decimal(intervention.forfait)
+    else:
+        cout = to_decimal(intervention.prix_unitaire) * coefficient
+    duree = to_decimal(duree_supplementaire)
+    if duree > 0:
+        cout *= duree
+    return cout.quantize(CENTIME, rounding=ROUND_HALF_UP)
+
+
+def price_lines(lines):
+    """Calcule le coût d'une liste de lignes en un seul appel.
+
+    Args:
+        lines (iterable): Des tuples (intervention, taux, duree_supplementaire).
+
+    Raises:
+        ValueError: Si un taux ou une durée est invalide.
+
+    Returns:
+        tuple: (liste des coûts dans l'ordre des lignes, total) en Decimal.
+    """
+    couts = [price_line(intervention, taux, duree) for intervention, taux, duree in lines]
+    return couts, sum(couts, Decimal('0.00'))
+
+
+def reprice_interventions(intervention_ids, chunk_size=CHUNK_SIZE):
+    """Recalcule le coût des lignes de mission des interventions données (après un changement de tarif).
+
+    Les lignes sont parcourues et mises à jour par lots (bulk_update) ; seules celles dont le coût
+    change sont écrites. Les résumés des missions concernées sont ensuite recalculés.
+
+    Args:
+        intervention_ids (iterable): Les identifiants des interventions dont le tarif a changé.
+        chunk_size (int, optional): Le nombre de lignes lues et écrites par lot. Defaults to CHUNK_SIZE.
+
+    Returns:
+        int: Le nombre de lignes dont le coût a été modifié.
+    """
+    interventions = Intervention.objects.in_bulk(set(intervention_ids))
+    if not interventions:
+        return 0
+
+    lignes = (
+        MissionIntervention.objects
+        .filter(intervention_id__in=interventions.keys())
+        .only('id', 'mission_id', 'intervention_id', 'taux', 'duree_supplementaire', 'cout_total')
+        .order_by('id')
+    )
+    modifiees = []
+    missions = set()
+    total = 0
+    with transaction.atomic():
+        for ligne in lignes.iterator(chunk_size=chunk_size):
+            cout = price_line(interventions[ligne.intervention_id], ligne.taux, ligne.duree_supplementaire)
+            if cout == ligne.cout_total:
+                continue
+            ligne.cout_total = cout
+            modifiees.append(ligne)
+            missions.add(ligne.mission_id)
+            if len(modifiees) >= chunk_size:
+                total += MissionIntervention.objects.bulk_update(modifiees, ['cout_total'])
+                modifiees = []
+        if modifiees:
+            total += MissionIntervention.objects.bulk_update(modifiees, ['cout_total'])
+        if missions:
+            refresh_mission_summaries(missions)
+            invalidate_list_cache()
+
+    logger.info("Repricing de %d intervention(s) : %d ligne(s) modifiée(s) sur %d mission(s)",
+                len(interventions), total, len(missions))
+    return total
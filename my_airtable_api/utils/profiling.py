@@ -0,0 +1,219 @@
+"""
+Profilage par échantillonnage des requêtes lentes, au format « collapsed stacks »
+
+Actif seulement si PROFILING['ENABLED'] : une fraction des requêtes (PROFILING['SAMPLE_RATE']),
+ainsi que les requêtes d'un utilisateur staff qui portent l'en-tête PROFILING['HEADER'], sont
+profilées. Pendant l'exécution de la vue, un thread relève la pile du thread de la requête toutes
+les PROFILING['INTERVAL'] secondes (sys._current_frames) ; la vue elle-même n'est pas ralentie,
+contrairement à sys.setprofile, et l'échantillonnage fonctionne dans les threads des workers,
+contrairement à un minuteur signal.ITIMER_PROF réservé au thread principal.
+
+Chaque profil est écrit dans PROFILING['DIRECTORY'] (PROFILE_DIR, par défaut dans le dossier
+temporaire du système), un fichier par requête nommé d'après la vue, une ligne par pile :
+`vue;module:fonction;…;module:fonction nombre`. Le dossier est limité aux PROFILING['MAX_FILES']
+fichiers les plus récents. Pour produire un flamegraph :
+
+    cat /tmp/my_airtable_api_profiles/*list_view*.collapsed | flamegraph.pl > list_view.svg
+"""
+import itertools
+import logging
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+logger = logging.getLogger(__name__)
+
+INTERVAL = 0.005
+MAX_FILES = 200
+HEADER = 'X-Profile'
+
+# Numéro des profils écrits par le processus, pour des noms de fichiers uniques
+_sequence = itertools.count(1)
+
+
+def profiling_settings():
+    """Retourne la configuration du profilage, complétée des valeurs par défaut."""
+    config = getattr(settings, 'PROFILING', {})
+    return {
+        'ENABLED': config.get('ENABLED', False),
+        'SAMPLE_RATE': config.get('SAMPLE_RATE', 0.0),
+        'HEADER': config.get('HEADER', HEADER),
+        'INTERVAL': config.get('INTERVAL', INTERVAL),
+        'DIRECTORY': Path(config.get('DIRECTORY', Path(tempfile.gettempdir()) / 'my_airtable_api_profiles')),
+        'MAX_FILES': config.get('MAX_FILES', MAX_FILES),
+    }
+
+
+def _frame_label(frame):
+    return f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_name}"
+
+
+class StackSampler:
+    """Relève périodiquement la pile d'un thread et compte les piles observées."""
+
+    def __init__(self, thread_id, interval=INTERVAL, base_frame=None):
+        """
+        Args:
+            thread_id (int): L'identifiant du thread échantillonné.
+            interval (float, optional): L'intervalle entre deux relevés (s). Defaults to INTERVAL.
+            base_frame (frame, optional): Les frames de cette pile d'appel (serveur, middlewares)
+                sont retirées des relevés. Defaults to None.
+        """
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self.started = None
+        self._base = set()
+        while base_frame is not None:
+            self._base.add(id(base_frame))
+            base_frame = base_frame.f_back
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='profiler', daemon=True)
+
+    def _sample(self):
+        frame = sys._current_frames().get(self.thread_id)
+        labels = []
+        while frame is not None:
+            if id(frame) not in self._base:
+                labels.append(_frame_label(frame))
+            frame = frame.f_back
+        if labels:
+            self.stacks[';'.join(reversed(labels))] += 1
+            self.samples += 1
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self):
+        self.started = time.perf_counter()
+        self._thread.start()
+
+    def stop(self):
+        """Arrête l'échantillonnage et retourne la durée profilée (s)."""
+        self._stop.set()
+        self._thread.join()
+        return time.perf_counter() - self.started
+
+
+def write_collapsed(directory, view_name, stacks, max_files=MAX_FILES):
+    """Écrit un profil au format collapsed stacks et limite le nombre de fichiers du dossier.
+
+    Args:
+        directory (Path): Le dossier des profils.
+        view_name (str): Le nom de la vue, en tête de chaque pile et dans le nom du fichier.
+        stacks (Counter): Le nombre de relevés par pile.
+        max_files (int, optional): Le nombre de profils conservés. Defaults to MAX_FILES.
+
+    Returns:
+        Path: Le fichier écrit.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    tag = re.sub(r'[^\w.-]', '_', view_name) or 'inconnue'
+    path = directory / f"{time.strftime('%Y%m%d-%H%M%S')}-{tag}-{os.getpid()}-{next(_sequence)}.collapsed"
+    with open(path, 'w', encoding='utf-8') as f:
+        for stack, count in stacks.most_common():
+            f.write(f"{tag};{stack} {count}\n")
+
+    profiles = sorted(directory.glob('*.collapsed'), key=lambda p: p.stat().st_mtime)
+    for old in profiles[:max(len(profiles) - max_files, 0)]:
+        try:
+            old.unlink()
+        except FileNotFoundError:
+            # Déjà supprimé par un autre worker
+            pass
+    return path
+
+
+class SamplingProfilerMiddleware:
+    """Profile par échantillonnage une partie des requêtes et écrit un fichier par requête profilée.
+
+    Le profilage commence avant l'appel de la vue (process_view), une fois l'utilisateur authentifié.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        config = profiling_settings()
+        if not config['ENABLED']:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.config = config
+        # En-tête HTTP tel qu'il apparaît dans request.META
+        self.meta_header = 'HTTP_' + config['HEADER'].upper().replace('-', '_')
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            sampler = getattr(request, '_profiler', None)
+            if sampler is not None:
+                duration = sampler.stop()
+        if sampler is not None:
+            self._finish(request, response, sampler, duration)
+        return response
+
+    async def __acall__(self, request):
+        # process_view est exécuté dans un thread par sync_to_async : la vue, elle, tourne dans
+        # la boucle d'événements, c'est ce thread qui est échantillonné (sous WSGI, une vue
+        # asynchrone tourne dans une boucle à part et le profil ne montre que l'attente)
+        request._profiled_thread = threading.get_ident()
+        try:
+            response = await self.get_response(request)
+        finally:
+            sampler = getattr(request, '_profiler', None)
+            if sampler is not None:
+                duration = sampler.stop()
+        if sampler is not None:
+            self._finish(request, response, sampler, duration)
+        return response
+
+    def _requested(self, request):
+        if self.meta_header not in request.META:
+            return False
+        user = getattr(request, 'user', None)
+        return bool(user is not None and user.is_staff)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        requested = self._requested(request)
+        if not requested and random.random() >= self.config['SAMPLE_RATE']:
+            return None
+        thread_id = getattr(request, '_profiled_thread', None)
+        if thread_id is None:
+            sampler = StackSampler(threading.get_ident(), self.config['INTERVAL'], base_frame=sys._getframe(1))
+        else:
+            sampler = StackSampler(thread_id, self.config['INTERVAL'])
+        sampler.requested = requested
+        request._profiler = sampler
+        sampler.start()
+        return None
+
+    def _finish(self, request, response, sampler, duration):
+        match = request.resolver_match
+        view_name = (match.url_name or match.view_name) if match else ''
+        try:
+            path = write_collapsed(self.config['DIRECTORY'], view_name, sampler.stacks, self.config['MAX_FILES'])
+        except OSError as e:
+            logger.warning("Profil de %s non écrit : %s", request.path, e)
+            return
+        logger.info(
+            "Profil %s : vue %s, %d relevé(s) en %.1f ms", path.name, view_name, sampler.samples, duration * 1000,
+            extra={'profile': path.name, 'view': view_name, 'samples': sampler.samples},
+        )
+        if sampler.requested:
+            response[self.config['HEADER']] = path.name
@@ -0,0 +1,157 @@
+"""
+Comptage des requêtes SQL par requête HTTP et budgets de requêtes par vue
+
+Le middleware installe un `execute_wrapper` sur chaque connexion pendant le traitement de
+la requête. Il publie le nombre de requêtes et le temps passé en base dans l'en-tête
+`Server-Timing` et dans les logs. Une vue décorée par `@query_budget(n)` qui dépasse son
+budget produit un avertissement, ou une exception QueryBudgetExceeded si
+QUERY_BUDGET_STRICT est actif (tests).
+
+Pour une réponse en flux (StreamingHttpResponse synchrone), les requêtes exécutées pendant
+l'envoi du contenu sont aussi comptées et journalisées à la fin du flux. Le budget et
+`Server-Timing` ne portent que sur la partie calculée avant l'envoi : les en-têtes sont déjà
+partis, et le nombre de requêtes du flux dépend de la taille des données.
+"""
+import logging
+import time
+from contextlib import ExitStack
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Levée en mode strict lorsqu'une vue exécute plus de requêtes que son budget."""
+
+
+class QueryCounter:
+    """Wrapper d'exécution qui compte les requêtes et cumule leur durée."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+def query_budget(max_queries):
+    """Déclare le nombre maximal de requêtes SQL d'une vue.
+
+    Args:
+        max_queries (int): Le budget de requêtes de la vue.
+
+    Returns:
+        callable: Le décorateur de vue.
+    """
+    def decorator(view_func):
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def wrapper(*args, **kwargs):
+                return await view_func(*args, **kwargs)
+        else:
+            @wraps(view_func)
+            def wrapper(*args, **kwargs):
+                return view_func(*args, **kwargs)
+        wrapper.query_budget = max_queries
+        return wrapper
+    return decorator
+
+
+class QueryBudgetMiddleware:
+    """Mesure les requêtes SQL de chaque requête HTTP et contrôle le budget de la vue."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.strict = getattr(settings, 'QUERY_BUDGET_STRICT', False)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    @staticmethod
+    def _install(stack, counter):
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(counter))
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        counter = QueryCounter()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            self._install(stack, counter)
+            response = self.get_response(request)
+        response = self._finish(request, response, counter, time.perf_counter() - start)
+        if response.streaming and not response.is_async:
+            response.streaming_content = self._count_stream(request, response.streaming_content, counter, start)
+        return response
+
+    def _count_stream(self, request, content, counter, start):
+        """Compte les requêtes exécutées pendant l'envoi d'une réponse en flux."""
+        avant_flux = counter.count
+        with ExitStack() as stack:
+            self._install(stack, counter)
+            yield from content
+        match = request.resolver_match
+        logger.info(
+            "path=%s view=%s stream_queries=%d queries=%d db_ms=%.1f total_ms=%.1f",
+            request.path, match.view_name if match else '', counter.count - avant_flux, counter.count,
+            counter.duration * 1000, (time.perf_counter() - start) * 1000,
+            extra={
+                'path': request.path, 'view': match.view_name if match else '',
+                'stream_queries': counter.count - avant_flux, 'queries': counter.count,
+                'db_ms': round(counter.duration * 1000, 1),
+            },
+        )
+
+    async def __acall__(self, request):
+        counter = QueryCounter()
+        start = time.perf_counter()
+        stack = ExitStack()
+        await sync_to_async(self._install)(stack, counter)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        return self._finish(request, response, counter, time.perf_counter() - start)
+
+    def _finish(self, request, response, counter, total):
+        match = request.resolver_match
+        view_name = match.view_name if match else ''
+        budget = getattr(request, '_query_budget', None)
+        # Lu par MetricsMiddleware
+        request._query_counter = counter
+
+        response['Server-Timing'] = (
+            f'db;dur={counter.duration * 1000:.1f};desc="{counter.count} requetes", app;dur={total * 1000:.1f}'
+        )
+        logger.info(
+            "path=%s view=%s status=%s queries=%d db_ms=%.1f total_ms=%.1f budget=%s",
+            request.path, view_name, response.status_code, counter.count, counter.duration * 1000,
+            total * 1000, budget,
+            extra={
+                'path': request.path, 'view': view_name, 'status': response.status_code,
+                'queries': counter.count, 'db_ms': round(counter.duration * 1000, 1),
+                'total_ms': round(total * 1000, 1), 'budget': budget,
+            },
+        )
+
+        if budget is not None and counter.count > budget:
+            message = f"{view_name or request.path} : {counter.count} requêtes SQL pour un budget de {budget}"
+            if self.strict:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._query_budget = getattr(view_func, 'query_budget', None)
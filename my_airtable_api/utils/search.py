@@ -0,0 +1,187 @@
+"""
+Recherche de sous-chaînes indexée pour les filtres client et véhicule
+
+Sur PostgreSQL, les filtres passent par l'opérateur ILIKE, servi par des index GIN
+pg_trgm créés par la migration 0006_search_indexes. Sur SQLite, ils interrogent des tables
+FTS5 (tokenizer trigram) tenues à jour par des triggers à chaque écriture. Les autres
+moteurs, ou les termes trop courts pour être découpés en trigrammes, retombent sur `icontains`.
+
+Sur SQLite, une migration qui modifie une colonne d'une table indexée (AlterField, RemoveField...)
+recrée la table : les triggers disparaissent avec l'ancienne table et l'index n'est plus tenu à
+jour. La vérification système `search.E001` (`manage.py check --database default`) détecte les
+triggers manquants, et `manage.py rebuild_search_indexes` les recrée.
+"""
+import logging
+from django.core.checks import Error, Tags, register
+from django.db import connections
+from django.db.models import CharField, Lookup, Q
+from django.db.models.expressions import RawSQL
+
+logger = logging.getLogger(__name__)
+
+# Un trigramme ne peut pas être extrait d'un terme plus court
+MIN_TRIGRAM_LENGTH = 3
+
+# Colonnes indexées par table
+SEARCH_COLUMNS = {
+    'mission_client': ('nom', 'prenom'),
+    'mission_vehicule': ('marque', 'modele', 'immatriculation'),
+}
+
+# Triggers qui tiennent une table FTS5 à jour : insertion, suppression, modification
+TRIGGER_SUFFIXES = ('ai', 'ad', 'au')
+
+_fts_tables = {}
+
+
+@CharField.register_lookup
+class TrigramIContains(Lookup):
+    """Lookup `trgm_icontains` : `col ILIKE '%terme%'`, servi par un index GIN gin_trgm_ops.
+
+    Le `icontains` de Django génère `UPPER(col::text) LIKE UPPER(...)`, que ces index
+    ne couvrent pas. Ce lookup n'est utilisé que sur PostgreSQL.
+    """
+    lookup_name = 'trgm_icontains'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        rhs_params = ['%%%s%%' % connection.ops.prep_for_like_query(param) for param in rhs_params]
+        return f"{lhs} ILIKE {rhs}", (*lhs_params, *rhs_params)
+
+
+def _trigger_sql(table, suffix):
+    """Retourne l'instruction CREATE TRIGGER qui reporte une écriture de la table dans sa table FTS5."""
+    fts = f"{table}_fts"
+    columns = SEARCH_COLUMNS[table]
+    cols = ", ".join(columns)
+    new_values = ", ".join(f"new.{column}" for column in columns)
+    old_values = ", ".join(f"old.{column}" for column in columns)
+    insert = f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_values});"
+    delete = f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_values});"
+    body = {'ai': insert, 'ad': delete, 'au': f"{delete} {insert}"}[suffix]
+    event = {'ai': 'INSERT', 'ad': 'DELETE', 'au': 'UPDATE'}[suffix]
+    return f"CREATE TRIGGER IF NOT EXISTS {table}_fts_{suffix} AFTER {event} ON {table} BEGIN {body} END"
+
+
+def missing_search_triggers(using='default'):
+    """Liste les triggers de synchronisation FTS5 absents (toujours vide hors SQLite).
+
+    Args:
+        using (str, optional): L'alias de la base de données. Defaults to 'default'.
+
+    Returns:
+        list: Les noms des triggers manquants des tables dont la table FTS5 existe.
+    """
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+        existing = {row[0] for row in cursor.fetchall()}
+    return [
+        f"{table}_fts_{suffix}"
+        for table in SEARCH_COLUMNS if _has_fts_table(connection, table)
+        for suffix in TRIGGER_SUFFIXES if f"{table}_fts_{suffix}" not in existing
+    ]
+
+
+def rebuild_search_indexes(using='default'):
+    """Recrée les triggers FTS5 manquants puis reconstruit les tables FTS5 SQLite (sans effet sur les autres moteurs).
+
+    Args:
+        using (str, optional): L'alias de la base de données. Defaults to 'default'.
+
+    Returns:
+        list: Les noms des triggers recréés.
+    """
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return []
+    missing = missing_search_triggers(using)
+    with connection.cursor() as cursor:
+        for name in missing:
+            table, suffix = name.rsplit('_fts_', 1)
+            cursor.execute(_trigger_sql(table, suffix))
+        for table in SEARCH_COLUMNS:
+            if _has_fts_table(connection, table):
+                cursor.execute(f"INSERT INTO {table}_fts({table}_fts) VALUES ('rebuild')")
+    if missing:
+        logger.warning("Triggers de recherche recréés : %s", ", ".join(missing))
+    return missing
+
+
+@register(Tags.database)
+def check_search_triggers(app_configs, databases=None, **kwargs):
+    """Vérification système : les triggers qui tiennent les tables FTS5 à jour existent."""
+    errors = []
+    for alias in databases or ():
+        missing = missing_search_triggers(alias)
+        if missing:
+            errors.append(Error(
+                f"Triggers de recherche manquants sur la base {alias!r} : {', '.join(missing)}",
+                hint=f"Lancer `manage.py rebuild_search_indexes --database {alias}` "
+                     "(une migration a probablement recréé la table).",
+                id='search.E001',
+            ))
+    return errors
+
+
+def _has_fts_table(connection, table):
+    """Indique si la table FTS5 d'une table existe (résultat mis en cache par alias)."""
+    key = (connection.alias, table)
+    if key not in _fts_tables:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [f"{table}_fts"])
+            _fts_tables[key] = cursor.fetchone() is not None
+    return _fts_tables[key]
+
+
+def _search_ids(model, term, using):
+    """Retourne le filtre Q sélectionnant les objets dont une colonne indexée contient le terme."""
+    table = model._meta.db_table
+    columns = SEARCH_COLUMNS[table]
+    connection = connections[using]
+
+    if len(term) >= MIN_TRIGRAM_LENGTH:
+        if connection.vendor == 'postgresql':
+            condition = Q()
+            for column in columns:
+                condition |= Q(**{f'{column}__trgm_icontains': term})
+            return condition
+        if connection.vendor == 'sqlite' and _has_fts_table(connection, table):
+            phrase = '"%s"' % term.replace('"', '""')
+            return Q(id__in=RawSQL(f"SELECT rowid FROM {table}_fts WHERE {table}_fts MATCH %s", (phrase,)))
+
+    condition = Q()
+    for column in columns:
+        condition |= Q(**{f'{column}__icontains': term})
+    return condition
+
+
+def search_clients(term, using='default'):
+    """Recherche les clients dont le nom ou le prénom contient le terme.
+
+    Args:
+        term (str): Le terme recherché (insensible à la casse).
+        using (str, optional): L'alias de la base de données. Defaults to 'default'.
+
+    Returns:
+        QuerySet: Les identifiants des clients correspondants, utilisable en sous-requête.
+    """
+    from mission.models import Client
+    return Client.objects.using(using).filter(_search_ids(Client, term, using)).values('id')
+
+
+def search_vehicules(term, using='default'):
+    """Recherche les véhicules dont la marque, le modèle ou l'immatriculation contient le terme.
+
+    Args:
+        term (str): Le terme recherché (insensible à la casse).
+        using (str, optional): L'alias de la base de données. Defaults to 'default'.
+
+    Returns:
+        QuerySet: Les identifiants des véhicules correspondants, utilisable en sous-requête.
+    """
+    from mission.models import Vehicule
+    return Vehicule.objects.using(using).filter(_search_ids(Vehicule, term, using)).values('id')
@@ -0,0 +1,123 @@
+"""
+Maintenance du modèle de lecture MissionSummary (une ligne par mission)
+"""
+import logging
+from django.db.models import Count, OuterRef, Subquery, Sum
+from mission.models import Mission, MissionIntervention, MissionSummary
+from my_airtable_api.utils.aggregates import StringConcat
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1000
+
+SUMMARY_FIELDS = [
+    'date_demande', 'remarque', 'priorite', 'client', 'vehicule', 'client_libelle', 'vehicule_libelle',
+    'taux', 'duree_supplementaire', 'cout_total', 'interventions_libelles', 'nb_lignes',
+]
+
+
+def _chunks(ids, size=CHUNK_SIZE):
+    """Découpe un itérable d'identifiants en listes de taille bornée."""
+    chunk = []
+    for value in ids:
+        chunk.append(value)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def build_mission_summaries(mission_ids, using='default'):
+    """Calcule les résumés d'un lot de missions.
+
+    Les totaux, le nombre de lignes et la liste des interventions sont agrégés par la
+    base de données : une seule ligne par mission est transférée.
+
+    Args:
+        mission_ids (list): Les identifiants des missions du lot.
+        using (str, optional): L'alias de la base de données. Defaults to 'default'.
+
+    Returns:
+        list: Les objets MissionSummary (non enregistrés) des missions existantes.
+    """
+    # Le taux et la durée supplémentaire sont saisis pour toute la mission : ceux de la première ligne
+    premiere_ligne = MissionIntervention.objects.using(using).filter(mission_id=OuterRef('pk')).order_by('id')
+    missions = Mission.objects.using(using).filter(id__in=mission_ids).order_by().values(
+        'id', 'date_demande', 'remarque', 'priorite', 'client_id', 'vehicule_id',
+        'client__nom', 'client__prenom', 'vehicule__marque', 'vehicule__modele', 'vehicule__immatriculation',
+    ).annotate(
+        total=Sum('missionintervention__cout_total', default=0),
+        lignes=Count('missionintervention'),
+        libelles=StringConcat('missionintervention__intervention__libelle', ordering='missionintervention__id'),
+        premier_taux=Subquery(premiere_ligne.values('taux')[:1]),
+        premiere_duree=Subquery(premiere_ligne.values('duree_supplementaire')[:1]),
+    )
+    return [
+        MissionSummary(
+            mission_id=mission['id'],
+            date_demande=mission['date_demande'],
+            remarque=mission['remarque'],
+            priorite=mission['priorite'],
+            client_id=mission['client_id'],
+            vehicule_id=mission['vehicule_id'],
+            client_libelle=f"{mission['client__nom']} {mission['client__prenom']}",
+            vehicule_libelle=(
+                f"{mission['vehicule__marque']} {mission['vehicule__modele']} {mission['vehicule__immatriculation']}"
+            ),
+            taux=mission['premier_taux'] or "",
+            duree_supplementaire=mission['premiere_duree'] if mission['lignes'] else 0,
+            cout_total=mission['total'],
+            interventions_libelles=mission['libelles'] or "",
+            nb_lignes=mission['lignes'],
+        ) for mission in missions
+    ]
+
+
+def refresh_mission_summaries(mission_ids, using='default'):
+    """Recalcule les résumés des missions données (à appeler dans la transaction d'écriture).
+
+    Les résumés des missions qui n'existent plus sont supprimés.
+
+    Args:
+        mission_ids (iterable): Les identifiants des missions modifiées.
+        using (str, optional): L'alias de la base de données. Defaults to 'default'.
+
+    Returns:
+        int: Le nombre de résumés recalculés.
+    """
+    total = 0
+    for chunk in _chunks(mission_ids):
+        summaries = build_mission_summaries(chunk, using)
+        MissionSummary.objects.using(using).bulk_create(
+            summaries, update_conflicts=True, unique_fields=['mission'], update_fields=SUMMARY_FIELDS
+        )
+        existing = {summary.mission_id for summary in summaries}
+        missing = [mission_id for mission_id in chunk if mission_id not in existing]
+        if missing:
+            MissionSummary.objects.using(using).filter(mission_id__in=missing).delete()
+        total += len(summaries)
+    return total
+
+
+def rebuild_mission_summaries(chunk_size=CHUNK_SIZE, using='default'):
+    """Reconstruit entièrement la table MissionSummary, par lots.
+
+    Args:
+        chunk_size (int, optional): Le nombre de missions par lot. Defaults to CHUNK_SIZE.
+        using (str, optional): L'alias de la base de données. Defaults to 'default'.
+
+    Returns:
+        int: Le nombre de résumés reconstruits.
+    """
+    MissionSummary.objects.using(using).exclude(mission_id__in=Mission.objects.using(using).values('id')).delete()
+    total = 0
+    last_id = 0
+    while True:
+        chunk = list(Mission.objects.using(using).filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:chunk_size])
+        if not chunk:
+            break
+        total += refresh_mission_summaries(chunk, using)
+        last_id = chunk[-1]
+    logger.info("%d résumés de missions reconstruits", total)
+    return total